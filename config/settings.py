@@ -17,8 +17,54 @@ class ProcureMateSettings:
     
     # 데이터베이스 설정
     VECTOR_DB_TYPE = "chroma"  # chroma or weaviate
-    VECTOR_DB_HOST = "localhost"
-    VECTOR_DB_PORT = 8000
+    VECTOR_DB_MODE = os.getenv('VECTOR_DB_MODE', 'embedded')  # embedded or http
+    VECTOR_DB_HOST = os.getenv('VECTOR_DB_HOST', 'localhost')
+    VECTOR_DB_PORT = int(os.getenv('VECTOR_DB_PORT', '8000'))
+    VECTOR_DB_POOL_SIZE = int(os.getenv('VECTOR_DB_POOL_SIZE', '4'))  # http 모드 클라이언트 풀 크기
+    VECTOR_DB_BATCH_SIZE = 512  # Chroma 추가/검색 배치 크기
+    
+    # RAG 검색 설정
+    RAG_RETRIEVAL_MODE = os.getenv('RAG_RETRIEVAL_MODE', 'hybrid')  # hybrid or cascade
+    RAG_CANDIDATE_POOL = 300  # cascade 모드에서 BM25 후보 수
+    RAG_SHARD_BY = os.getenv('RAG_SHARD_BY', '')  # '', category or hash
+    RAG_NUM_SHARDS = int(os.getenv('RAG_NUM_SHARDS', '4'))  # hash 샤딩 시 샤드 수
+    RAG_SHARED_INDEX_DIR = os.getenv('RAG_SHARED_INDEX_DIR', '')  # 워커 간 공유 색인 경로 (빈 값이면 비활성화)
+    RAG_SHARED_INDEX_POLL_SECONDS = 2.0  # 새 색인 세대 확인 주기
+    RAG_SHARED_INDEX_PUBLISHER = os.getenv('RAG_SHARED_INDEX_PUBLISHER', 'false').lower() == 'true'  # 상품 추가/샤드 재구성 후 공유 색인 게시 (게시 담당 프로세스 하나만 true)
+    
+    # 임베딩 설정
+    EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'transformer')  # transformer or hashing (CPU 전용 노드)
+    EMBEDDING_HASH_DIM = int(os.getenv('EMBEDDING_HASH_DIM', '512'))  # hashing 백엔드 벡터 차원
+    
+    # 용어 정규화 사전 필터 설정
+    NORMALIZATION_PREFILTER_ENABLED = os.getenv('NORMALIZATION_PREFILTER_ENABLED', 'true').lower() == 'true'  # 임베딩 매칭 전 어휘 기반 사전 필터 (false면 모든 토큰 임베딩)
+    NORMALIZATION_PREFILTER_NGRAM_SIZE = 2  # 변형어와 비교할 문자 n-gram 크기
+    NORMALIZATION_PREFILTER_MIN_SHARED = 1  # 임베딩 단계로 보낼 최소 공유 n-gram 수
+    
+    # 중복 제거 설정
+    DEDUPE_INDEX_PATH = os.getenv('DEDUPE_INDEX_PATH', '')  # 수집 간 영속 중복 색인 (sqlite, 빈 값이면 비활성화)
+    
+    # 검색 결과 저장 설정
+    SEARCH_RESULT_SNAPSHOT_DIR = os.getenv('SEARCH_RESULT_SNAPSHOT_DIR', '')  # 고급 검색 결과 상품 스냅샷 저장 경로 (빈 값이면 저장 안 함)
+    
+    # G2B-쿠팡 가격 매칭 설정
+    PRICE_MATCH_TABLE_PATH = os.getenv('PRICE_MATCH_TABLE_PATH', '')  # 카탈로그 매칭 테이블 (sqlite, 빈 값이면 비활성화)
+    PRICE_MATCH_MIN_SIMILARITY = float(os.getenv('PRICE_MATCH_MIN_SIMILARITY', '0.7'))  # 매칭 텍스트 임베딩 최소 코사인 유사도 (EMBEDDING_BACKEND를 바꾸면 함께 조정)
+    PRICE_MATCH_TOP_K = 3  # G2B 상품당 저장할 쿠팡 매칭 수
+    PRICE_MATCH_NPROBE = 16  # IVF 근사 검색 시 조회할 목록 수 (클수록 재현율↑, 속도↓)
+    
+    # 데이터 변환 설정
+    CONVERT_PROCESSES = int(os.getenv('CONVERT_PROCESSES', '0'))  # 대량 변환 프로세스 수 (0/1이면 단일 프로세스)
+    CONVERT_CHUNK_SIZE = 5000  # 이 수를 넘는 배치만 프로세스 풀로 분할 (피클링 왕복이 변환 비용과 비슷해 코어 3개 이상에서만 이득)
+    
+    # 카테고리 분류 설정
+    CATEGORY_FALLBACK_MIN_SIMILARITY = float(os.getenv('CATEGORY_FALLBACK_MIN_SIMILARITY', '0.4'))  # 키워드 미분류 상품의 임베딩 중심 벡터 최소 유사도 (EMBEDDING_BACKEND를 바꾸면 함께 조정)
+    
+    # 스트리밍 수집 설정
+    INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', '4'))  # 단계 사이 큐 크기 (가득 차면 앞 단계 대기)
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '256'))  # 임베딩/색인 배치 크기
+    INGEST_PAGE_SIZE = 100  # 출처 API 페이지당 항목 수
+    INGEST_MAX_PAGES = int(os.getenv('INGEST_MAX_PAGES', '100'))  # 출처별 최대 페이지 수
     
     # API 설정
     COUPANG_ACCESS_KEY = os.getenv('COUPANG_ACCESS_KEY')
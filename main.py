@@ -25,6 +25,7 @@ from api.handlers import get_status_handler
 
 from utils import get_logger
 from utils.json_utils import serialize_for_websocket
+from normalization import flush_pending_rules
 
 logger = get_logger(__name__)
 
@@ -37,6 +38,7 @@ async def lifespan(app: FastAPI):
     logger.info("ProcureMate GUI 시작")
     yield
     # Shutdown
+    flush_pending_rules()  # 지연 저장 대기 중인 정규화 규칙 저장
     logger.info("ProcureMate GUI 종료")
 
 # FastAPI 앱 초기화
@@ -4,29 +4,42 @@
 """
 
 import asyncio
+import hashlib
+import heapq
+import threading
+import time
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
-import chromadb
-from chromadb.config import Settings
+from typing import Dict, List, Optional, Any, Sequence, Set, Tuple, Union
 import json
 from datetime import datetime
 import os
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from modules.data_processor import UnifiedProduct
+from modules.chroma_client import ChromaClientPool, stable_document_id, text_hash
+from modules.shared_index import SharedIndexStore, SharedIndexGeneration
+from modules.product_table import ProductTable
+from normalization.hashing_embedder import HashingEmbedder
 from utils import get_logger
+from config import ProcureMateSettings
 
 logger = get_logger(__name__)
 
 class KoreanEmbeddingEngine:
     """한국어 최적화 임베딩 엔진"""
     
-    def __init__(self, model_name: str = "jhgan/ko-sroberta-multitask"):
+    def __init__(self, model_name: str = "jhgan/ko-sroberta-multitask", backend: Optional[str] = None):
         self.model_name = model_name
+        self.backend = (backend or ProcureMateSettings.EMBEDDING_BACKEND).lower()
         self.model = None
         self.device = "cpu"  # GPU 사용 시 "cuda"로 변경
+        self.hashing_embedder = HashingEmbedder(dim=ProcureMateSettings.EMBEDDING_HASH_DIM)
         
     async def initialize(self):
         """임베딩 모델 초기화"""
+        if self.backend == "hashing":
+            logger.info(f"해싱 임베딩 백엔드 사용: {self.hashing_embedder.backend_id}")
+            return
+        
         from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer(self.model_name)
         self.model.to(self.device)
@@ -39,7 +52,7 @@ class KoreanEmbeddingEngine:
             return np.array([])
         
         if self.model is None:
-            # Mock 임베딩 생성 (실제로는 sentence-transformers 사용)
+            # 모델이 없으면 해싱 임베딩 사용 (hashing 백엔드 또는 모델 미로드)
             return self._generate_mock_embeddings(texts)
         
         embeddings = self.model.encode(
@@ -53,31 +66,8 @@ class KoreanEmbeddingEngine:
 
     
     def _generate_mock_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Mock 임베딩 생성 (개발/테스트용)"""
-        # 텍스트 길이와 특성을 기반으로 단순한 벡터 생성
-        embeddings = []
-        for text in texts:
-            # 텍스트 특성을 반영한 512차원 벡터 생성
-            text_hash = hash(text) % 10000
-            np.random.seed(text_hash)
-            vector = np.random.normal(0, 1, 512)
-            
-            # 텍스트 길이 반영
-            vector[0] = len(text) / 100.0
-            
-            # 한글 포함 여부 반영
-            korean_chars = len([c for c in text if '가' <= c <= '힣'])
-            vector[1] = korean_chars / len(text) if text else 0
-            
-            # 숫자 포함 여부 반영
-            digit_chars = len([c for c in text if c.isdigit()])
-            vector[2] = digit_chars / len(text) if text else 0
-            
-            # 정규화
-            vector = vector / np.linalg.norm(vector)
-            embeddings.append(vector)
-        
-        return np.array(embeddings)
+        """해싱 임베딩 생성 (음절/자모 n-gram 특징 해싱, 결정적)"""
+        return self.hashing_embedder.encode(texts)
     
     def create_product_embedding_text(self, product: UnifiedProduct) -> str:
         """상품 정보를 임베딩용 텍스트로 변환"""
@@ -110,45 +100,129 @@ class BM25Scorer:
         self.corpus = []
         self.tokenized_corpus = []
         self.doc_freqs = []
+        self.doc_lengths = np.array([])
+        self.postings: Dict[str, Dict[int, int]] = {}  # 토큰 -> {문서 인덱스: tf}
         self.idf = {}
         self.avgdl = 0.0
+        self._owned_tokens: Set[str] = set()  # 이 객체가 만든(수정해도 되는) 역색인 목록
+    
+    def copy(self) -> 'BM25Scorer':
+        """수정용 사본 (검색 중인 원본은 그대로 두고 토큰별 역색인 목록은 처음 수정할 때 복사)"""
+        clone = BM25Scorer(k1=self.k1, b=self.b)
+        clone.corpus = list(self.corpus)
+        clone.tokenized_corpus = list(self.tokenized_corpus)
+        clone.doc_freqs = list(self.doc_freqs)
+        clone.doc_lengths = self.doc_lengths
+        clone.postings = dict(self.postings)
+        clone.idf = self.idf
+        clone.avgdl = self.avgdl
+        return clone
     
     def fit(self, corpus: List[str]):
         """코퍼스로 BM25 모델 학습"""
-        self.corpus = corpus
+        self.corpus = list(corpus)
         self.tokenized_corpus = [self._tokenize(doc) for doc in corpus]
         
-        # 문서 길이 계산
-        self.avgdl = sum(len(doc) for doc in self.tokenized_corpus) / len(self.tokenized_corpus)
-        
         # 단어 빈도 계산
         self._calculate_doc_freqs()
-        self._calculate_idf()
+        self._refresh_statistics()
         
         logger.info(f"BM25 모델 학습 완료: {len(corpus)}개 문서")
     
+    def add_documents(self, corpus: List[str]):
+        """기존 색인을 유지한 채 문서 추가"""
+        start = len(self.tokenized_corpus)
+        for offset, doc in enumerate(corpus):
+            tokens = self._tokenize(doc)
+            self.corpus.append(doc)
+            self.tokenized_corpus.append(tokens)
+            self._index_document(start + offset, tokens)
+        
+        self._refresh_statistics()
+    
+    def replace_document(self, doc_idx: int, doc: str):
+        """기존 문서 내용 교체"""
+        self.replace_documents([(doc_idx, doc)])
+
+    def replace_documents(self, replacements: List[Tuple[int, str]], refresh: bool = True):
+        """기존 문서 여러 개 교체 (통계는 배치 끝에 한 번만 갱신, refresh=False면 호출자가 갱신)"""
+        if not replacements:
+            return
+
+        for doc_idx, doc in replacements:
+            for token in self.doc_freqs[doc_idx]:
+                postings = self._writable_postings(token)
+                postings.pop(doc_idx, None)
+                if not postings:
+                    del self.postings[token]
+                    self._owned_tokens.discard(token)
+
+            tokens = self._tokenize(doc)
+            self.corpus[doc_idx] = doc
+            self.tokenized_corpus[doc_idx] = tokens
+            self._index_document(doc_idx, tokens)
+
+        if refresh:
+            self._refresh_statistics()
+    
+    def _refresh_statistics(self):
+        """문서 길이 및 IDF 갱신"""
+        self.doc_lengths = np.array([len(doc) for doc in self.tokenized_corpus], dtype=float)
+        self.avgdl = float(self.doc_lengths.mean()) if len(self.doc_lengths) else 0.0
+        self._calculate_idf()
+    
     def get_scores(self, query: str) -> np.ndarray:
         """쿼리에 대한 BM25 점수 계산"""
-        query_tokens = self._tokenize(query)
         scores = np.zeros(len(self.tokenized_corpus))
+        for doc_idx, score in self.get_sparse_scores(query).items():
+            scores[doc_idx] = score
+        return scores
+    
+    def get_sparse_scores(self, query: str) -> Dict[int, float]:
+        """쿼리 토큰을 포함한 문서에 대해서만 BM25 점수 계산 (역색인 사용)"""
+        scores: Dict[int, float] = {}
+        if not self.avgdl:
+            return scores
         
-        for token in query_tokens:
+        for token in self._tokenize(query):
             if token not in self.idf:
                 continue
             
             idf_score = self.idf[token]
-            for i, doc in enumerate(self.tokenized_corpus):
-                tf = doc.count(token)
-                dl = len(doc)
-                
+            for doc_idx, tf in self.postings[token].items():
+                dl = self.doc_lengths[doc_idx]
                 score = idf_score * (tf * (self.k1 + 1)) / (
                     tf + self.k1 * (1 - self.b + self.b * dl / self.avgdl)
                 )
-                scores[i] += score
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + score
         
         return scores
     
-    def _tokenize(self, text: str) -> List[str]:
+    def top_candidates(
+        self,
+        query: str,
+        limit: int,
+        mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25 상위 후보 문서 인덱스와 점수 반환 (mask가 False인 문서 제외)"""
+        sparse_scores = self.get_sparse_scores(query)
+        if mask is not None:
+            sparse_scores = {i: s for i, s in sparse_scores.items() if mask[i]}
+        
+        if not sparse_scores:
+            return np.array([], dtype=int), np.array([])
+        
+        indices = np.fromiter(sparse_scores.keys(), dtype=int, count=len(sparse_scores))
+        scores = np.fromiter(sparse_scores.values(), dtype=float, count=len(sparse_scores))
+        
+        if len(indices) > limit:
+            top = np.argpartition(scores, -limit)[-limit:]
+            indices, scores = indices[top], scores[top]
+        
+        return indices, scores
+    
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
         """텍스트 토큰화 (한국어 고려)"""
         import re
         
@@ -168,49 +242,251 @@ class BM25Scorer:
         return tokens + korean_tokens
     
     def _calculate_doc_freqs(self):
-        """문서별 단어 빈도 계산"""
+        """문서별 단어 빈도 및 역색인 계산"""
         self.doc_freqs = []
-        for doc in self.tokenized_corpus:
-            freq = {}
-            for token in doc:
-                freq[token] = freq.get(token, 0) + 1
+        self.postings = {}
+        self._owned_tokens = set()
+        for doc_idx, doc in enumerate(self.tokenized_corpus):
+            self._index_document(doc_idx, doc)
+    
+    def _index_document(self, doc_idx: int, tokens: List[str]):
+        """단일 문서를 단어 빈도 및 역색인에 반영"""
+        freq = {}
+        for token in tokens:
+            freq[token] = freq.get(token, 0) + 1
+        
+        if doc_idx == len(self.doc_freqs):
             self.doc_freqs.append(freq)
+        else:
+            self.doc_freqs[doc_idx] = freq
+        
+        for token, tf in freq.items():
+            self._writable_postings(token)[doc_idx] = tf
+    
+    def _writable_postings(self, token: str) -> Dict[int, int]:
+        """수정할 역색인 목록 (copy()로 원본과 공유 중이면 복사 후 반환)"""
+        if token not in self._owned_tokens:
+            self.postings[token] = dict(self.postings.get(token, ()))
+            self._owned_tokens.add(token)
+        return self.postings[token]
     
     def _calculate_idf(self):
         """IDF 계산"""
-        vocab = set()
-        for doc in self.tokenized_corpus:
-            vocab.update(doc)
+        num_docs = len(self.tokenized_corpus)
+        self.idf = {}
+        for token, postings in self.postings.items():
+            df = len(postings)
+            self.idf[token] = np.log((num_docs - df + 0.5) / (df + 0.5))
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """공유 색인 게시용 배열 (토큰 해시 순 CSR 역색인 + IDF + 문서 길이)"""
+        tokens = list(self.postings)
+        keys = np.fromiter((_token_key(token) for token in tokens), dtype=np.uint64, count=len(tokens))
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        if len(np.unique(keys)) != len(keys):
+            raise ValueError("BM25 토큰 해시 충돌")
+        
+        tokens = [tokens[i] for i in order]
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum([len(self.postings[token]) for token in tokens], out=offsets[1:])
+        return {
+            'bm25_token_keys': keys,
+            'bm25_offsets': offsets,
+            'bm25_docs': np.fromiter(
+                (doc_idx for token in tokens for doc_idx in self.postings[token]), dtype=np.int32, count=offsets[-1]
+            ),
+            'bm25_tfs': np.fromiter(
+                (tf for token in tokens for tf in self.postings[token].values()), dtype=np.int32, count=offsets[-1]
+            ),
+            'bm25_idf': np.array([self.idf[token] for token in tokens], dtype=np.float64),
+            'bm25_doc_lengths': np.asarray(self.doc_lengths, dtype=np.float64),
+            'bm25_params': np.array([self.k1, self.b, self.avgdl], dtype=np.float64)
+        }
+
+def _token_key(token: str) -> int:
+    """BM25 토큰의 64비트 해시 (공유 색인 역색인 조회 키)"""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class SharedBM25Scorer:
+    """공유 색인 세대에 게시된 BM25 역색인 (읽기 전용 메모리 매핑, 워커 간 페이지 캐시 공유)
+
+    BM25Scorer.to_arrays 배열을 그대로 사용하며 점수는 BM25Scorer와 같다.
+    토큰 문자열 대신 정렬된 토큰 해시를 이진 탐색하므로 워커마다 어휘 사전을 만들지 않는다.
+    """
+    
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.token_keys = arrays['bm25_token_keys']
+        self.offsets = arrays['bm25_offsets']
+        self.docs = arrays['bm25_docs']
+        self.tfs = arrays['bm25_tfs']
+        self.idf = arrays['bm25_idf']
+        self.doc_lengths = arrays['bm25_doc_lengths']
+        self.k1, self.b, self.avgdl = (float(value) for value in arrays['bm25_params'])
+    
+    def get_scores(self, query: str) -> np.ndarray:
+        """쿼리에 대한 BM25 점수 계산"""
+        scores = np.zeros(len(self.doc_lengths))
+        indices, sparse_scores = self._sparse(query)
+        scores[indices] = sparse_scores
+        return scores
+    
+    def get_sparse_scores(self, query: str) -> Dict[int, float]:
+        """쿼리 토큰을 포함한 문서에 대해서만 BM25 점수 계산"""
+        indices, scores = self._sparse(query)
+        return dict(zip(indices.tolist(), scores.tolist()))
+    
+    def top_candidates(
+        self,
+        query: str,
+        limit: int,
+        mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25 상위 후보 문서 인덱스와 점수 반환 (mask가 False인 문서 제외)"""
+        indices, scores = self._sparse(query)
+        if mask is not None:
+            keep = mask[indices]
+            indices, scores = indices[keep], scores[keep]
+        
+        if len(indices) > limit:
+            top = np.argpartition(scores, -limit)[-limit:]
+            indices, scores = indices[top], scores[top]
+        
+        return indices, scores
+    
+    def _sparse(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """쿼리 토큰별 역색인 구간 점수를 문서별로 합산 (토큰 순서대로 더해 BM25Scorer와 같은 값)"""
+        empty = np.array([], dtype=int), np.array([])
+        if not self.avgdl or not len(self.token_keys):
+            return empty
         
-        for token in vocab:
-            df = sum(1 for doc in self.tokenized_corpus if token in doc)
-            self.idf[token] = np.log((len(self.tokenized_corpus) - df + 0.5) / (df + 0.5))
+        doc_parts = []
+        score_parts = []
+        for token in BM25Scorer._tokenize(query):
+            key = np.uint64(_token_key(token))
+            pos = int(np.searchsorted(self.token_keys, key))
+            if pos == len(self.token_keys) or self.token_keys[pos] != key:
+                continue
+            
+            start, end = self.offsets[pos], self.offsets[pos + 1]
+            docs = np.asarray(self.docs[start:end], dtype=int)
+            tf = np.asarray(self.tfs[start:end], dtype=float)
+            dl = self.doc_lengths[docs]
+            doc_parts.append(docs)
+            score_parts.append(self.idf[pos] * (tf * (self.k1 + 1)) / (
+                tf + self.k1 * (1 - self.b + self.b * dl / self.avgdl)
+            ))
+        
+        if not doc_parts:
+            return empty
+        
+        indices, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+        return indices, np.bincount(inverse, weights=np.concatenate(score_parts), minlength=len(indices))
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """공유 색인 게시용 배열 (연결한 세대를 그대로 다시 게시할 때)"""
+        return {
+            'bm25_token_keys': self.token_keys,
+            'bm25_offsets': self.offsets,
+            'bm25_docs': self.docs,
+            'bm25_tfs': self.tfs,
+            'bm25_idf': self.idf,
+            'bm25_doc_lengths': self.doc_lengths,
+            'bm25_params': np.array([self.k1, self.b, self.avgdl], dtype=np.float64)
+        }
+
+@dataclass(frozen=True)
+class HybridIndexState:
+    """하이브리드 검색 색인 상태 (한 번 만들면 수정하지 않음)
+
+    검색은 시작할 때 상태를 한 번 읽어 끝까지 사용하고, 색인 갱신과 공유 색인 교체는
+    새 상태를 만든 뒤 참조 하나만 바꾼다. 스레드에서 실행 중인 검색이 서로 다른 시점의
+    상품/임베딩/BM25를 섞어 보지 않는다.
+    """
+    products: Sequence[UnifiedProduct] = ()
+    embeddings: Optional[np.ndarray] = None
+    bm25: Union[BM25Scorer, SharedBM25Scorer] = field(default_factory=BM25Scorer)
+    
+    # 패싯 필터용 인덱스 (상품 열 저장소의 가격 열을 그대로 사용)
+    table: Optional[ProductTable] = None
+    prices: np.ndarray = field(default_factory=lambda: np.array([]))
+    category_postings: Dict[str, np.ndarray] = field(default_factory=dict)
+    
+    # 상품별 임베딩 텍스트 해시 (변경 감지용, 공유 색인은 ASCII bytes 배열)
+    text_hashes: Sequence[Union[str, bytes]] = ()
+    
+    # 공유 색인에 연결된 경우 세대 번호
+    shared_generation: Optional[int] = None
+    
+    @property
+    def is_empty(self) -> bool:
+        return not len(self.products) or self.embeddings is None
 
 class HybridSearchEngine:
     """하이브리드 검색 엔진 (의미적 + 키워드)"""
     
-    def __init__(self):
-        self.embedding_engine = KoreanEmbeddingEngine()
-        self.bm25 = BM25Scorer()
-        self.products = []
-        self.embeddings = None
+    def __init__(
+        self,
+        retrieval_mode: Optional[str] = None,
+        candidate_pool: Optional[int] = None,
+        embedding_engine: Optional[KoreanEmbeddingEngine] = None
+    ):
+        # 샤드 간 모델 중복 로드를 피하기 위해 임베딩 엔진 공유 가능
+        self.embedding_engine = embedding_engine or KoreanEmbeddingEngine()
+        self.state = HybridIndexState()
         self.is_initialized = False
+        
+        # 색인 갱신은 한 번에 하나씩 (임베딩 대기 중 다른 갱신이 상태를 덮어쓰지 않도록)
+        self._update_lock = asyncio.Lock()
+        
+        # 'hybrid': 전체 상품 점수 계산, 'cascade': BM25 후보 생성 후 의미적 재순위화
+        self.retrieval_mode = retrieval_mode or ProcureMateSettings.RAG_RETRIEVAL_MODE
+        self.candidate_pool = candidate_pool or ProcureMateSettings.RAG_CANDIDATE_POOL
+    
+    # 현재 상태 조회용 (검색 중에는 self.state를 한 번만 읽어 사용)
+    
+    @property
+    def products(self) -> Sequence[UnifiedProduct]:
+        return self.state.products
+    
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        return self.state.embeddings
+    
+    @property
+    def bm25(self) -> Union[BM25Scorer, SharedBM25Scorer]:
+        return self.state.bm25
+    
+    @property
+    def table(self) -> Optional[ProductTable]:
+        return self.state.table
+    
+    @property
+    def text_hashes(self) -> Sequence[Union[str, bytes]]:
+        return self.state.text_hashes
+    
+    @property
+    def shared_generation(self) -> Optional[int]:
+        return self.state.shared_generation
     
     async def initialize(self):
         """검색 엔진 초기화"""
-        await self.embedding_engine.initialize()
+        if self.embedding_engine.model is None:
+            await self.embedding_engine.initialize()
         self.is_initialized = True
         logger.info("하이브리드 검색 엔진 초기화 완료")
     
     async def index_products(self, products: List[UnifiedProduct]):
         """상품 인덱싱"""
+        async with self._update_lock:
+            await self._index_products(products)
+    
+    async def _index_products(self, products: List[UnifiedProduct]):
         if not self.is_initialized:
             await self.initialize()
         
         logger.info(f"상품 인덱싱 시작: {len(products)}개")
         
-        self.products = products
-        
         # 임베딩용 텍스트 생성
         embedding_texts = [
             self.embedding_engine.create_product_embedding_text(product)
@@ -218,34 +494,271 @@ class HybridSearchEngine:
         ]
         
         # 의미적 검색을 위한 임베딩 생성
-        self.embeddings = await self.embedding_engine.create_embeddings(embedding_texts)
+        embeddings = await self.embedding_engine.create_embeddings(embedding_texts)
         
         # BM25를 위한 키워드 검색 인덱싱
-        bm25_texts = [
-            f"{product.name['searchable']} {' '.join(product.category)} {product.specifications}"
-            for product in products
-        ]
-        self.bm25.fit(bm25_texts)
+        bm25 = BM25Scorer(k1=self.bm25.k1, b=self.bm25.b)
+        bm25.fit([self._create_bm25_text(product) for product in products])
+        
+        # 카테고리/가격 패싯 인덱싱 후 상태 교체
+        self.state = HybridIndexState(
+            products=products,
+            embeddings=embeddings,
+            bm25=bm25,
+            text_hashes=[text_hash(text) for text in embedding_texts],
+            **self._build_facets(products)
+        )
         
         logger.info(f"상품 인덱싱 완료: {len(products)}개")
     
-    async def search(self, query: str, k: int = 10, alpha: float = 0.6) -> List[Dict]:
+    async def add_products(self, products: List[UnifiedProduct]):
+        """기존 색인에 상품 추가 (같은 ID는 교체, 변경된 상품만 임베딩)
+        
+        진행 중인 검색이 읽는 상태는 건드리지 않고 사본을 고친 뒤 새 상태로 교체
+        """
+        if not products:
+            return
+        
+        async with self._update_lock:
+            state = self.state
+            if state.is_empty:
+                await self._index_products(list(products))
+                return
+            
+            if state.shared_generation is not None:
+                # 공유 색인은 읽기 전용이므로 로컬 사본으로 전환 (BM25는 토큰 문자열이 없어 재구성)
+                logger.warning(f"공유 색인 세대 {state.shared_generation}에서 분리 후 로컬 색인으로 전환")
+                state = self._detach_shared_state(state)
+            
+            await self._add_products(state, products)
+    
+    def _detach_shared_state(self, state: HybridIndexState) -> HybridIndexState:
+        """공유 색인 상태 -> 수정 가능한 로컬 상태"""
+        products = list(state.products)
+        bm25 = BM25Scorer(k1=state.bm25.k1, b=state.bm25.b)
+        bm25.fit([self._create_bm25_text(product) for product in products])
+        return HybridIndexState(
+            products=products,
+            embeddings=np.array(state.embeddings),
+            bm25=bm25,
+            table=state.table,
+            prices=state.prices,
+            category_postings=state.category_postings,
+            text_hashes=[value.decode('ascii') if isinstance(value, bytes) else value for value in state.text_hashes]
+        )
+    
+    async def _add_products(self, state: HybridIndexState, products: List[UnifiedProduct]):
+        current_products = list(state.products)
+        text_hashes = list(state.text_hashes)
+        bm25 = state.bm25.copy()
+        position_by_id = {product.id: idx for idx, product in enumerate(current_products)}
+        
+        # 배치 내 중복 ID는 마지막 값 사용, 임베딩 텍스트가 그대로인 상품은 재임베딩 생략
+        latest = {product.id: product for product in products}
+        changed = []
+        changed_texts = []
+        bm25_replacements = []
+        facet_replacements = []
+        for product in latest.values():
+            embedding_text = self.embedding_engine.create_product_embedding_text(product)
+            idx = position_by_id.get(product.id)
+            if idx is not None and text_hashes[idx] == text_hash(embedding_text):
+                # 임베딩은 유지하되 BM25 텍스트(검색용 이름, 전체 사양)가 바뀌었으면 함께 교체
+                current_products[idx] = product
+                facet_replacements.append((idx, product))
+                bm25_text = self._create_bm25_text(product)
+                if bm25.corpus[idx] != bm25_text:
+                    bm25_replacements.append((idx, bm25_text))
+                continue
+            changed.append(product)
+            changed_texts.append(embedding_text)
+        
+        if not changed:
+            bm25.replace_documents(bm25_replacements)
+            self.state = HybridIndexState(
+                products=current_products,
+                embeddings=state.embeddings,
+                bm25=bm25,
+                text_hashes=text_hashes,
+                **self._update_facets(state, current_products, facet_replacements)
+            )
+            logger.info(f"변경된 상품 없음, 재임베딩 생략: {len(latest)}개 (BM25 갱신 {len(bm25_replacements)}개)")
+            return
+        
+        new_embeddings = await self.embedding_engine.create_embeddings(changed_texts)
+        
+        appended_products = []
+        appended_rows = []
+        replaced = []
+        for row, product in enumerate(changed):
+            idx = position_by_id.get(product.id)
+            if idx is None:
+                appended_products.append(product)
+                appended_rows.append(row)
+            else:
+                current_products[idx] = product
+                facet_replacements.append((idx, product))
+                text_hashes[idx] = text_hash(changed_texts[row])
+                replaced.append((idx, row))
+                bm25_replacements.append((idx, self._create_bm25_text(product)))
+        
+        # 임베딩 행렬도 새로 만든 사본에만 기록 (공유 색인의 읽기 전용 매핑 포함)
+        if appended_products:
+            embeddings = np.vstack([state.embeddings, new_embeddings[appended_rows]])
+        else:
+            embeddings = np.array(state.embeddings)
+        for idx, row in replaced:
+            embeddings[idx] = new_embeddings[row]
+        
+        # 교체는 모아서 한 번에 반영 (추가 문서가 있으면 add_documents에서 통계 갱신)
+        bm25.replace_documents(bm25_replacements, refresh=not appended_products)
+        
+        if appended_products:
+            current_products.extend(appended_products)
+            text_hashes.extend(text_hash(changed_texts[row]) for row in appended_rows)
+            bm25.add_documents([self._create_bm25_text(product) for product in appended_products])
+        
+        self.state = HybridIndexState(
+            products=current_products,
+            embeddings=embeddings,
+            bm25=bm25,
+            text_hashes=text_hashes,
+            **self._update_facets(state, current_products, facet_replacements, appended_products)
+        )
+        logger.info(f"상품 증분 인덱싱 완료: 신규 {len(appended_products)}개, 갱신 {len(changed) - len(appended_products)}개")
+    
+    def _create_bm25_text(self, product: UnifiedProduct) -> str:
+        """BM25 색인용 텍스트 생성"""
+        return f"{product.name['searchable']} {' '.join(product.category)} {product.specifications}"
+    
+    def attach_shared_index(self, shared: SharedIndexGeneration):
+        """게시된 공유 색인 세대에 연결
+        
+        임베딩 행렬, BM25 역색인/IDF, 텍스트 해시, 패싯 열은 모두 읽기 전용 메모리 매핑으로 연결하고
+        상품 객체는 검색 결과에 필요한 것만 스냅샷에서 꺼낸다
+        """
+        if 'bm25_offsets' in shared.arrays:
+            bm25 = SharedBM25Scorer(shared.arrays)
+            text_hashes = shared.arrays['text_hashes']
+        else:
+            # BM25 배열 없이 게시된 이전 세대는 상품에서 재구성
+            logger.warning(f"공유 색인 세대 {shared.generation}에 BM25 배열 없음, 상품으로 재구성")
+            bm25 = BM25Scorer(k1=self.bm25.k1, b=self.bm25.b)
+            bm25.fit([self._create_bm25_text(product) for product in shared.products])
+            text_hashes = [
+                text_hash(self.embedding_engine.create_product_embedding_text(product)) for product in shared.products
+            ]
+        
+        # 새 상태를 모두 만든 뒤 참조 하나만 교체
+        self.state = HybridIndexState(
+            products=shared.products,
+            embeddings=shared.embeddings,
+            bm25=bm25,
+            table=shared.table,
+            prices=np.asarray(shared.table.prices),
+            category_postings=shared.table.category_postings(),
+            text_hashes=text_hashes,
+            shared_generation=shared.generation
+        )
+        self.is_initialized = True
+    
+    def _build_facets(self, products: Sequence[UnifiedProduct]) -> Dict[str, Any]:
+        """최상위 카테고리 및 가격 패싯 구성"""
+        table = ProductTable.from_products(products)
+        return {'table': table, 'prices': table.prices, 'category_postings': table.category_postings()}
+    
+    def _update_facets(
+        self,
+        state: HybridIndexState,
+        products: Sequence[UnifiedProduct],
+        replaced: List[Tuple[int, UnifiedProduct]],
+        appended: Sequence[UnifiedProduct] = ()
+    ) -> Dict[str, Any]:
+        """증분 추가 시 패싯 갱신 (교체/추가된 행만 인코딩, 전체 카탈로그를 다시 읽지 않음)"""
+        if state.table is None or len(state.table) != len(state.products):
+            return self._build_facets(products)
+        
+        table = state.table.with_rows(replaced, appended)
+        postings = table.update_postings(state.category_postings, state.table, [idx for idx, _ in replaced])
+        return {'table': table, 'prices': table.prices, 'category_postings': postings}
+    
+    def _facet_mask(self, state: HybridIndexState, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """필터 조건(category, price_min, price_max)에 맞는 상품 마스크 생성"""
+        if not filters:
+            return None
+        
+        mask = np.ones(len(state.products), dtype=bool)
+        
+        category = filters.get('category')
+        if category:
+            category_mask = np.zeros(len(state.products), dtype=bool)
+            category_mask[state.category_postings.get(category, np.array([], dtype=int))] = True
+            mask &= category_mask
+        
+        if filters.get('price_min') is not None:
+            mask &= state.prices >= float(filters['price_min'])
+        if filters.get('price_max') is not None:
+            mask &= state.prices <= float(filters['price_max'])
+        
+        return mask
+    
+    async def search(
+        self,
+        query: str,
+        k: int = 10,
+        alpha: float = 0.6,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
         """하이브리드 검색 실행"""
-        if not self.products or self.embeddings is None:
+        if self.state.is_empty:
+            logger.warning("인덱싱된 상품이 없음")
+            return []
+        
+        query_embedding = await self.embedding_engine.create_embeddings([query])
+        return self.search_with_embedding(query, query_embedding, k=k, alpha=alpha, filters=filters)
+    
+    async def search_cascade(
+        self,
+        query: str,
+        k: int = 10,
+        alpha: float = 0.6,
+        filters: Optional[Dict[str, Any]] = None,
+        candidate_pool: Optional[int] = None
+    ) -> List[Dict]:
+        """2단계 검색: BM25/패싯 후보 생성 후 후보 임베딩만으로 의미적 재순위화"""
+        if self.state.is_empty:
             logger.warning("인덱싱된 상품이 없음")
             return []
         
+        query_embedding = await self.embedding_engine.create_embeddings([query])
+        return self._search_cascade(self.state, query, query_embedding, k, alpha, filters, candidate_pool)
+    
+    def search_with_embedding(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        k: int = 10,
+        alpha: float = 0.6,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
+        """미리 계산된 쿼리 임베딩으로 검색 (동기, 샤드 병렬 검색용)"""
+        state = self.state
+        if state.is_empty:
+            return []
+        
+        if self.retrieval_mode == "cascade":
+            return self._search_cascade(state, query, query_embedding, k, alpha, filters)
+        
         logger.info(f"하이브리드 검색 실행: '{query}'")
         
         # 1. 의미적 검색
-        query_embedding = await self.embedding_engine.create_embeddings([query])
         if query_embedding.size > 0:
-            semantic_scores = np.dot(self.embeddings, query_embedding.T).flatten()
+            semantic_scores = np.dot(state.embeddings, query_embedding.T).flatten()
         else:
-            semantic_scores = np.zeros(len(self.products))
+            semantic_scores = np.zeros(len(state.products))
         
         # 2. 키워드 검색
-        bm25_scores = self.bm25.get_scores(query)
+        bm25_scores = state.bm25.get_scores(query)
         
         # 3. 점수 정규화
         semantic_scores_norm = self._normalize_scores(semantic_scores)
@@ -254,69 +767,434 @@ class HybridSearchEngine:
         # 4. 하이브리드 점수 계산
         hybrid_scores = alpha * semantic_scores_norm + (1 - alpha) * bm25_scores_norm
         
+        # 패싯 필터 적용
+        mask = self._facet_mask(state, filters)
+        if mask is not None:
+            hybrid_scores = np.where(mask, hybrid_scores, 0.0)
+        
         # 5. 상위 k개 결과 선택
         top_indices = np.argsort(hybrid_scores)[::-1][:k]
         
+        results = self._format_results(
+            state, top_indices, hybrid_scores, semantic_scores_norm, bm25_scores_norm
+        )
+        
+        logger.info(f"검색 완료: {len(results)}개 결과")
+        return results
+
+    def score_candidates(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        k: int = 10,
+        alpha: float = 0.6,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """샤드 병합용 후보와 정규화 전 원시 점수(코사인/BM25) 반환
+
+        점수 범위는 정규화 기준 문서 집합(하이브리드: 전체 상품, 캐스케이드: 어휘 후보)에서 구하고,
+        후보는 샤드 내 하이브리드/의미적/키워드 점수 각각의 상위 k개 합집합으로 제한.
+        스레드에서 실행되므로 색인 상태는 시작할 때 한 번만 읽음
+        """
+        state = self.state
+        candidates = {
+            'products': [],
+            'semantic': np.array([]),
+            'keyword': np.array([]),
+            'semantic_range': None,
+            'keyword_range': None,
+            'lexical': False
+        }
+        if state.is_empty:
+            return candidates
+
+        mask = self._facet_mask(state, filters)
+        lexical = True
+        if self.retrieval_mode == "cascade":
+            scored, keyword = state.bm25.top_candidates(query, self.candidate_pool, mask)
+            if len(scored) == 0:
+                scored = np.arange(len(state.products)) if mask is None else np.flatnonzero(mask)
+                keyword = np.zeros(len(scored))
+                lexical = False
+            embeddings = state.embeddings[scored]
+            eligible = None
+        else:
+            scored = None
+            keyword = state.bm25.get_scores(query)
+            embeddings = state.embeddings
+            eligible = mask
+
+        if query_embedding.size > 0 and len(keyword) > 0:
+            semantic = np.dot(embeddings, query_embedding.T).flatten()
+        else:
+            semantic = np.zeros(len(keyword))
+
+        if len(keyword) == 0:
+            return candidates
+
+        keyword_tie = 1.0 if scored is not None and lexical else 0.0
+        local_scores = alpha * self._normalize_scores(semantic) + (1 - alpha) * self._normalize_scores(keyword, tied=keyword_tie)
+        keep = np.unique(np.concatenate([
+            self._top_positions(scores, k, eligible)
+            for scores in (local_scores, semantic, keyword)
+        ]))
+        indices = keep if scored is None else scored[keep]
+
+        candidates.update({
+            'products': [state.products[idx] for idx in indices],
+            'semantic': semantic[keep],
+            'keyword': keyword[keep],
+            'semantic_range': (float(semantic.min()), float(semantic.max())),
+            'keyword_range': (float(keyword.min()), float(keyword.max())),
+            'lexical': lexical
+        })
+        return candidates
+
+    @staticmethod
+    def _top_positions(scores: np.ndarray, k: int, eligible: Optional[np.ndarray] = None) -> np.ndarray:
+        """점수 상위 k개 위치 (eligible이 False인 위치 제외)"""
+        if eligible is not None:
+            scores = np.where(eligible, scores, -np.inf)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.array([], dtype=int)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.isfinite(scores[top])]
+
+    def _search_cascade(
+        self,
+        state: HybridIndexState,
+        query: str,
+        query_embedding: np.ndarray,
+        k: int,
+        alpha: float,
+        filters: Optional[Dict[str, Any]] = None,
+        candidate_pool: Optional[int] = None
+    ) -> List[Dict]:
+        """캐스케이드 검색 본체"""
+        pool = candidate_pool or self.candidate_pool
+        mask = self._facet_mask(state, filters)
+        
+        # 1. 어휘 기반 후보 생성
+        candidates, bm25_scores = state.bm25.top_candidates(query, pool, mask)
+        lexical = len(candidates) > 0
+        
+        if not lexical:
+            # 어휘 재현율이 없으면 전체 의미적 검색으로 대체
+            logger.info(f"어휘 후보 없음, 의미적 검색으로 대체: '{query}'")
+            candidates = np.arange(len(state.products)) if mask is None else np.flatnonzero(mask)
+            bm25_scores = np.zeros(len(candidates))
+            alpha = 1.0
+        
+        # 2. 후보에 대해서만 의미적 점수 계산
+        if query_embedding.size > 0 and len(candidates) > 0:
+            semantic_scores = np.dot(state.embeddings[candidates], query_embedding.T).flatten()
+        else:
+            semantic_scores = np.zeros(len(candidates))
+        
+        semantic_scores_norm = self._normalize_scores(semantic_scores)
+        # 어휘 후보끼리 BM25 점수가 모두 같으면(후보 1개 포함) 같은 강도의 어휘 일치로 보고 1.0
+        bm25_scores_norm = self._normalize_scores(bm25_scores, tied=1.0 if lexical else 0.0)
+        hybrid_scores = alpha * semantic_scores_norm + (1 - alpha) * bm25_scores_norm
+        
+        # 하이브리드 검색과 같이 점수가 0인 후보(후보 중 가장 약한 일치)는 제외
+        order = np.argsort(hybrid_scores)[::-1][:k]
+        results = []
+        for pos in order:
+            if hybrid_scores[pos] <= 0:
+                continue
+            results.append({
+                'product': state.products[candidates[pos]],
+                'score': float(hybrid_scores[pos]),
+                'semantic_score': float(semantic_scores_norm[pos]),
+                'keyword_score': float(bm25_scores_norm[pos]),
+                'rank': len(results) + 1
+            })
+        
+        logger.info(f"캐스케이드 검색 완료: 후보 {len(candidates)}개 중 {len(results)}개 결과")
+        return results
+    
+    def _format_results(
+        self,
+        state: HybridIndexState,
+        top_indices: np.ndarray,
+        hybrid_scores: np.ndarray,
+        semantic_scores_norm: np.ndarray,
+        bm25_scores_norm: np.ndarray
+    ) -> List[Dict]:
+        """검색 결과 포맷팅"""
         results = []
         for idx in top_indices:
             if hybrid_scores[idx] > 0:  # 점수가 0보다 큰 경우만
                 results.append({
-                    'product': self.products[idx],
+                    'product': state.products[idx],
                     'score': float(hybrid_scores[idx]),
                     'semantic_score': float(semantic_scores_norm[idx]),
                     'keyword_score': float(bm25_scores_norm[idx]),
                     'rank': len(results) + 1
                 })
-        
-        logger.info(f"검색 완료: {len(results)}개 결과")
         return results
     
-    def _normalize_scores(self, scores: np.ndarray) -> np.ndarray:
-        """점수 정규화 (0-1 범위)"""
-        if scores.max() == scores.min():
-            return np.zeros_like(scores)
+    def _normalize_scores(self, scores: np.ndarray, tied: float = 0.0) -> np.ndarray:
+        """점수 정규화 (0-1 범위, 모든 점수가 같으면 tied)"""
+        if scores.size == 0 or scores.max() == scores.min():
+            return np.full_like(scores, tied, dtype=float)
         return (scores - scores.min()) / (scores.max() - scores.min())
 
+class VectorShard:
+    """벡터 DB 샤드 (Chroma 컬렉션 + 하이브리드 검색 엔진)"""
+    
+    def __init__(self, key: str, collection, search_engine: HybridSearchEngine):
+        self.key = key
+        self.collection = collection
+        self.search_engine = search_engine
+
 class AdvancedVectorDbModule:
     """고급 벡터 DB 모듈"""
     
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    COLLECTION_NAME = "procurement_products"
+    
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        shard_by: Optional[str] = None,
+        num_shards: Optional[int] = None,
+        shared_index_dir: Optional[str] = None,
+        shared_index_publisher: Optional[bool] = None
+    ):
         self.persist_directory = persist_directory
         self.client = None
+        self.client_pool: Optional[ChromaClientPool] = None
         self.collection = None
-        self.hybrid_search = HybridSearchEngine()
+        self.embedding_engine = KoreanEmbeddingEngine()
+        self.hybrid_search = HybridSearchEngine(embedding_engine=self.embedding_engine)
+        
+        # 샤딩 설정: None(단일 컬렉션), 'category'(최상위 카테고리), 'hash'(ID 해시)
+        self.shard_by = (shard_by if shard_by is not None else ProcureMateSettings.RAG_SHARD_BY) or None
+        self.num_shards = num_shards or ProcureMateSettings.RAG_NUM_SHARDS
+        self.shards: Dict[str, VectorShard] = {}
+        
+        # 워커 간 공유 색인 (빈 값이면 비활성화)
+        self.shared_index_dir = shared_index_dir if shared_index_dir is not None else ProcureMateSettings.RAG_SHARED_INDEX_DIR
+        self.shared_index_publisher = (
+            shared_index_publisher if shared_index_publisher is not None
+            else ProcureMateSettings.RAG_SHARED_INDEX_PUBLISHER
+        )
+        self._shared_stores: Dict[str, SharedIndexStore] = {}
+        self._last_shared_check = 0.0
+        self._shared_refresh_lock = threading.Lock()
     
     async def initialize(self):
         """벡터 DB 초기화"""
         try:
-            self.client = chromadb.PersistentClient(
-                path=self.persist_directory,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
+            # VECTOR_DB_MODE에 따라 embedded 또는 HTTP 서버 클라이언트 풀 사용
+            self.client_pool = ChromaClientPool(self.persist_directory)
+            self.client = self.client_pool.client
             
-            # 컬렉션 생성 또는 가져오기
-            try:
-                self.collection = self.client.get_collection("procurement_products")
-                logger.info("기존 벡터 DB 컬렉션 로드")
-            except:
-                self.collection = self.client.create_collection(
-                    name="procurement_products",
-                    metadata={"description": "조달 상품 정보"}
-                )
-                logger.info("새 벡터 DB 컬렉션 생성")
-            
-            # 하이브리드 검색 엔진 초기화
+            # 하이브리드 검색 엔진 초기화 (임베딩 모델은 모든 샤드가 공유)
             await self.hybrid_search.initialize()
             
+            if self.shard_by:
+                self._load_existing_shards()
+                logger.info(f"샤드 모드 활성화: {self.shard_by}, 기존 샤드 {len(self.shards)}개")
+            else:
+                # 컬렉션 생성 또는 가져오기
+                try:
+                    self.collection = self.client.get_collection(self.COLLECTION_NAME)
+                    logger.info("기존 벡터 DB 컬렉션 로드")
+                except:
+                    self.collection = self.client.create_collection(
+                        name=self.COLLECTION_NAME,
+                        metadata={"description": "조달 상품 정보"}
+                    )
+                    logger.info("새 벡터 DB 컬렉션 생성")
+                
+                self.shards = {"default": VectorShard("default", self.collection, self.hybrid_search)}
+            
+            if self.shared_index_dir:
+                await asyncio.to_thread(self.refresh_shared_index, True)
+            
             logger.info("고급 벡터 DB 모듈 초기화 완료")
             
         except Exception as e:
             logger.error(f"벡터 DB 초기화 실패: {str(e)}", exc_info=True)
             raise
     
+    # === 샤드 관리 ===
+    
+    def _shard_key(self, product: UnifiedProduct) -> str:
+        """상품이 속할 샤드 키 계산"""
+        if not self.shard_by:
+            return "default"
+        
+        if self.shard_by == "category":
+            return product.category[0] if product.category and product.category[0] else "기타"
+        
+        digest = hashlib.md5(product.id.encode('utf-8')).hexdigest()
+        return str(int(digest, 16) % self.num_shards)
+    
+    def _shard_collection_name(self, shard_key: str) -> str:
+        """샤드 컬렉션 이름 (Chroma 이름 규칙상 한글 카테고리는 해시로 변환)"""
+        if self.shard_by == "hash":
+            return f"{self.COLLECTION_NAME}_h{shard_key}"
+        digest = hashlib.md5(shard_key.encode('utf-8')).hexdigest()[:10]
+        return f"{self.COLLECTION_NAME}_c{digest}"
+    
+    def _load_existing_shards(self):
+        """저장된 샤드 컬렉션 로드 (검색 색인은 rebuild_shard에 상품 목록을 전달해 재구성)"""
+        for collection in self.client.list_collections():
+            metadata = collection.metadata or {}
+            if metadata.get("shard_by") == self.shard_by and "shard_key" in metadata:
+                self.shards[metadata["shard_key"]] = self._create_shard(metadata["shard_key"], collection)
+    
+    def _create_shard(self, shard_key: str, collection=None) -> VectorShard:
+        """샤드 생성"""
+        if collection is None:
+            collection = self.client.get_or_create_collection(
+                name=self._shard_collection_name(shard_key),
+                metadata={
+                    "description": "조달 상품 정보 샤드",
+                    "shard_by": self.shard_by,
+                    "shard_key": shard_key
+                }
+            )
+        
+        search_engine = HybridSearchEngine(
+            retrieval_mode=self.hybrid_search.retrieval_mode,
+            candidate_pool=self.hybrid_search.candidate_pool,
+            embedding_engine=self.embedding_engine
+        )
+        search_engine.is_initialized = self.hybrid_search.is_initialized
+        return VectorShard(shard_key, collection, search_engine)
+    
+    def _get_or_create_shard(self, shard_key: str) -> VectorShard:
+        """샤드 조회 또는 생성"""
+        if shard_key not in self.shards:
+            self.shards[shard_key] = self._create_shard(shard_key)
+            logger.info(f"새 샤드 생성: {shard_key}")
+        return self.shards[shard_key]
+    
+    def _target_shards(self, filters: Optional[Dict[str, Any]] = None) -> List[VectorShard]:
+        """검색 대상 샤드 선택 (카테고리 샤딩 시 카테고리 필터로 범위 축소)"""
+        if self.shard_by == "category" and filters and filters.get('category'):
+            shard = self.shards.get(filters['category'])
+            return [shard] if shard else []
+        return list(self.shards.values())
+    
+    async def rebuild_shard(self, shard_key: str, products: Optional[List[UnifiedProduct]] = None):
+        """단일 샤드 재구성 (다른 샤드는 영향 없음)
+
+        products를 생략하면 메모리 색인의 상품으로 재구성. 재시작 직후처럼 메모리 색인이 비어 있으면
+        저장된 컬렉션을 지우지 않도록 재구성을 거부하므로 상품 목록을 직접 전달해야 함
+        """
+        shard = self._get_or_create_shard(shard_key)
+        products = list(products) if products is not None else list(shard.search_engine.products)
+        if not products:
+            stored = shard.collection.count()
+            logger.warning(f"샤드 재구성 거부: {shard_key} (재구성할 상품 없음, 저장된 문서 {stored}개)")
+            raise ValueError(f"샤드 {shard_key}을(를) 재구성할 상품이 없습니다. products를 전달하세요")
+
+        logger.info(f"샤드 재구성 시작: {shard_key} ({len(products)}개)")
+        
+        self.client.delete_collection(shard.collection.name)
+        self.client_pool.invalidate(shard.collection.name)
+        if self.shard_by:
+            shard.collection = self._create_shard(shard_key).collection
+        else:
+            self.collection = self.client.create_collection(
+                name=self.COLLECTION_NAME,
+                metadata={"description": "조달 상품 정보"}
+            )
+            shard.collection = self.collection
+        
+        await shard.search_engine.index_products(products)
+        await self._add_to_collection(shard.collection, products)
+        await self._publish_if_publisher([shard_key])
+
+        logger.info(f"샤드 재구성 완료: {shard_key}")
+    
+    # === 워커 간 공유 색인 ===
+    
+    def _shared_store(self, shard_key: str) -> SharedIndexStore:
+        """샤드별 공유 색인 저장소"""
+        if shard_key not in self._shared_stores:
+            self._shared_stores[shard_key] = SharedIndexStore(os.path.join(self.shared_index_dir, shard_key))
+        return self._shared_stores[shard_key]
+    
+    def publish_shared_index(self, shard_keys: Optional[List[str]] = None) -> Dict[str, int]:
+        """현재 색인을 공유 색인 새 세대로 게시 (게시 담당 프로세스에서 호출, shard_keys 생략 시 전체 샤드)"""
+        if not self.shared_index_dir:
+            raise ValueError("RAG_SHARED_INDEX_DIR가 설정되지 않음")
+        
+        published = {}
+        for key in (shard_keys if shard_keys is not None else list(self.shards)):
+            state = self.shards[key].search_engine.state
+            if not state.is_empty:
+                # 워커가 BM25/변경 감지 해시를 다시 만들지 않도록 역색인 배열도 함께 게시
+                arrays = state.bm25.to_arrays()
+                arrays['text_hashes'] = np.array(state.text_hashes, dtype='S64')
+                published[key] = self._shared_store(key).publish(list(state.products), state.embeddings, arrays)
+        
+        logger.info(f"공유 색인 게시: {published}")
+        return published
+    
+    async def _publish_if_publisher(self, shard_keys: List[str]):
+        """게시 담당 프로세스면 변경된 샤드를 새 세대로 게시 (파일 쓰기는 이벤트 루프 밖에서)"""
+        if self.shared_index_dir and self.shared_index_publisher:
+            await asyncio.to_thread(self.publish_shared_index, shard_keys)
+    
+    def _shared_refresh_due(self) -> bool:
+        """공유 색인 확인 주기 경과 여부"""
+        return time.monotonic() - self._last_shared_check >= ProcureMateSettings.RAG_SHARED_INDEX_POLL_SECONDS
+    
+    def refresh_shared_index(self, force: bool = False) -> bool:
+        """새 세대가 게시되었으면 교체 연결 (RAG_SHARED_INDEX_POLL_SECONDS 간격으로 확인)
+
+        세대 연결은 디스크에서 매니페스트/배열 헤더를 읽으므로 이벤트 루프에서는 asyncio.to_thread로 호출.
+        다른 스레드가 교체 중이면 기다리지 않고 False 반환
+        """
+        if not self.shared_index_dir or not os.path.isdir(self.shared_index_dir):
+            return False
+        
+        if not force and not self._shared_refresh_due():
+            return False
+        
+        if not self._shared_refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_shared_check = time.monotonic()
+            return self._swap_shared_generations()
+        finally:
+            self._shared_refresh_lock.release()
+    
+    def _swap_shared_generations(self) -> bool:
+        """샤드별 CURRENT 세대 확인 후 새 세대로 교체"""
+        swapped = False
+        for shard_key in sorted(os.listdir(self.shared_index_dir)):
+            if not os.path.isdir(os.path.join(self.shared_index_dir, shard_key)):
+                continue
+            if shard_key != "default" and not self.shard_by:
+                continue
+            
+            store = self._shared_store(shard_key)
+            generation = store.current_generation()
+            shard = self._get_or_create_shard(shard_key)
+            if generation is None or generation == shard.search_engine.shared_generation:
+                continue
+            
+            # 연결 도중 세대가 정리되면 attach가 CURRENT를 다시 읽어 재시도, 실패하면 기존 색인 유지
+            shared = store.attach(generation)
+            if shared is None:
+                continue
+            
+            # 이전 세대는 진행 중인 검색이 쥔 상태 참조가 사라질 때 매핑 해제
+            shard.search_engine.attach_shared_index(shared)
+            swapped = True
+        
+        return swapped
+    
+    # === 상품 추가 및 검색 ===
+    
     async def add_products(self, products: List[UnifiedProduct]):
         """상품 벡터 DB에 추가"""
         if not products:
@@ -324,17 +1202,40 @@ class AdvancedVectorDbModule:
         
         logger.info(f"벡터 DB에 상품 추가: {len(products)}개")
         
-        # 하이브리드 검색 엔진에 인덱싱
-        await self.hybrid_search.index_products(products)
+        grouped: Dict[str, List[UnifiedProduct]] = {}
+        for product in products:
+            grouped.setdefault(self._shard_key(product), []).append(product)
+        
+        for shard_key, shard_products in grouped.items():
+            shard = self._get_or_create_shard(shard_key)
+            
+            # 하이브리드 검색 엔진에 증분 인덱싱
+            await shard.search_engine.add_products(shard_products)
+            
+            # ChromaDB에 저장
+            await self._add_to_collection(shard.collection, shard_products)
         
-        # ChromaDB에 저장
+        await self._publish_if_publisher(list(grouped))
+        logger.info(f"벡터 DB 저장 완료: {len(products)}개 ({len(grouped)}개 샤드)")
+    
+    def _document_id(self, product: UnifiedProduct, doc_text: str) -> str:
+        """출처 + 원본 상품 ID 기반 결정적 Chroma 문서 ID"""
+        source_id = (
+            product.metadata.get('product_id')
+            or product.metadata.get('announcement_number')
+            or product.id
+        )
+        return stable_document_id(product.source, source_id, doc_text)
+    
+    async def _add_to_collection(self, collection, products: List[UnifiedProduct]) -> int:
+        """Chroma 컬렉션에 상품 문서 배치 upsert (내용이 바뀐 문서만 재임베딩)"""
         documents = []
         metadatas = []
         ids = []
         
         for product in products:
             # 문서 텍스트 생성
-            doc_text = self.hybrid_search.embedding_engine.create_product_embedding_text(product)
+            doc_text = self.embedding_engine.create_product_embedding_text(product)
             documents.append(doc_text)
             
             # 메타데이터 준비
@@ -351,39 +1252,43 @@ class AdvancedVectorDbModule:
                 if isinstance(value, (str, int, float, bool)):
                     metadata[f'meta_{key}'] = value
             
+            metadata['product_id'] = product.id
             metadatas.append(metadata)
-            ids.append(product.id)
+            ids.append(self._document_id(product, doc_text))
         
-        self.collection.add(
+        return await self.client_pool.upsert_changed(
+            collection.name,
+            ids=ids,
             documents=documents,
-            metadatas=metadatas,
-            ids=ids
+            metadatas=metadatas
         )
-        logger.info(f"벡터 DB 저장 완료: {len(products)}개")
 
-
-    async def search_similar_products(self, query: str, limit: int = 5) -> List[Dict]:
+    async def search_similar_products(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
         """유사 상품 검색"""
-        # 하이브리드 검색 실행
-        hybrid_results = await self.hybrid_search.search(query, k=limit)
+        if self.shared_index_dir and not self.shared_index_publisher and self._shared_refresh_due():
+            # 게시 프로세스는 자신의 색인이 원본이므로 확인 생략
+            # 세대 교체(파일 연결)는 이벤트 루프를 막지 않도록 스레드에서 실행
+            await asyncio.to_thread(self.refresh_shared_index)
         
-        # ChromaDB 검색도 수행 (백업)
-        chroma_results = []
-        try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=limit
-            )
-            
-            if results['documents'] and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    chroma_results.append({
-                        'document': doc,
-                        'metadata': results['metadatas'][0][i],
-                        'distance': results['distances'][0][i] if results['distances'] else 0.5
-                    })
-        except Exception as e:
-            logger.warning(f"ChromaDB 검색 실패: {str(e)}")
+        shards = self._target_shards(filters)
+        
+        # 하이브리드 검색 실행 (쿼리 임베딩은 한 번만 계산 후 샤드에 병렬 분산)
+        hybrid_results = []
+        if any(shard.search_engine.products for shard in shards):
+            query_embedding = await self.embedding_engine.create_embeddings([query])
+            shard_candidates = await asyncio.gather(*[
+                asyncio.to_thread(
+                    shard.search_engine.score_candidates,
+                    query, query_embedding, limit, 0.6, filters
+                )
+                for shard in shards
+            ])
+            hybrid_results = self._merge_shard_candidates(shard_candidates, limit, 0.6)
         
         # 하이브리드 결과를 우선 사용
         if hybrid_results:
@@ -391,7 +1296,7 @@ class AdvancedVectorDbModule:
             for result in hybrid_results:
                 product = result['product']
                 formatted_results.append({
-                    'document': self.hybrid_search.embedding_engine.create_product_embedding_text(product),
+                    'document': self.embedding_engine.create_product_embedding_text(product),
                     'metadata': {
                         'source': product.source,
                         'name': product.name['normalized'],
@@ -404,14 +1309,100 @@ class AdvancedVectorDbModule:
                     'keyword_score': result['keyword_score']
                 })
             
-            logger.info(f"하이브리드 검색 결과: {len(formatted_results)}개")
+            logger.info(f"하이브리드 검색 결과: {len(formatted_results)}개 ({len(shards)}개 샤드)")
             return formatted_results
         
-        # 하이브리드 결과가 없으면 ChromaDB 결과 사용
+        # 하이브리드 결과가 없으면 ChromaDB 결과 사용 (백업)
+        shard_results = await asyncio.gather(*[
+            self._query_collection(shard.collection, query, limit)
+            for shard in shards
+        ])
+        chroma_results = heapq.nsmallest(
+            limit,
+            (result for results in shard_results for result in results),
+            key=lambda result: result['distance']
+        )
+        
         logger.info(f"ChromaDB 검색 결과: {len(chroma_results)}개")
         return chroma_results
-        
 
+    def _merge_shard_candidates(self, shard_candidates: List[Dict[str, Any]], limit: int, alpha: float = 0.6) -> List[Dict]:
+        """샤드별 원시 점수를 전체 점수 범위로 한 번에 정규화한 뒤 상위 limit개 선택
+
+        샤드마다 따로 정규화하면 샤드별 최고 점수가 모두 1.0이 되어 샤드 간 비교가 불가능하므로,
+        각 샤드의 점수 범위를 합쳐 단일 색인과 같은 기준으로 정규화
+        """
+        lexical_tie = 0.0
+        if self.hybrid_search.retrieval_mode == "cascade":
+            # 단일 색인과 동일하게 어휘 후보가 하나라도 있으면 어휘 후보만, 없으면 의미적 점수만 사용
+            if any(candidates['lexical'] for candidates in shard_candidates):
+                shard_candidates = [candidates for candidates in shard_candidates if candidates['lexical']]
+                lexical_tie = 1.0
+            else:
+                alpha = 1.0
+
+        shard_candidates = [candidates for candidates in shard_candidates if candidates['products']]
+        if not shard_candidates:
+            return []
+
+        products = [product for candidates in shard_candidates for product in candidates['products']]
+        semantic_scores = self._normalize_over_ranges(
+            np.concatenate([candidates['semantic'] for candidates in shard_candidates]),
+            [candidates['semantic_range'] for candidates in shard_candidates]
+        )
+        keyword_scores = self._normalize_over_ranges(
+            np.concatenate([candidates['keyword'] for candidates in shard_candidates]),
+            [candidates['keyword_range'] for candidates in shard_candidates],
+            tied=lexical_tie
+        )
+        hybrid_scores = alpha * semantic_scores + (1 - alpha) * keyword_scores
+
+        results = []
+        for idx in np.argsort(-hybrid_scores, kind='stable'):
+            if len(results) >= limit:
+                break
+            # 단일 색인 검색과 같이 점수가 0인 결과 제외
+            if hybrid_scores[idx] <= 0:
+                continue
+            results.append({
+                'product': products[idx],
+                'score': float(hybrid_scores[idx]),
+                'semantic_score': float(semantic_scores[idx]),
+                'keyword_score': float(keyword_scores[idx]),
+                'rank': len(results) + 1
+            })
+        return results
+
+    @staticmethod
+    def _normalize_over_ranges(scores: np.ndarray, ranges: List[Tuple[float, float]], tied: float = 0.0) -> np.ndarray:
+        """샤드별 (최소, 최대) 범위를 합친 전체 범위로 점수 정규화 (0-1 범위, 범위가 한 점이면 tied)"""
+        low = min(score_range[0] for score_range in ranges)
+        high = max(score_range[1] for score_range in ranges)
+        if high == low:
+            return np.full_like(scores, tied, dtype=float)
+        return (scores - low) / (high - low)
+
+    async def _query_collection(self, collection, query: str, limit: int) -> List[Dict]:
+        """단일 Chroma 컬렉션 검색"""
+        chroma_results = []
+        try:
+            results = await self.client_pool.query(
+                collection.name,
+                n_results=limit,
+                query_texts=[query]
+            )
+            
+            if results['documents'] and results['documents'][0]:
+                for i, doc in enumerate(results['documents'][0]):
+                    chroma_results.append({
+                        'document': doc,
+                        'metadata': results['metadatas'][0][i],
+                        'distance': results['distances'][0][i] if results['distances'] else 0.5
+                    })
+        except Exception as e:
+            logger.warning(f"ChromaDB 검색 실패: {str(e)}")
+        
+        return chroma_results
     
     async def find_similar_procurement_cases(self, analysis: Dict, limit: int = 3) -> List[Dict]:
         """유사한 조달 사례 검색"""
@@ -448,12 +1439,21 @@ class AdvancedVectorDbModule:
     
     async def get_statistics(self) -> Dict:
         """벡터 DB 통계 정보"""
-        count = self.collection.count()
+        shard_stats = {
+            key: {
+                'collection_name': shard.collection.name,
+                'total_products': shard.collection.count(),
+                'indexed_products': len(shard.search_engine.products)
+            }
+            for key, shard in self.shards.items()
+        }
         
         return {
-            'total_products': count,
-            'collection_name': self.collection.name,
-            'hybrid_search_ready': len(self.hybrid_search.products) > 0,
+            'total_products': sum(stat['total_products'] for stat in shard_stats.values()),
+            'collection_name': self.collection.name if self.collection else self.COLLECTION_NAME,
+            'hybrid_search_ready': any(stat['indexed_products'] > 0 for stat in shard_stats.values()),
+            'shard_by': self.shard_by,
+            'shards': shard_stats,
             'last_updated': datetime.now().isoformat()
         }
 
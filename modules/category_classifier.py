@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+카테고리 분류기 - 키워드 오토마톤 + 임베딩 중심 벡터 대체 분류
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import ProcureMateSettings
+from normalization.text_embedder import create_text_embedder
+from utils import get_logger, MultiPatternMatcher
+
+logger = get_logger(__name__)
+
+
+class CategoryClassifier:
+    """표준 카테고리 분류기 (DataIntegrator의 카테고리 매핑에서 한 번 생성)
+
+    - 키워드: 모든 카테고리 키워드를 하나의 오토마톤으로 컴파일해 텍스트당 한 번만 스캔.
+      겹치는 매칭까지 모두 모은 뒤 매핑 순서상 가장 앞선 카테고리를 고르므로
+      카테고리/키워드를 차례로 부분 문자열 검사하던 결과와 같다.
+    - 대체 분류: 키워드가 하나도 맞지 않은 텍스트만 배치로 임베딩해, 카테고리별
+      중심 벡터(카테고리명 + 키워드 임베딩 평균, 처음 사용할 때 한 번 계산)와의
+      코사인 유사도가 min_similarity 이상인 가장 가까운 카테고리로 분류한다.
+      embedder를 넘기지 않으면 EMBEDDING_BACKEND 설정의 임베딩을 사용하고,
+      min_similarity 기본값은 CATEGORY_FALLBACK_MIN_SIMILARITY (백엔드를 바꾸면 함께 조정).
+    """
+
+    MAX_CACHED_TEXTS = 10000
+
+    def __init__(
+        self,
+        category_mappings: Dict[str, List[str]],
+        embedder=None,
+        min_similarity: Optional[float] = None
+    ):
+        self.categories = list(category_mappings)
+        self.category_mappings = category_mappings
+        self.embedder = embedder or create_text_embedder()
+        self.min_similarity = (
+            ProcureMateSettings.CATEGORY_FALLBACK_MIN_SIMILARITY if min_similarity is None else min_similarity
+        )
+
+        # 부분 문자열 검사와 같도록 단어 경계 없이 대소문자 구분
+        self.matcher = MultiPatternMatcher(word_boundary=False)
+        self.matcher.add_mappings(category_mappings, case_sensitive=True)
+        self.matcher.build()
+        self._rank = {category: rank for rank, category in enumerate(self.categories)}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._keyword_cache: Dict[str, Optional[str]] = {}
+        self.reset_stats()
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """카테고리별 정규화된 중심 벡터 (카테고리 수 x 차원)"""
+        if self._centroids is None:
+            rows = []
+            for category, keywords in self.category_mappings.items():
+                vectors = self.embedder.encode([category, *keywords])
+                rows.append(vectors.mean(axis=0))
+            centroids = np.vstack(rows)
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._centroids = (centroids / norms).astype(np.float32)
+        return self._centroids
+
+    def match_keywords(self, text: str) -> Optional[str]:
+        """키워드가 포함된 카테고리 중 매핑 순서상 첫 번째 (쿠팡 카테고리명처럼 반복되는 텍스트는 캐시)"""
+        try:
+            return self._keyword_cache[text]
+        except KeyError:
+            pass
+
+        matches = self.matcher.find_all(text) if text else []
+        category = min((c for _, _, _, c in matches), key=self._rank.__getitem__) if matches else None
+        if len(self._keyword_cache) < self.MAX_CACHED_TEXTS:
+            self._keyword_cache[text] = category
+        return category
+
+    def classify(
+        self,
+        texts: Sequence[str],
+        fallback_texts: Optional[Sequence[str]] = None
+    ) -> List[Optional[str]]:
+        """텍스트 배치 분류 (분류되지 않으면 None)
+
+        texts: 키워드 검사 대상, fallback_texts: 키워드가 없을 때 임베딩할 텍스트 (기본은 texts)
+        """
+        started = time.perf_counter()
+        results = [self.match_keywords(text) for text in texts]
+
+        for category in results:
+            if category:
+                self.stats['keyword'][category] = self.stats['keyword'].get(category, 0) + 1
+
+        unmatched = [idx for idx, category in enumerate(results) if category is None]
+        if unmatched:
+            fallback_texts = texts if fallback_texts is None else fallback_texts
+            candidates = [idx for idx in unmatched if fallback_texts[idx]]
+            if candidates:
+                vectors = self.embedder.encode([fallback_texts[idx] for idx in candidates])
+                similarities = vectors @ self.centroids.T
+                best = similarities.argmax(axis=1)
+                for idx, rank, similarity in zip(candidates, best, similarities[np.arange(len(candidates)), best]):
+                    if similarity >= self.min_similarity:
+                        category = self.categories[rank]
+                        results[idx] = category
+                        self.stats['embedding'][category] = self.stats['embedding'].get(category, 0) + 1
+
+        self.stats['unmatched'] += sum(1 for category in results if category is None)
+        self.stats['items'] += len(texts)
+        self.stats['batches'] += 1
+        self.stats['seconds'] += time.perf_counter() - started
+        return results
+
+    def reset_stats(self):
+        """통계 초기화"""
+        self.stats: Dict[str, Any] = {
+            'keyword': {},
+            'embedding': {},
+            'unmatched': 0,
+            'items': 0,
+            'batches': 0,
+            'seconds': 0.0
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """카테고리별 적중 수(키워드/임베딩)와 지연 시간"""
+        hits = {
+            category: {
+                'keyword': self.stats['keyword'].get(category, 0),
+                'embedding': self.stats['embedding'].get(category, 0)
+            }
+            for category in self.categories
+        }
+        items = self.stats['items']
+        return {
+            'hits': hits,
+            'unmatched': self.stats['unmatched'],
+            'items': items,
+            'batches': self.stats['batches'],
+            'total_ms': self.stats['seconds'] * 1000,
+            'avg_item_us': self.stats['seconds'] / items * 1e6 if items else 0.0
+        }
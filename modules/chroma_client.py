@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Chroma 클라이언트 팩토리 및 연결 풀 - embedded/HTTP 모드 지원
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import chromadb
+from chromadb.config import Settings
+
+from config import ProcureMateSettings
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def create_chroma_client(persist_directory: str = "./chroma_db", mode: Optional[str] = None):
+    """설정에 따라 Chroma 클라이언트 생성
+
+    - embedded: 로컬 SQLite 기반 PersistentClient (기본값, 단일 프로세스용)
+    - http: 독립 실행 Chroma 서버에 연결하는 HttpClient (다중 워커 배포용)
+    """
+    mode = (mode or ProcureMateSettings.VECTOR_DB_MODE).lower()
+    settings = Settings(anonymized_telemetry=False, allow_reset=True)
+
+    if mode == "http":
+        logger.info(f"Chroma HTTP 클라이언트 연결: {ProcureMateSettings.VECTOR_DB_HOST}:{ProcureMateSettings.VECTOR_DB_PORT}")
+        return chromadb.HttpClient(
+            host=ProcureMateSettings.VECTOR_DB_HOST,
+            port=ProcureMateSettings.VECTOR_DB_PORT,
+            settings=settings
+        )
+
+    if mode != "embedded":
+        logger.warning(f"알 수 없는 Chroma 모드 '{mode}', embedded 모드 사용")
+
+    return chromadb.PersistentClient(path=persist_directory, settings=settings)
+
+
+def text_hash(text: str) -> str:
+    """문서 내용 해시 (변경 감지용)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def stable_document_id(source: str, source_id: Optional[str] = None, text: Optional[str] = None) -> str:
+    """출처 + 원본 상품 ID 기반 결정적 문서 ID (원본 ID가 없으면 내용 해시 사용)"""
+    if source_id and not str(source_id).endswith('unknown'):
+        key = f"{source}:{source_id}"
+    else:
+        key = f"{source}:content:{text_hash(text or '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class ChromaClientPool:
+    """Chroma 클라이언트 풀
+
+    HTTP 모드에서는 클라이언트마다 별도의 HTTP 세션을 가지므로 동시 요청이 서버로 분산된다.
+    embedded 모드에서는 하나의 PersistentClient를 공유하고 동시성을 1로 제한한다.
+    동기 Chroma 호출은 스레드로 오프로딩하여 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        mode: Optional[str] = None,
+        size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        client=None
+    ):
+        self.mode = (mode or ProcureMateSettings.VECTOR_DB_MODE).lower()
+        self.persist_directory = persist_directory
+        self.size = 1 if self.mode != "http" else (size or ProcureMateSettings.VECTOR_DB_POOL_SIZE)
+        self.batch_size = batch_size or ProcureMateSettings.VECTOR_DB_BATCH_SIZE
+
+        first_client = client or create_chroma_client(persist_directory, self.mode)
+        self._clients = [first_client] + [
+            create_chroma_client(persist_directory, self.mode) for _ in range(self.size - 1)
+        ]
+        self._available: Optional[asyncio.Queue] = None
+        self._collections: List[Dict[str, Any]] = [{} for _ in self._clients]
+
+        logger.info(f"Chroma 클라이언트 풀 생성: 모드={self.mode}, 크기={self.size}")
+
+    @property
+    def client(self):
+        """컬렉션 생성/삭제 등 관리 작업용 기본 클라이언트"""
+        return self._clients[0]
+
+    def invalidate(self, collection_name: str):
+        """삭제/재생성된 컬렉션의 캐시된 핸들 제거"""
+        for cache in self._collections:
+            cache.pop(collection_name, None)
+
+    def _queue(self) -> asyncio.Queue:
+        """사용 가능한 클라이언트 인덱스 큐 (이벤트 루프 내에서 지연 생성)"""
+        if self._available is None:
+            self._available = asyncio.Queue()
+            for idx in range(len(self._clients)):
+                self._available.put_nowait(idx)
+        return self._available
+
+    def _collection(self, client_idx: int, name: str):
+        """클라이언트별 컬렉션 핸들 캐시"""
+        cache = self._collections[client_idx]
+        if name not in cache:
+            cache[name] = self._clients[client_idx].get_or_create_collection(name)
+        return cache[name]
+
+    async def run(self, collection_name: str, method: str, **kwargs) -> Any:
+        """풀에서 클라이언트를 빌려 컬렉션 메서드 실행"""
+        queue = self._queue()
+        client_idx = await queue.get()
+        try:
+            collection = self._collection(client_idx, collection_name)
+            return await asyncio.to_thread(getattr(collection, method), **kwargs)
+        finally:
+            queue.put_nowait(client_idx)
+
+    async def add(
+        self,
+        collection_name: str,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict],
+        embeddings: Optional[List[List[float]]] = None,
+        method: str = "add"
+    ):
+        """배치 단위로 나누어 병렬 추가"""
+        tasks = []
+        for start in range(0, len(ids), self.batch_size):
+            end = start + self.batch_size
+            kwargs = {
+                'ids': ids[start:end],
+                'documents': documents[start:end],
+                'metadatas': metadatas[start:end]
+            }
+            if embeddings is not None:
+                kwargs['embeddings'] = embeddings[start:end]
+            tasks.append(self.run(collection_name, method, **kwargs))
+
+        await asyncio.gather(*tasks)
+        logger.debug(f"Chroma 배치 저장: {collection_name} {len(ids)}개 ({len(tasks)}개 배치)")
+
+    async def upsert_changed(
+        self,
+        collection_name: str,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict]
+    ) -> int:
+        """저장된 text_hash와 다른 문서만 upsert (동일 내용 재수집 시 재임베딩 생략)"""
+        # 배치 내 중복 ID는 마지막 값 사용
+        positions = {doc_id: idx for idx, doc_id in enumerate(ids)}
+        ids = list(positions.keys())
+        documents = [documents[idx] for idx in positions.values()]
+        metadatas = [
+            {**metadatas[idx], 'text_hash': text_hash(documents[pos])}
+            for pos, idx in enumerate(positions.values())
+        ]
+
+        existing = await self.get_text_hashes(collection_name, ids)
+        changed = [
+            idx for idx, doc_id in enumerate(ids)
+            if existing.get(doc_id) != metadatas[idx]['text_hash']
+        ]
+
+        if changed:
+            await self.add(
+                collection_name,
+                ids=[ids[idx] for idx in changed],
+                documents=[documents[idx] for idx in changed],
+                metadatas=[metadatas[idx] for idx in changed],
+                method="upsert"
+            )
+
+        logger.info(f"Chroma upsert: {collection_name} 변경 {len(changed)}개 / 전체 {len(ids)}개")
+        return len(changed)
+
+    async def get_text_hashes(self, collection_name: str, ids: List[str]) -> Dict[str, Optional[str]]:
+        """저장된 문서들의 text_hash 조회"""
+        batches = await asyncio.gather(*[
+            self.run(collection_name, 'get', ids=ids[start:start + self.batch_size], include=['metadatas'])
+            for start in range(0, len(ids), self.batch_size)
+        ])
+
+        hashes = {}
+        for batch in batches:
+            for doc_id, metadata in zip(batch['ids'], batch['metadatas']):
+                hashes[doc_id] = (metadata or {}).get('text_hash')
+        return hashes
+
+    async def query(
+        self,
+        collection_name: str,
+        n_results: int,
+        query_texts: Optional[List[str]] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
+        **kwargs
+    ) -> Dict[str, List]:
+        """여러 쿼리를 배치로 나누어 병렬 검색 후 결과 병합"""
+        queries = query_texts if query_texts is not None else query_embeddings
+        key = 'query_texts' if query_texts is not None else 'query_embeddings'
+
+        tasks = [
+            self.run(collection_name, 'query', n_results=n_results, **{key: queries[start:start + self.batch_size]}, **kwargs)
+            for start in range(0, len(queries), self.batch_size)
+        ]
+        batches = await asyncio.gather(*tasks)
+
+        # 쿼리별 결과 목록만 이어 붙이고 'included' 같은 공통 필드는 첫 배치 값 사용
+        merged: Dict[str, List] = {}
+        for batch in batches:
+            for field, values in batch.items():
+                if isinstance(values, list) and field != 'included':
+                    merged.setdefault(field, []).extend(values)
+                elif field not in merged:
+                    merged[field] = values
+        return merged
@@ -6,17 +6,23 @@
 import asyncio
 import requests
 import time
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Sequence, Union
 from urllib.parse import urlencode
 import hashlib
 import hmac
 import base64
 from datetime import datetime
+from pathlib import Path
 from utils import get_logger, ModuleValidator
 from config import ProcureMateSettings
 from modules.g2b_api_client import G2BAPIClient
 from modules.coupang_api_client import CoupangAuth, RateLimitedCoupangClient
 from modules.data_processor import DataIntegrator, ProductDeduplicator, UnifiedProduct
+from modules.dedupe_index import DedupeIndex
+from modules.ingestion_pipeline import IngestionPipeline
+from modules.price_match_table import CatalogMatcher, PriceMatchTable
+from modules.product_snapshot import ProductSnapshot
+from modules.product_table import ProductTable
 
 logger = get_logger(__name__)
 
@@ -36,6 +42,19 @@ class DataCollectorModule:
         self.data_integrator = DataIntegrator()
         self.deduplicator = ProductDeduplicator()
         
+        # 수집 간 영속 중복 색인 (설정 시 검색어/실행이 달라도 같은 대표 상품으로 연결)
+        self.dedupe_index = (
+            DedupeIndex(ProcureMateSettings.DEDUPE_INDEX_PATH, self.deduplicator)
+            if ProcureMateSettings.DEDUPE_INDEX_PATH else None
+        )
+        self.last_ingest_stats: Optional[Dict[str, Any]] = None
+        
+        # G2B-쿠팡 카탈로그 매칭 테이블 (설정 시 가격 차이를 키 조회로 제공)
+        self.price_match_table = (
+            PriceMatchTable(ProcureMateSettings.PRICE_MATCH_TABLE_PATH)
+            if ProcureMateSettings.PRICE_MATCH_TABLE_PATH else None
+        )
+        
         logger.info("업데이트된 DataCollectorModule 초기화")
     
     async def initialize_clients(self):
@@ -123,7 +142,11 @@ class DataCollectorModule:
         
         # 중복 제거
         if enable_deduplication and all_products:
-            duplicate_groups = await self.deduplicator.find_duplicates(all_products)
+            if self.dedupe_index:
+                canonical_ids = await self.dedupe_index.link_products(all_products)
+                duplicate_groups = self._group_by_canonical(canonical_ids)
+            else:
+                duplicate_groups = await self.deduplicator.find_duplicates(all_products)
             all_products = self._remove_duplicates(all_products, duplicate_groups)
         
         # 결과 정리
@@ -140,10 +163,81 @@ class DataCollectorModule:
             'timestamp': datetime.now().isoformat()
         }
         
+        # 설정 시 결과를 상품 스냅샷으로 저장 (load_search_result로 다시 열기)
+        if ProcureMateSettings.SEARCH_RESULT_SNAPSHOT_DIR:
+            path = await asyncio.to_thread(
+                self.save_search_result, result, self._search_result_path(keyword, result['timestamp'])
+            )
+            result['snapshot_path'] = str(path)
+        
         logger.info(f"고급 검색 완료: 총 {len(all_products)}개 상품")
         return result
             
 
+    async def stream_ingest_products(
+        self,
+        keyword: str,
+        vector_db,
+        filters: Dict[str, Any] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[UnifiedProduct]]:
+        """G2B/쿠팡 페이지를 받는 즉시 변환/중복 제거/색인하고 색인된 배치를 반환
+        
+        advanced_search_products와 달리 전체 응답을 모으지 않으므로 대량 수집에도
+        메모리가 일정하고, 첫 배치부터 vector_db에서 검색 가능하다.
+        """
+        logger.info(f"스트리밍 수집 시작: {keyword}")
+        
+        pipeline = IngestionPipeline(
+            vector_db,
+            data_integrator=self.data_integrator,
+            deduplicator=self.deduplicator,
+            dedupe_index=self.dedupe_index
+        )
+        page_sources = {
+            source: self.iter_source_pages(source, keyword, filters, max_pages)
+            for source in IngestionPipeline.SOURCES
+        }
+        
+        async for batch in pipeline.stream(page_sources):
+            yield batch
+        
+        self.last_ingest_stats = pipeline.stats
+
+    def build_price_match_table(
+        self,
+        g2b_products: Sequence[UnifiedProduct],
+        coupang_products: Sequence[UnifiedProduct]
+    ) -> Dict[str, Any]:
+        """G2B/쿠팡 전체 카탈로그(상품 목록 또는 ProductSnapshot) 매칭 후 테이블 교체"""
+        if not self.price_match_table:
+            raise ValueError("PRICE_MATCH_TABLE_PATH가 설정되지 않았습니다")
+        
+        matcher = CatalogMatcher(normalizer=self.data_integrator.normalizer)
+        return self.price_match_table.rebuild(g2b_products, coupang_products, matcher)
+
+    def get_price_gap(self, source: str, product_id: str) -> Optional[Dict[str, Any]]:
+        """매칭 테이블에서 상품의 상대 플랫폼 가격 차이 조회 (테이블이 없거나 매칭이 없으면 None)"""
+        if not self.price_match_table:
+            return None
+        return self.price_match_table.get_price_gap(source, product_id)
+
+    def save_search_result(self, result: Dict[str, Any], path: str) -> Path:
+        """검색 결과를 상품 스냅샷으로 저장 (products 외 항목은 헤더 메타데이터로 보관)"""
+        metadata = {key: value for key, value in result.items() if key != 'products'}
+        return ProductSnapshot.save(result.get('products', []), Path(path), metadata=metadata)
+
+    def load_search_result(self, path: str) -> Dict[str, Any]:
+        """save_search_result로 저장한 결과 로드 (products는 메모리 매핑된 ProductSnapshot)"""
+        snapshot = ProductSnapshot.load(Path(path))
+        return {**snapshot.metadata, 'products': snapshot, 'snapshot_path': str(path)}
+
+    def _search_result_path(self, keyword: str, timestamp: str) -> str:
+        """검색 결과 스냅샷 경로 (SEARCH_RESULT_SNAPSHOT_DIR/search_<시각>_<검색어 해시>.snap)"""
+        keyword_hash = hashlib.sha1(keyword.encode('utf-8')).hexdigest()[:12]
+        stamp = datetime.fromisoformat(timestamp).strftime('%Y%m%d_%H%M%S_%f')
+        return str(Path(ProcureMateSettings.SEARCH_RESULT_SNAPSHOT_DIR) / f"search_{stamp}_{keyword_hash}.snap")
+
     async def search_by_category(
         self, 
         category: str, 
@@ -241,6 +335,15 @@ class DataCollectorModule:
         # 가격 분석 수행
         analysis = self._analyze_product_prices(products, product_name)
         
+        # 매칭 테이블의 G2B-쿠팡 가격 차이 (검색 결과와 무관하게 전체 카탈로그 기준)
+        if self.price_match_table:
+            analysis['matched_price_gaps'] = [
+                gap for gap in (
+                    self.price_match_table.get_price_gap(product.source, product.id)
+                    for product in products
+                ) if gap
+            ]
+        
         # G2B 가격 정보 추가 조회
         if self.g2b_client:
             async with self.g2b_client as client:
@@ -310,8 +413,13 @@ class DataCollectorModule:
         if not self.g2b_client:
             await self.initialize_clients()
         
+        async with self.g2b_client as client:
+            return await client.get_bid_announcements(self._g2b_params(keyword, filters))
+    
+    def _g2b_params(self, keyword: str, filters: Dict[str, Any] = None, limit: int = 10) -> Dict:
+        """G2B 조회 파라미터"""
         params = {
-            'limit': filters.get('limit', 10) if filters else 10,
+            'limit': filters.get('limit', limit) if filters else limit,
             'keyword': keyword
         }
         
@@ -323,16 +431,20 @@ class DataCollectorModule:
             if filters.get('date_range'):
                 params.update(filters['date_range'])
         
-        async with self.g2b_client as client:
-            return await client.get_bid_announcements(params)
+        return params
     
     async def _async_search_coupang_advanced(self, keyword: str, filters: Dict[str, Any] = None) -> Dict:
         """고급 쿠팡 검색"""
         if not self.coupang_client:
             await self.initialize_clients()
         
+        async with self.coupang_client as client:
+            return await client.search_products(keyword, self._coupang_params(filters))
+    
+    def _coupang_params(self, filters: Dict[str, Any] = None, limit: int = 10) -> Dict:
+        """쿠팡 검색 파라미터"""
         params = {
-            'limit': filters.get('limit', 10) if filters else 10
+            'limit': filters.get('limit', limit) if filters else limit
         }
         
         if filters:
@@ -343,8 +455,50 @@ class DataCollectorModule:
             if filters.get('category'):
                 params['category'] = filters['category']
         
-        async with self.coupang_client as client:
-            return await client.search_products(keyword, params)
+        return params
+    
+    async def iter_source_pages(
+        self,
+        source: str,
+        keyword: str,
+        filters: Dict[str, Any] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """출처 API를 페이지 단위로 조회하며 원본 항목 리스트 반환
+        
+        빈 페이지, 페이지 크기보다 적은 페이지, 또는 max_pages에서 멈춘다.
+        """
+        if not self.g2b_client or not self.coupang_client:
+            await self.initialize_clients()
+        
+        page_size = ProcureMateSettings.INGEST_PAGE_SIZE
+        max_pages = max_pages or ProcureMateSettings.INGEST_MAX_PAGES
+        
+        if source == 'g2b':
+            client, params = self.g2b_client, self._g2b_params(keyword, filters, page_size)
+        else:
+            client, params = self.coupang_client, self._coupang_params(filters, page_size)
+        
+        async with client:
+            for page in range(1, max_pages + 1):
+                params['page'] = page
+                if source == 'g2b':
+                    data = await client.get_bid_announcements(params)
+                else:
+                    data = await client.search_products(keyword, params)
+                
+                items = data.get('items', [])
+                if items:
+                    yield items
+                if len(items) < params['limit']:
+                    break
+    
+    def _group_by_canonical(self, canonical_ids: List[str]) -> List[List[int]]:
+        """같은 대표 상품에 연결된 상품 인덱스 그룹"""
+        groups: Dict[str, List[int]] = {}
+        for idx, canonical_id in enumerate(canonical_ids):
+            groups.setdefault(canonical_id, []).append(idx)
+        return [group for group in groups.values() if len(group) > 1]
     
     def _remove_duplicates(self, products: List[UnifiedProduct], duplicate_groups: List[List[int]]) -> List[UnifiedProduct]:
         """중복 제거"""
@@ -356,92 +510,29 @@ class DataCollectorModule:
         
         return [product for i, product in enumerate(products) if i not in to_remove]
     
-    def _analyze_product_prices(self, products: List[UnifiedProduct], product_name: str) -> Dict[str, Any]:
-        """상품 가격 분석"""
-        prices = [float(product.price['amount']) for product in products if product.price['amount'] > 0]
+    def _analyze_product_prices(
+        self,
+        products: Union[List[UnifiedProduct], ProductTable],
+        product_name: str
+    ) -> Dict[str, Any]:
+        """상품 가격 분석 (열 저장소에서 벡터 연산, 검색 색인의 table을 그대로 전달 가능)"""
+        table = products if isinstance(products, ProductTable) else ProductTable.from_products(products)
         
-        if not prices:
+        analysis = table.price_summary()
+        if not analysis['price_count']:
             return {
                 'error': '분석할 가격 데이터가 없습니다',
                 'price_count': 0
             }
         
-        prices.sort()
-        
-        analysis = {
-            'price_count': len(prices),
-            'min_price': min(prices),
-            'max_price': max(prices),
-            'avg_price': sum(prices) / len(prices),
-            'median_price': prices[len(prices) // 2],
-            'price_range': max(prices) - min(prices),
-            'price_std_dev': self._calculate_std_dev(prices)
-        }
-        
         # 가격대별 분포
-        analysis['price_distribution'] = self._calculate_price_distribution(prices)
+        analysis['price_distribution'] = table.price_distribution()
         
         # 소스별 가격 비교
-        analysis['source_comparison'] = self._compare_prices_by_source(products)
+        analysis['source_comparison'] = table.source_comparison()
         
         return analysis
     
-    def _calculate_std_dev(self, prices: List[float]) -> float:
-        """표준편차 계산"""
-        if len(prices) < 2:
-            return 0.0
-        
-        mean = sum(prices) / len(prices)
-        variance = sum((x - mean) ** 2 for x in prices) / len(prices)
-        return variance ** 0.5
-    
-    def _calculate_price_distribution(self, prices: List[float]) -> Dict[str, int]:
-        """가격대별 분포 계산"""
-        if not prices:
-            return {}
-        
-        min_price = min(prices)
-        max_price = max(prices)
-        range_size = (max_price - min_price) / 5  # 5개 구간
-        
-        distribution = {}
-        for i in range(5):
-            range_start = min_price + (i * range_size)
-            range_end = min_price + ((i + 1) * range_size)
-            
-            count = sum(1 for price in prices if range_start <= price < range_end)
-            if i == 4:  # 마지막 구간은 최대값 포함
-                count = sum(1 for price in prices if range_start <= price <= range_end)
-            
-            distribution[f"{range_start:.0f}-{range_end:.0f}"] = count
-        
-        return distribution
-    
-    def _compare_prices_by_source(self, products: List[UnifiedProduct]) -> Dict[str, Dict[str, float]]:
-        """소스별 가격 비교"""
-        by_source = {}
-        
-        for product in products:
-            source = product.source
-            price = float(product.price['amount'])
-            
-            if price > 0:
-                if source not in by_source:
-                    by_source[source] = []
-                by_source[source].append(price)
-        
-        comparison = {}
-        for source, prices in by_source.items():
-            if prices:
-                comparison[source] = {
-                    'count': len(prices),
-                    'avg_price': sum(prices) / len(prices),
-                    'min_price': min(prices),
-                    'max_price': max(prices)
-                }
-        
-        return comparison
-    
     def _convert_unified_to_legacy_coupang(self, products: List[UnifiedProduct]) -> List[Dict[str, Any]]:
         """UnifiedProduct를 기존 쿠팡 형식으로 변환"""
         legacy_products = []
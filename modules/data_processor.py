@@ -5,44 +5,244 @@ G2B와 쿠팡 데이터를 통합 스키마로 변환
 """
 
 import re
+import sys
+import math
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
+import time
+from typing import Callable, Dict, Iterator, List, Mapping, MutableMapping, Optional, Any, Set, Tuple
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 import json
+import hashlib
 from difflib import SequenceMatcher
-from utils import get_logger
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config import ProcureMateSettings
+from utils import get_logger, MultiPatternMatcher, MinHashLSH, IVFIndex
+from modules.category_classifier import CategoryClassifier
 
 logger = get_logger(__name__)
 
-@dataclass
+def to_krw(amount: Any) -> int:
+    """금액을 원 단위 정수로 변환 (Decimal/float/str 입력, 반올림)"""
+    if isinstance(amount, int):
+        return amount
+    return int(Decimal(str(amount or 0)).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+# 같은 키 구성의 dict는 키 튜플 하나를 공유 (스키마가 고정된 specifications/metadata/timestamps)
+_KEY_LAYOUTS: Dict[Tuple, Tuple] = {}
+_MAX_KEY_LAYOUTS = 1024
+
+def shared_keys(keys: Tuple) -> Tuple:
+    """같은 키 구성이면 이미 등록된 키 튜플 반환 (스냅샷 로드 등 압축 매핑을 직접 만드는 곳에서도 사용)"""
+    if len(_KEY_LAYOUTS) < _MAX_KEY_LAYOUTS:
+        return _KEY_LAYOUTS.setdefault(keys, keys)
+    return _KEY_LAYOUTS.get(keys, keys)
+
+def _pack_mapping(mapping: Optional[Dict]) -> Optional[Tuple[Tuple, Tuple]]:
+    """dict -> (공유 키 튜플, 값 튜플)"""
+    if not mapping:
+        return None
+    return shared_keys(tuple(mapping)), tuple(mapping.values())
+
+def _unpack_mapping(packed: Optional[Tuple[Tuple, Tuple]]) -> Dict:
+    """(키 튜플, 값 튜플) -> dict"""
+    return dict(zip(*packed)) if packed else {}
+
+def _validated_krw(amount: Any) -> int:
+    """원 단위 정수 금액 (음수는 ValueError)"""
+    amount = to_krw(amount)
+    if amount < 0:
+        raise ValueError(f"가격은 0 이상이어야 합니다: {amount}")
+    return amount
+
+class _SlotFieldView(MutableMapping):
+    """상품 고정 필드를 dict처럼 읽고 쓰는 뷰 (name['normalized'] = ... 는 name_normalized 필드 변경)
+    
+    키는 고정이므로 새 키 추가나 삭제는 허용하지 않는다.
+    """
+    
+    __slots__ = ('_product', '_fields')
+    
+    def __init__(self, product: 'UnifiedProduct', fields: Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]]):
+        self._product = product
+        self._fields = fields
+    
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self._product, self._fields[key][0])
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._fields:
+            raise KeyError(f"고정 필드에 없는 키: {key}")
+        attr, convert = self._fields[key]
+        setattr(self._product, attr, convert(value) if convert else value)
+    
+    def __delitem__(self, key: str):
+        raise TypeError(f"고정 필드는 삭제할 수 없습니다: {key}")
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+    
+    def __len__(self) -> int:
+        return len(self._fields)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 class UnifiedProduct:
-    """통합 상품 데이터 모델"""
-    id: str
-    source: str  # 'g2b' 또는 'coupang'
-    name: Dict[str, str]  # {'original': str, 'normalized': str, 'searchable': str}
-    price: Dict[str, Any]  # {'amount': Decimal, 'currency': str, 'vat_included': bool}
-    specifications: Dict[str, Any] = field(default_factory=dict)
-    category: List[str] = field(default_factory=list)
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamps: Dict[str, datetime] = field(default_factory=dict)
+    """통합 상품 데이터 모델
+    
+    __slots__ 기반 고정 필드 레코드 (상품 수백만 개를 메모리에 올리는 경우 대비)
+    - name/price는 고정 필드로 보관하고 필드를 읽고 쓰는 매핑(name['normalized'], price['amount'])으로 제공.
+      name['normalized'] = ... 는 name_normalized, price['amount'] = ... 는 amount 필드를 변경
+      (키 추가/삭제는 불가, product.name = {...} 전체 교체 가능)
+    - 가격은 원 단위 정수, source/currency/카테고리는 intern된 문자열
+    - category는 list (append 등 수정 가능)
+    - specifications/metadata/timestamps는 (공유 키 튜플, 값 튜플)로 보관하고
+      처음 접근할 때 dict로 바꿔 보관 (반환된 dict 수정이 상품에 반영됨)
+    """
+    
+    __slots__ = (
+        'id', 'source',
+        'name_original', 'name_normalized', 'name_searchable',
+        'amount', 'currency', 'vat_included',
+        'category', '_specifications', '_metadata', '_timestamps'
+    )
+    
+    def __init__(
+        self,
+        id: str,
+        source: str,  # 'g2b' 또는 'coupang'
+        name: Dict[str, str],  # {'original': str, 'normalized': str, 'searchable': str}
+        price: Dict[str, Any],  # {'amount': 원 단위 금액, 'currency': str, 'vat_included': bool}
+        specifications: Optional[Dict[str, Any]] = None,
+        category: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        timestamps: Optional[Dict[str, datetime]] = None
+    ):
+        self.id = id
+        self.source = sys.intern(source)
+        self.name = name
+        self.price = price
+        self.category = [sys.intern(c) if isinstance(c, str) else c for c in category or ()]
+        self._specifications = _pack_mapping(specifications)
+        self._metadata = _pack_mapping(metadata)
+        self._timestamps = _pack_mapping(timestamps)
+    
+    @classmethod
+    def _from_fields(
+        cls, id, source, name_original, name_normalized, name_searchable,
+        amount, currency, vat_included, category, specifications, metadata, timestamps
+    ) -> 'UnifiedProduct':
+        """저장된 필드로 바로 복원 (검증 없음, 스냅샷 로드용)
+        
+        source/currency/category는 intern된 문자열, 매핑은 (공유 키 튜플, 값 튜플) 또는 None
+        """
+        product = cls.__new__(cls)
+        product.id = id
+        product.source = source
+        product.name_original = name_original
+        product.name_normalized = name_original if name_normalized == name_original else name_normalized
+        product.name_searchable = product.name_normalized if name_searchable == name_normalized else name_searchable
+        product.amount = amount
+        product.currency = currency
+        product.vat_included = vat_included
+        product.category = list(category)
+        product._specifications = specifications
+        product._metadata = metadata
+        product._timestamps = timestamps
+        return product
+    
+    _NAME_FIELDS = {
+        'original': ('name_original', None),
+        'normalized': ('name_normalized', None),
+        'searchable': ('name_searchable', None)
+    }
+    _PRICE_FIELDS = {
+        'amount': ('amount', _validated_krw),
+        'currency': ('currency', sys.intern),
+        'vat_included': ('vat_included', bool)
+    }
+    
+    @property
+    def name(self) -> MutableMapping[str, str]:
+        # 항목 수정은 고정 필드에 바로 반영
+        return _SlotFieldView(self, self._NAME_FIELDS)
+    
+    @name.setter
+    def name(self, name: Mapping[str, str]):
+        # 정규화 결과가 원문과 같으면 같은 문자열 객체 공유
+        original = name.get('original', '')
+        normalized = name.get('normalized', '')
+        searchable = name.get('searchable', '')
+        self.name_original = original
+        self.name_normalized = original if normalized == original else normalized
+        self.name_searchable = self.name_normalized if searchable == normalized else searchable
+    
+    @property
+    def price(self) -> MutableMapping[str, Any]:
+        return _SlotFieldView(self, self._PRICE_FIELDS)
+    
+    @price.setter
+    def price(self, price: Mapping[str, Any]):
+        self.amount = _validated_krw(price.get('amount', 0))
+        self.currency = sys.intern(price.get('currency', 'KRW'))
+        self.vat_included = bool(price.get('vat_included', True))
+    
+    @property
+    def specifications(self) -> Dict[str, Any]:
+        # 호출자가 수정할 수 있도록 처음 접근할 때 dict로 바꿔 보관
+        if not isinstance(self._specifications, dict):
+            self._specifications = _unpack_mapping(self._specifications)
+        return self._specifications
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if not isinstance(self._metadata, dict):
+            self._metadata = _unpack_mapping(self._metadata)
+        return self._metadata
+    
+    @property
+    def timestamps(self) -> Dict[str, Optional[datetime]]:
+        if not isinstance(self._timestamps, dict):
+            self._timestamps = _unpack_mapping(self._timestamps)
+        return self._timestamps
+    
+    def _fields(self) -> Tuple:
+        return (
+            self.id, self.source, self.name_original, self.name_normalized, self.name_searchable,
+            self.amount, self.currency, self.vat_included, self.category,
+            self.specifications, self.metadata, self.timestamps
+        )
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, UnifiedProduct):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"UnifiedProduct(id={self.id!r}, source={self.source!r}, "
+            f"name={self.name_normalized!r}, amount={self.amount}, category={self.category!r})"
+        )
     
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
         return {
             'id': self.id,
             'source': self.source,
-            'name': self.name,
+            'name': dict(self.name),
             'price': {
-                'amount': float(self.price['amount']),
-                'currency': self.price['currency'],
-                'vat_included': self.price.get('vat_included', True)
+                'amount': float(self.amount),
+                'currency': self.currency,
+                'vat_included': self.vat_included
             },
             'specifications': self.specifications,
-            'category': self.category,
+            'category': list(self.category),
             'metadata': self.metadata,
-            'timestamps': {k: v.isoformat() for k, v in self.timestamps.items()}
+            'timestamps': {k: v.isoformat() if v else None for k, v in self.timestamps.items()}
         }
     
     @classmethod
@@ -53,19 +253,26 @@ class UnifiedProduct:
             source=data['source'],
             name=data['name'],
             price={
-                'amount': Decimal(str(data['price']['amount'])),
+                'amount': to_krw(data['price']['amount']),
                 'currency': data['price']['currency'],
                 'vat_included': data['price'].get('vat_included', True)
             },
             specifications=data.get('specifications', {}),
             category=data.get('category', []),
             metadata=data.get('metadata', {}),
-            timestamps={k: datetime.fromisoformat(v) for k, v in data.get('timestamps', {}).items()}
+            timestamps={k: datetime.fromisoformat(v) if v else None for k, v in data.get('timestamps', {}).items()}
         )
 
 class KoreanTextNormalizer:
     """한국어 텍스트 정규화"""
     
+    # 미리 컴파일한 정규식 (일괄 처리 시 구분자 \x00은 보존)
+    SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s가-힣\-\.\(\)\x00]')
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+    NON_SEARCHABLE_PATTERN = re.compile(r'[^\w가-힣\x00]')
+    UNNECESSARY_WORDS = ('신상품', '특가', '할인', '무료배송', '당일배송')
+    BULK_SEPARATOR = '\x00'
+    
     def __init__(self):
         # 브랜드명 매핑
         self.brand_mappings = {
@@ -92,6 +299,15 @@ class KoreanTextNormalizer:
             "파란색": ["블루", "blue", "BLUE", "파란색", "청색"],
             "빨간색": ["레드", "red", "RED", "빨간색", "적색"]
         }
+        
+        self.rebuild_matcher()
+    
+    def rebuild_matcher(self):
+        """매핑 전체를 하나의 오토마톤으로 컴파일 (매핑 변경 후 호출)"""
+        self.matcher = MultiPatternMatcher()
+        self.matcher.add_mappings(self.brand_mappings, case_sensitive=False)
+        self.matcher.add_mappings(self.unit_mappings, case_sensitive=True)
+        self.matcher.add_mappings(self.color_mappings, case_sensitive=False)
     
     def normalize_text(self, text: str) -> Dict[str, str]:
         """텍스트 정규화"""
@@ -102,16 +318,10 @@ class KoreanTextNormalizer:
         original = text.strip()
         
         # 기본 정규화
-        normalized = self._basic_normalize(original)
-        
-        # 브랜드명 정규화
-        normalized = self._normalize_brands(normalized)
-        
-        # 단위 정규화
-        normalized = self._normalize_units(normalized)
+        normalized = self._basic_normalize(original.replace(self.BULK_SEPARATOR, ' '))
         
-        # 색상 정규화
-        normalized = self._normalize_colors(normalized)
+        # 브랜드명/단위/색상 정규화 (한 번의 선형 스캔)
+        normalized = self.matcher.replace(normalized)
         
         # 검색용 텍스트 생성
         searchable = self._create_searchable_text(normalized)
@@ -122,64 +332,190 @@ class KoreanTextNormalizer:
             "searchable": searchable
         }
 
+    def normalize_texts(
+        self,
+        texts: List[str],
+        processes: int = 0,
+        chunk_size: int = 5000
+    ) -> Dict[str, List[str]]:
+        """텍스트 일괄 정규화 (열 단위 처리)
+
+        입력 전체를 구분자로 이어 붙여 정규식/오토마톤을 한 번씩만 적용한다.
+        processes > 1이면 chunk_size 단위로 나눠 프로세스 풀에서 처리한다.
+        결과는 normalize_text와 동일하며 original/normalized/searchable 목록으로 반환한다.
+        """
+        texts = [(text or '').strip() for text in texts]
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)] if chunk_size > 0 else [texts]
+
+        if processes > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(self._normalize_chunk, chunks))
+        else:
+            results = [self._normalize_chunk(chunk) for chunk in chunks]
+
+        columns = {"original": [], "normalized": [], "searchable": []}
+        for result in results:
+            for key, values in result.items():
+                columns[key].extend(values)
+        return columns
+
+    def _normalize_chunk(self, texts: List[str]) -> Dict[str, List[str]]:
+        """공백 제거된 텍스트 묶음 정규화"""
+        if not texts:
+            return {"original": [], "normalized": [], "searchable": []}
+
+        joined = self.BULK_SEPARATOR.join(text.replace(self.BULK_SEPARATOR, ' ') for text in texts)
+        joined = self.matcher.replace(self._basic_normalize(joined))
+        normalized = [text.strip() for text in joined.split(self.BULK_SEPARATOR)]
+
+        searchable = self._create_searchable_text(self.BULK_SEPARATOR.join(normalized))
+        return {
+            "original": texts,
+            "normalized": normalized,
+            "searchable": [text.strip() for text in searchable.split(self.BULK_SEPARATOR)]
+        }
+
     def _basic_normalize(self, text: str) -> str:
         """기본 정규화"""
         # 특수문자 제거 (하이픈, 점, 괄호는 유지)
-        text = re.sub(r'[^\w\s가-힣\-\.\(\)]', ' ', text)
+        text = self.SPECIAL_CHAR_PATTERN.sub(' ', text)
         
         # 연속된 공백 제거
-        text = re.sub(r'\s+', ' ', text)
+        text = self.WHITESPACE_PATTERN.sub(' ', text)
         
         # 불필요한 단어 제거
-        unnecessary_words = ['신상품', '특가', '할인', '무료배송', '당일배송']
-        for word in unnecessary_words:
+        for word in self.UNNECESSARY_WORDS:
             text = text.replace(word, '')
         
         return text.strip()
     
-    def _normalize_brands(self, text: str) -> str:
-        """브랜드명 정규화"""
-        for standard, variants in self.brand_mappings.items():
-            for variant in variants:
-                if variant.lower() in text.lower():
-                    # 대소문자 구분 없이 교체
-                    pattern = re.compile(re.escape(variant), re.IGNORECASE)
-                    text = pattern.sub(standard, text)
-        return text
-    
-    def _normalize_units(self, text: str) -> str:
-        """단위 정규화"""
-        for standard, variants in self.unit_mappings.items():
-            for variant in variants:
-                if variant in text:
-                    text = text.replace(variant, standard)
-        return text
-    
-    def _normalize_colors(self, text: str) -> str:
-        """색상 정규화"""
-        for standard, variants in self.color_mappings.items():
-            for variant in variants:
-                if variant.lower() in text.lower():
-                    pattern = re.compile(re.escape(variant), re.IGNORECASE)
-                    text = pattern.sub(standard, text)
-        return text
-    
     def _create_searchable_text(self, text: str) -> str:
         """검색용 텍스트 생성"""
         # 한글, 영문, 숫자만 유지
-        searchable = re.sub(r'[^\w가-힣]', ' ', text)
+        searchable = self.NON_SEARCHABLE_PATTERN.sub(' ', text)
         
         # 연속 공백 제거
-        searchable = re.sub(r'\s+', ' ', searchable)
+        searchable = self.WHITESPACE_PATTERN.sub(' ', searchable)
         
         return searchable.strip().lower()
 
+class _DateParser:
+    """날짜 문자열 파서 - 마지막으로 성공한 형식을 먼저 시도 (출처별로 하나씩 사용)
+
+    지원 형식은 구분자가 서로 달라 한 문자열이 두 형식에 모두 맞는 경우가 없으므로
+    시도 순서를 바꿔도 결과는 같다. 수집 결과의 공고일/마감일은 같은 값이 반복되므로
+    파싱 결과도 문자열별로 캐시한다.
+    """
+    
+    FORMATS = ('%Y%m%d', '%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d')
+    MAX_CACHED_DATES = 4096
+    
+    def __init__(self):
+        self.cached_format: Optional[str] = None
+        self._parsed: Dict[str, Optional[datetime]] = {}
+    
+    def parse(self, date_str: str) -> Optional[datetime]:
+        if not date_str:
+            return None
+        
+        try:
+            return self._parsed[date_str]
+        except KeyError:
+            pass
+        
+        parsed = self._parse_formats(date_str)
+        if len(self._parsed) < self.MAX_CACHED_DATES:
+            self._parsed[date_str] = parsed
+        return parsed
+    
+    def _parse_formats(self, date_str: str) -> Optional[datetime]:
+        if self.cached_format:
+            try:
+                return datetime.strptime(date_str, self.cached_format)
+            except ValueError:
+                pass
+        
+        for fmt in self.FORMATS:
+            if fmt == self.cached_format:
+                continue
+            try:
+                parsed = datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
+            self.cached_format = fmt
+            return parsed
+        
+        return None
+
+def _field_extractor(fields: Tuple[Tuple[str, str, Any], ...], constants: Optional[Dict[str, Any]] = None):
+    """(결과 키, 원본 키, 기본값) 목록으로 고정 키 dict 추출 함수 생성 (constants는 모든 결과에 추가)"""
+    keys = tuple(target for target, _, _ in fields)
+    sources = tuple((source, default) for _, source, default in fields)
+    constants = constants or {}
+    
+    def extract(item: Dict) -> Dict[str, Any]:
+        get = item.get
+        result = dict(zip(keys, [get(source, default) for source, default in sources]))
+        result.update(constants)
+        return result
+    
+    return extract
+
+# 출처별 필드 추출기 (모듈 로드 시 한 번 생성)
+_G2B_SPECIFICATIONS = _field_extractor((
+    ('bid_method', 'bid_method', ''),
+    ('contract_type', 'contract_type', ''),
+    ('industry_code', 'industry_code', ''),
+    ('region', 'region_code', '')
+))
+_G2B_METADATA = _field_extractor((
+    ('organization', 'organization', ''),
+    ('announcement_number', 'announcement_number', ''),
+    ('announcement_date', 'announcement_date', ''),
+    ('deadline', 'deadline', '')
+), {'procurement_type': 'public_bid'})
+_COUPANG_SPECIFICATIONS = _field_extractor((
+    ('vendor', 'vendor_name', ''),
+    ('rating', 'rating', 0),
+    ('review_count', 'review_count', 0),
+    ('delivery_fee', 'delivery_fee', 0),
+    ('is_free_shipping', 'is_available', False)
+))
+_COUPANG_METADATA = _field_extractor((
+    ('product_id', 'product_id', ''),
+    ('url', 'url', ''),
+    ('image_url', 'image_url', ''),
+    ('search_query', 'search_query', '')
+), {'procurement_type': 'commercial'})
+
+# 프로세스 풀 워커별 변환기 (initializer에서 한 번 생성해 작업마다 다시 피클링하지 않음)
+_worker_integrator: Optional['DataIntegrator'] = None
+
+def _init_conversion_worker():
+    global _worker_integrator
+    _worker_integrator = DataIntegrator(processes=0)
+
+def _convert_chunk_in_worker(source: str, items: List[Dict]) -> List['UnifiedProduct']:
+    return _worker_integrator.convert_items(source, items)
+
 class DataIntegrator:
     """G2B와 쿠팡 데이터 통합"""
     
-    def __init__(self):
+    NUMBER_PATTERN = re.compile(r'[\d,]+')
+    NAME_FIELDS = {'g2b': 'title', 'coupang': 'name'}
+    
+    def __init__(self, processes: Optional[int] = None, chunk_size: Optional[int] = None, embedder=None):
         self.normalizer = KoreanTextNormalizer()
         self.category_mappings = self._initialize_category_mappings()
+        
+        # 키워드 미분류 상품은 설정된 임베딩 백엔드(embedder 미지정 시 EMBEDDING_BACKEND)로 대체 분류
+        self.category_classifier = CategoryClassifier(self.category_mappings, embedder=embedder)
+        
+        # 대량 변환 설정: 항목 수가 chunk_size를 넘고 processes > 1이면 프로세스 풀 사용
+        self.processes = ProcureMateSettings.CONVERT_PROCESSES if processes is None else processes
+        self.chunk_size = chunk_size or ProcureMateSettings.CONVERT_CHUNK_SIZE
+        self.date_parsers = {source: _DateParser() for source in self.NAME_FIELDS}
+        self.conversion_stats: Dict[str, Any] = {}
     
     def _initialize_category_mappings(self) -> Dict[str, List[str]]:
         """카테고리 매핑 초기화"""
@@ -195,14 +531,7 @@ class DataIntegrator:
         """G2B 데이터를 통합 형식으로 변환"""
         logger.info("G2B 데이터 통합 처리 시작")
         
-        unified_products = []
-        items = g2b_data.get('items', [])
-        
-        for item in items:
-            unified_product = await self._convert_g2b_item(item)
-            if unified_product:
-                unified_products.append(unified_product)
-
+        unified_products = await asyncio.to_thread(self.convert_items, 'g2b', g2b_data.get('items', []))
     
         logger.info(f"G2B 데이터 통합 완료: {len(unified_products)}개")
         return unified_products
@@ -211,143 +540,171 @@ class DataIntegrator:
         """쿠팡 데이터를 통합 형식으로 변환"""
         logger.info("쿠팡 데이터 통합 처리 시작")
         
-        unified_products = []
-        items = coupang_data.get('items', [])
-        
-        for item in items:
-            unified_product = await self._convert_coupang_item(item)
-            if unified_product:
-                unified_products.append(unified_product)
+        unified_products = await asyncio.to_thread(self.convert_items, 'coupang', coupang_data.get('items', []))
 
         logger.info(f"쿠팡 데이터 통합 완료: {len(unified_products)}개")
         return unified_products
     
-    async def _convert_g2b_item(self, item: Dict) -> Optional[UnifiedProduct]:
+    def convert_items(self, source: str, items: List[Dict]) -> List[UnifiedProduct]:
+        """원본 항목 일괄 변환 (이름 일괄 정규화 + 출처별 필드 추출기)
+        
+        CPU 작업이므로 integrate_g2b_data/integrate_coupang_data는 asyncio.to_thread로 호출해
+        변환 중에도 이벤트 루프(페이지 수집, 색인)가 계속 진행된다.
+        
+        항목 수가 chunk_size를 넘고 processes > 1이면 청크를 프로세스 풀에 나눠 처리한다.
+        청크는 워커 수만큼으로 크게 잡아 항목/상품 피클링 외의 작업당 비용을 줄이고,
+        변환기는 워커 initializer에서 한 번만 만든다.
+        """
+        started = time.perf_counter()
+        
+        if self.processes > 1 and len(items) > self.chunk_size:
+            chunk_size = max(self.chunk_size, math.ceil(len(items) / self.processes))
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_conversion_worker) as executor:
+                results = list(executor.map(_convert_chunk_in_worker, [source] * len(chunks), chunks))
+            unified_products = [product for result in results for product in result]
+        else:
+            chunks = [items]
+            unified_products = self._convert_chunk(source, items)
+        
+        self.conversion_stats = {
+            'source': source,
+            'items': len(items),
+            'chunks': len(chunks),
+            'seconds': time.perf_counter() - started
+        }
+        return unified_products
+    
+    def _convert_chunk(self, source: str, items: List[Dict]) -> List[UnifiedProduct]:
+        """한 프로세스 안에서의 일괄 변환"""
+        name_infos = self.normalizer.normalize_texts([item.get(self.NAME_FIELDS[source], '') for item in items])
+        build = self._build_g2b_product if source == 'g2b' else self._build_coupang_product
+        categories = self._classify_categories(source, items)
+        now = datetime.now()
+        
+        return [
+            build(item, {'original': original, 'normalized': normalized, 'searchable': searchable}, now, category)
+            for item, original, normalized, searchable, category in zip(
+                items, name_infos['original'], name_infos['normalized'], name_infos['searchable'], categories
+            )
+        ]
+    
+    async def _convert_g2b_item(self, item: Dict, name_info: Optional[Dict[str, str]] = None) -> Optional[UnifiedProduct]:
         """G2B 아이템을 UnifiedProduct로 변환"""
-
+        if name_info is None:
+            name_info = self.normalizer.normalize_text(item.get('title', ''))
+        return self._build_g2b_product(item, name_info, datetime.now(), self._map_g2b_category(item))
+    
+    async def _convert_coupang_item(self, item: Dict, name_info: Optional[Dict[str, str]] = None) -> Optional[UnifiedProduct]:
+        """쿠팡 아이템을 UnifiedProduct로 변환"""
+        if name_info is None:
+            name_info = self.normalizer.normalize_text(item.get('name', ''))
+        return self._build_coupang_product(item, name_info, datetime.now(), self._map_coupang_category(item))
+    
+    def _build_g2b_product(self, item: Dict, name_info: Dict[str, str], now: datetime, category: List[str]) -> UnifiedProduct:
+        """정규화된 이름으로 G2B 상품 생성"""
         # 가격 처리 (G2B는 예산 정보)
         budget = item.get('budget', 0)
         if isinstance(budget, str):
             budget = self._extract_number_from_string(budget)
         
-        # 이름 정규화
-        name_info = self.normalizer.normalize_text(item.get('title', ''))
-        
-        # 카테고리 매핑
-        category = self._map_g2b_category(item)
+        parse_date = self.date_parsers['g2b'].parse
         
-        unified_product = UnifiedProduct(
-            id=item.get('id', f"g2b_{datetime.now().timestamp()}"),
+        return UnifiedProduct(
+            id=item.get('id') or self._content_id('g2b', item),
             source='g2b',
             name=name_info,
             price={
-                'amount': Decimal(str(budget)),
+                'amount': budget,
                 'currency': 'KRW',
                 'vat_included': True
             },
-            specifications={
-                'bid_method': item.get('bid_method', ''),
-                'contract_type': item.get('contract_type', ''),
-                'industry_code': item.get('industry_code', ''),
-                'region': item.get('region_code', '')
-            },
+            specifications=_G2B_SPECIFICATIONS(item),
             category=category,
-            metadata={
-                'organization': item.get('organization', ''),
-                'announcement_number': item.get('announcement_number', ''),
-                'announcement_date': item.get('announcement_date', ''),
-                'deadline': item.get('deadline', ''),
-                'procurement_type': 'public_bid'
-            },
+            metadata=_G2B_METADATA(item),
             timestamps={
-                'created': datetime.now(),
-                'announcement': self._parse_date(item.get('announcement_date', '')),
-                'deadline': self._parse_date(item.get('deadline', ''))
+                'created': now,
+                'announcement': parse_date(item.get('announcement_date', '')),
+                'deadline': parse_date(item.get('deadline', ''))
             }
         )
-        
-        return unified_product
-
     
-    async def _convert_coupang_item(self, item: Dict) -> Optional[UnifiedProduct]:
-        """쿠팡 아이템을 UnifiedProduct로 변환"""
+    def _build_coupang_product(self, item: Dict, name_info: Dict[str, str], now: datetime, category: List[str]) -> UnifiedProduct:
+        """정규화된 이름으로 쿠팡 상품 생성"""
         # 가격 처리
         price = item.get('price', 0)
         if isinstance(price, str):
             price = self._extract_number_from_string(price)
         
-        # 이름 정규화
-        name_info = self.normalizer.normalize_text(item.get('name', ''))
-        
-        # 카테고리 매핑
-        category = self._map_coupang_category(item)
-        
-        # 사양 정보 추출
-        specifications = {
-            'vendor': item.get('vendor_name', ''),
-            'rating': item.get('rating', 0),
-            'review_count': item.get('review_count', 0),
-            'delivery_fee': item.get('delivery_fee', 0),
-            'is_free_shipping': item.get('is_available', False)
-        }
-        
-        # 할인 정보가 있는 경우 추가
+        # 사양 정보 추출 (할인 정보가 있는 경우 추가)
+        specifications = _COUPANG_SPECIFICATIONS(item)
         if item.get('original_price', 0) > price:
             specifications['original_price'] = item.get('original_price', 0)
             specifications['discount_rate'] = item.get('discount_rate', 0)
         
-        unified_product = UnifiedProduct(
-            id=item.get('id', f"coupang_{datetime.now().timestamp()}"),
+        return UnifiedProduct(
+            id=item.get('id') or self._content_id('coupang', item),
             source='coupang',
             name=name_info,
             price={
-                'amount': Decimal(str(price)),
+                'amount': price,
                 'currency': 'KRW',
                 'vat_included': True
             },
             specifications=specifications,
             category=category,
-            metadata={
-                'product_id': item.get('product_id', ''),
-                'url': item.get('url', ''),
-                'image_url': item.get('image_url', ''),
-                'search_query': item.get('search_query', ''),
-                'procurement_type': 'commercial'
-            },
+            metadata=_COUPANG_METADATA(item),
             timestamps={
-                'created': datetime.now(),
-                'retrieved': datetime.now()
+                'created': now,
+                'retrieved': now
             }
         )
-        
-        return unified_product
 
+    def _classify_categories(self, source: str, items: List[Dict]) -> List[List[str]]:
+        """배치 카테고리 매핑 (키워드 오토마톤 한 번 스캔 + 미분류 항목만 임베딩 대체 분류)
+        
+        G2B는 소문자 제목, 쿠팡은 쿠팡 카테고리명에서 키워드를 찾고,
+        키워드가 없으면 각각 제목 / 카테고리명 + 상품명으로 중심 벡터와 비교한다.
+        """
+        if source == 'g2b':
+            titles = [item.get('title', '').lower() for item in items]
+            main_categories = self.category_classifier.classify(titles)
+            return [
+                [main_category or '기타', 'G2B', item.get('industry_code', '')]
+                for item, main_category in zip(items, main_categories)
+            ]
+        
+        category_names = [item.get('category_name', '') for item in items]
+        main_categories = self.category_classifier.classify(
+            category_names,
+            [f"{category_name} {item.get('name', '')}".strip() for item, category_name in zip(items, category_names)]
+        )
+        
+        categories = []
+        for category_name, main_category in zip(category_names, main_categories):
+            if main_category:
+                categories.append([main_category, '쿠팡', category_name])
+            else:
+                # 분류되지 않은 경우 원본 사용
+                categories.append([category_name, '쿠팡'] if category_name else ['기타', '쿠팡'])
+        return categories
+    
     def _map_g2b_category(self, item: Dict) -> List[str]:
         """G2B 카테고리 매핑"""
-        industry_code = item.get('industry_code', '')
-        title = item.get('title', '').lower()
-        
-        # 제목에서 카테고리 추론
-        for main_category, keywords in self.category_mappings.items():
-            for keyword in keywords:
-                if keyword in title:
-                    return [main_category, 'G2B', industry_code]
-        
-        # 기본 카테고리
-        return ['기타', 'G2B', industry_code]
+        return self._classify_categories('g2b', [item])[0]
     
     def _map_coupang_category(self, item: Dict) -> List[str]:
         """쿠팡 카테고리 매핑"""
-        category_name = item.get('category_name', '')
-        
-        # 쿠팡 카테고리를 표준 카테고리로 매핑
-        for main_category, keywords in self.category_mappings.items():
-            for keyword in keywords:
-                if keyword in category_name:
-                    return [main_category, '쿠팡', category_name]
-        
-        # 매핑되지 않은 경우 원본 사용
-        return [category_name, '쿠팡'] if category_name else ['기타', '쿠팡']
+        return self._classify_categories('coupang', [item])[0]
+    
+    def _content_id(self, source: str, item: Dict) -> str:
+        """원본 ID가 없는(또는 빈 문자열인) 아이템의 결정적 ID (재수집 시에도 동일)
+        
+        이전에는 f"{source}_{수집 시각 timestamp}"를 사용했으므로 그때 저장된 상품 ID와는 다르다.
+        원본 항목 내용 전체의 해시이므로 내용이 바뀌면 다른 ID가 된다.
+        """
+        payload = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+        return f"{source}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]}"
     
     def _extract_number_from_string(self, text: str) -> float:
         """문자열에서 숫자 추출"""
@@ -355,38 +712,85 @@ class DataIntegrator:
             return 0.0
         
         # 쉼표 제거 후 숫자 추출
-        numbers = re.findall(r'[\d,]+', str(text))
+        numbers = self.NUMBER_PATTERN.findall(str(text))
         if numbers:
             return float(numbers[0].replace(',', ''))
         return 0.0
     
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """날짜 문자열 파싱"""
-        if not date_str:
-            return None
-        
+    def _parse_date(self, date_str: str, source: str = 'g2b') -> Optional[datetime]:
+        """날짜 문자열 파싱 (출처별 파서의 형식/결과 캐시 재사용)"""
+        return self.date_parsers[source].parse(date_str)
 
-        # 다양한 날짜 형식 지원
-        formats = ['%Y%m%d', '%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d']
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-
-        
-        return None
+class _DisjointSet:
+    """union-find (경로 압축 + 크기 기준 합치기)"""
+    
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+    
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+    
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+    
+    def groups(self) -> List[List[int]]:
+        """집합 목록 (각 집합은 오름차순, 첫 원소 순 정렬)"""
+        members: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            members.setdefault(self.find(item), []).append(item)
+        return sorted(members.values(), key=lambda group: group[0])
 
 class ProductDeduplicator:
     """상품 중복 제거"""
     
-    def __init__(self, similarity_threshold: float = 0.85):
+    MIN_PRICE_RATIO = 0.8  # 가격 차이 20%까지 허용
+    
+    def __init__(
+        self,
+        similarity_threshold: float = 0.85,
+        use_lsh: bool = True,
+        lsh: Optional[MinHashLSH] = None,
+        embedding_threshold: float = 0.9,
+        knn_k: int = 10,
+        nprobe: int = 16,
+        ann_min_items: int = 20000
+    ):
         self.threshold = similarity_threshold
+        self.use_lsh = use_lsh
+        self.lsh = lsh or MinHashLSH()
+        
+        # 임베딩 기반 중복 검사 (코사인 유사도 임계값, 상품당 이웃 수)
+        self.embedding_threshold = embedding_threshold
+        self.knn_k = knn_k
+        
+        # ann_min_items개 이상이면 IVF 근사 이웃 검색 (nprobe가 클수록 재현율↑, 속도↓), 미만이면 전수 검색
+        self.nprobe = nprobe
+        self.ann_min_items = ann_min_items
     
     async def find_duplicates(self, products: List[UnifiedProduct]) -> List[List[int]]:
-        """중복 상품 그룹 찾기"""
+        """중복 상품 그룹 찾기
+        
+        use_lsh이면 MinHash LSH 버킷 + 가격대/카테고리 블로킹으로 후보 쌍만 정밀 비교한다.
+        그룹 구성 순서는 전수 비교와 같다.
+        """
         logger.info(f"중복 검사 시작: {len(products)}개 상품")
         
+        candidates = self._candidate_pairs(products) if self.use_lsh else None
+        if candidates is not None:
+            logger.debug(f"중복 후보 쌍: {sum(len(others) for others in candidates.values())}개")
+        
         duplicate_groups = []
         processed = set()
         
@@ -394,8 +798,10 @@ class ProductDeduplicator:
             if i in processed:
                 continue
             
+            others = sorted(candidates.get(i, ())) if candidates is not None else range(i + 1, len(products))
+            
             group = [i]
-            for j in range(i + 1, len(products)):
+            for j in others:
                 if j in processed:
                     continue
                 
@@ -410,33 +816,147 @@ class ProductDeduplicator:
         logger.info(f"중복 그룹 {len(duplicate_groups)}개 발견")
         return duplicate_groups
     
+    async def find_index_duplicates(self, search_engine) -> List[List[int]]:
+        """검색 색인(HybridSearchEngine)의 상품/임베딩을 재사용한 중복 그룹 찾기"""
+        state = search_engine.state  # 상품과 임베딩을 같은 시점의 상태에서 읽음
+        if state.is_empty:
+            return []
+        return await self.find_duplicates_by_embedding(state.products, state.embeddings)
+    
+    async def find_duplicates_by_embedding(
+        self,
+        products: List[UnifiedProduct],
+        embeddings: np.ndarray,
+        chunk_size: int = 1024
+    ) -> List[List[int]]:
+        """임베딩 k-최근접 이웃 기반 중복 그룹 찾기
+        
+        상품마다 코사인 유사도 embedding_threshold 이상인 이웃 knn_k개를 찾고
+        가격/카테고리 조건을 통과한 쌍을 union-find로 묶는다.
+        상품이 ann_min_items개 이상이면 이웃은 IVF 근사 검색(nlist=√n, nprobe개 목록 조회)으로 찾으므로
+        목록 경계에 걸친 쌍 일부를 놓칠 수 있다.
+        """
+        logger.info(f"임베딩 중복 검사 시작: {len(products)}개 상품")
+        
+        count = len(products)
+        if count < 2:
+            return []
+        
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        
+        nlist = int(math.sqrt(count)) if count >= self.ann_min_items else 0
+        index = IVFIndex(nlist=nlist, nprobe=self.nprobe).build(vectors)
+        k = min(self.knn_k, count - 1)
+        groups = _DisjointSet(count)
+        
+        # 자기 자신이 포함되므로 k+1개 조회, 질의는 chunk_size 단위로 나누어 전체 유사도 행렬을 만들지 않음
+        for start in range(0, count, chunk_size):
+            scores, ids = index.search(vectors[start:start + chunk_size], k + 1, chunk_size=chunk_size)
+            for row, (row_scores, row_ids) in enumerate(zip(scores.tolist(), ids.tolist())):
+                i = start + row
+                for score, j in zip(row_scores, row_ids):
+                    if score < self.embedding_threshold:
+                        break
+                    if j == i or j < 0:
+                        continue
+                    if groups.find(i) != groups.find(j) and self._passes_price_and_category(products[i], products[j]):
+                        groups.union(i, j)
+        
+        duplicate_groups = [group for group in groups.groups() if len(group) > 1]
+        logger.info(f"임베딩 중복 그룹 {len(duplicate_groups)}개 발견")
+        return duplicate_groups
+    
+    def _candidate_pairs(self, products: List[UnifiedProduct]) -> Dict[int, Set[int]]:
+        """LSH 버킷을 공유하고 가격대/카테고리 조건을 만족하는 후보 쌍 (i -> {j > i})"""
+        # LSH 버킷 -> 가격대 -> 상품 인덱스 (가격 정보 없는 상품은 None 가격대)
+        buckets: Dict[Tuple[int, bytes], Dict[Optional[int], List[int]]] = {}
+        for idx, product in enumerate(products):
+            if not self._has_name(product):
+                continue
+            price_band = self._price_band(product)
+            for key in self.lsh.band_keys(self.lsh.signature(product.name_normalized)):
+                buckets.setdefault(key, {}).setdefault(price_band, []).append(idx)
+        
+        categories = [set(product.category) for product in products]
+        candidates: Dict[int, Set[int]] = {}
+        for price_groups in buckets.values():
+            if len(price_groups) == 1 and len(next(iter(price_groups.values()))) == 1:
+                continue
+            
+            for price_band, members in price_groups.items():
+                if price_band is None:
+                    neighbours = [idx for group in price_groups.values() for idx in group]
+                else:
+                    # 가격 비율이 MIN_PRICE_RATIO 이상이면 가격대 차이는 1 이하
+                    neighbours = [
+                        idx
+                        for band in (price_band - 1, price_band, price_band + 1, None)
+                        for idx in price_groups.get(band, ())
+                    ]
+                
+                for i in members:
+                    for j in neighbours:
+                        if j <= i:
+                            continue
+                        if categories[i] and categories[j] and categories[i].isdisjoint(categories[j]):
+                            continue
+                        candidates.setdefault(i, set()).add(j)
+        
+        return candidates
+    
+    def _price_band(self, product: UnifiedProduct) -> Optional[int]:
+        """로그 스케일 가격대 (폭 = 허용 가격 비율)"""
+        price = product.amount
+        if price <= 0:
+            return None
+        # 경계값(정확히 MIN_PRICE_RATIO)의 부동소수점 오차를 흡수하도록 폭을 약간 넓힘
+        return math.floor(math.log(price) / (-math.log(self.MIN_PRICE_RATIO) * (1 + 1e-9)))
+    
+    @staticmethod
+    def _has_name(product: UnifiedProduct) -> bool:
+        """이름 비교 대상 여부 (LSH/전수 비교 모두 이름 없는 상품은 중복으로 묶지 않음)"""
+        return bool(product.name_normalized and product.name_normalized.strip())
+    
     async def _are_similar(self, product1: UnifiedProduct, product2: UnifiedProduct) -> bool:
         """두 상품의 유사도 판단"""
+        # 이름이 없으면 비교 불가 (빈 이름끼리 SequenceMatcher 비율 1.0으로 묶이지 않도록)
+        if not self._has_name(product1) or not self._has_name(product2):
+            return False
+        
         # 1. 이름 유사도
         name_similarity = self._calculate_text_similarity(
-            product1.name['normalized'],
-            product2.name['normalized']
+            product1.name_normalized,
+            product2.name_normalized
         )
         
         if name_similarity < 0.7:
             return False
         
-        # 2. 가격 유사도 (20% 차이 허용)
-        price1 = float(product1.price['amount'])
-        price2 = float(product2.price['amount'])
+        # 2. 가격 유사도, 3. 카테고리 일치
+        if not self._passes_price_and_category(product1, product2):
+            return False
+        
+        return name_similarity >= self.threshold
+    
+    def _passes_price_and_category(self, product1: UnifiedProduct, product2: UnifiedProduct) -> bool:
+        """가격 비율(MIN_PRICE_RATIO 이상)과 카테고리 겹침 조건"""
+        price1 = product1.amount
+        price2 = product2.amount
         
         if price1 > 0 and price2 > 0:
             price_ratio = min(price1, price2) / max(price1, price2)
-            if price_ratio < 0.8:
+            if price_ratio < self.MIN_PRICE_RATIO:
                 return False
         
-        # 3. 카테고리 일치
         if product1.category and product2.category:
             category_match = any(c1 in product2.category for c1 in product1.category)
             if not category_match:
                 return False
         
-        return name_similarity >= self.threshold
+        return True
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """텍스트 유사도 계산"""
@@ -7,63 +7,17 @@ G2B와 쿠팡 데이터를 통합 스키마로 변환
 import re
 import asyncio
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 import json
+import hashlib
 from difflib import SequenceMatcher
 from normalization import UnifiedTextProcessor
 from utils import get_logger
+from modules.data_processor import UnifiedProduct
 
 logger = get_logger(__name__)
 
-@dataclass
-class UnifiedProduct:
-    """통합 상품 데이터 모델"""
-    id: str
-    source: str  # 'g2b' 또는 'coupang'
-    name: Dict[str, str]  # {'original': str, 'normalized': str, 'searchable': str}
-    price: Dict[str, Any]  # {'amount': Decimal, 'currency': str, 'vat_included': bool}
-    specifications: Dict[str, Any] = field(default_factory=dict)
-    category: List[str] = field(default_factory=list)
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamps: Dict[str, datetime] = field(default_factory=dict)
-    
-    def to_dict(self) -> Dict:
-        """딕셔너리로 변환"""
-        return {
-            'id': self.id,
-            'source': self.source,
-            'name': self.name,
-            'price': {
-                'amount': float(self.price['amount']),
-                'currency': self.price['currency'],
-                'vat_included': self.price.get('vat_included', True)
-            },
-            'specifications': self.specifications,
-            'category': self.category,
-            'metadata': self.metadata,
-            'timestamps': {k: v.isoformat() for k, v in self.timestamps.items()}
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'UnifiedProduct':
-        """딕셔너리에서 생성"""
-        return cls(
-            id=data['id'],
-            source=data['source'],
-            name=data['name'],
-            price={
-                'amount': Decimal(str(data['price']['amount'])),
-                'currency': data['price']['currency'],
-                'vat_included': data['price'].get('vat_included', True)
-            },
-            specifications=data.get('specifications', {}),
-            category=data.get('category', []),
-            metadata=data.get('metadata', {}),
-            timestamps={k: datetime.fromisoformat(v) for k, v in data.get('timestamps', {}).items()}
-        )
-
 class EmbeddingBasedNormalizer:
     """임베딩 기반 텍스트 정규화 (기존 KoreanTextNormalizer 대체)"""
     
@@ -83,6 +37,13 @@ class EmbeddingBasedNormalizer:
             await self.initialize()
         
         return await self.processor.process_text(text)
+    
+    async def normalize_texts(self, texts: List[str]) -> List[Dict[str, str]]:
+        """텍스트 일괄 정규화 (페이지 단위 배치 처리)"""
+        if not self.is_initialized:
+            await self.initialize()
+        
+        return await self.processor.process_texts(texts)
 
 class DataIntegrator:
     """G2B와 쿠팡 데이터 통합"""
@@ -108,8 +69,11 @@ class DataIntegrator:
         unified_products = []
         items = g2b_data.get('items', [])
         
-        for item in items:
-            unified_product = await self._convert_g2b_item(item)
+        # 페이지 전체 상품명을 한 번에 정규화
+        name_infos = await self.normalizer.normalize_texts([item.get('title', '') for item in items])
+        
+        for item, name_info in zip(items, name_infos):
+            unified_product = await self._convert_g2b_item(item, name_info)
             if unified_product:
                 unified_products.append(unified_product)
 
@@ -123,15 +87,18 @@ class DataIntegrator:
         unified_products = []
         items = coupang_data.get('items', [])
         
-        for item in items:
-            unified_product = await self._convert_coupang_item(item)
+        # 페이지 전체 상품명을 한 번에 정규화
+        name_infos = await self.normalizer.normalize_texts([item.get('name', '') for item in items])
+        
+        for item, name_info in zip(items, name_infos):
+            unified_product = await self._convert_coupang_item(item, name_info)
             if unified_product:
                 unified_products.append(unified_product)
 
         logger.info(f"쿠팡 데이터 통합 완료: {len(unified_products)}개")
         return unified_products
     
-    async def _convert_g2b_item(self, item: Dict) -> Optional[UnifiedProduct]:
+    async def _convert_g2b_item(self, item: Dict, name_info: Optional[Dict[str, str]] = None) -> Optional[UnifiedProduct]:
         """G2B 아이템을 UnifiedProduct로 변환"""
 
         # 가격 처리 (G2B는 예산 정보)
@@ -140,13 +107,14 @@ class DataIntegrator:
             budget = self._extract_number_from_string(budget)
         
         # 이름 정규화 (임베딩 기반)
-        name_info = await self.normalizer.normalize_text(item.get('title', ''))
+        if name_info is None:
+            name_info = await self.normalizer.normalize_text(item.get('title', ''))
         
         # 카테고리 매핑
         category = self._map_g2b_category(item)
         
         unified_product = UnifiedProduct(
-            id=item.get('id', f"g2b_{datetime.now().timestamp()}"),
+            id=item.get('id') or self._content_id('g2b', item),
             source='g2b',
             name=name_info,
             price={
@@ -177,7 +145,7 @@ class DataIntegrator:
         
         return unified_product
 
-    async def _convert_coupang_item(self, item: Dict) -> Optional[UnifiedProduct]:
+    async def _convert_coupang_item(self, item: Dict, name_info: Optional[Dict[str, str]] = None) -> Optional[UnifiedProduct]:
         """쿠팡 아이템을 UnifiedProduct로 변환"""
         # 가격 처리
         price = item.get('price', 0)
@@ -185,7 +153,8 @@ class DataIntegrator:
             price = self._extract_number_from_string(price)
         
         # 이름 정규화 (임베딩 기반)
-        name_info = await self.normalizer.normalize_text(item.get('name', ''))
+        if name_info is None:
+            name_info = await self.normalizer.normalize_text(item.get('name', ''))
         
         # 카테고리 매핑
         category = self._map_coupang_category(item)
@@ -205,7 +174,7 @@ class DataIntegrator:
             specifications['discount_rate'] = item.get('discount_rate', 0)
         
         unified_product = UnifiedProduct(
-            id=item.get('id', f"coupang_{datetime.now().timestamp()}"),
+            id=item.get('id') or self._content_id('coupang', item),
             source='coupang',
             name=name_info,
             price={
@@ -257,6 +226,15 @@ class DataIntegrator:
         # 매핑되지 않은 경우 원본 사용
         return [category_name, '쿠팡'] if category_name else ['기타', '쿠팡']
     
+    def _content_id(self, source: str, item: Dict) -> str:
+        """원본 ID가 없는(또는 빈 문자열인) 아이템의 결정적 ID (재수집 시에도 동일)
+        
+        이전에는 f"{source}_{수집 시각 timestamp}"를 사용했으므로 그때 저장된 상품 ID와는 다르다.
+        원본 항목 내용 전체의 해시이므로 내용이 바뀌면 다른 ID가 된다.
+        """
+        payload = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+        return f"{source}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]}"
+    
     def _extract_number_from_string(self, text: str) -> float:
         """문자열에서 숫자 추출"""
         if not text:
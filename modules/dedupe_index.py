@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+수집 간 영속 중복 색인 - 대표 상품(canonical) + MinHash LSH 버킷 (sqlite)
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from modules.data_processor import ProductDeduplicator, UnifiedProduct
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class DedupeIndex:
+    """수집 실행/검색어와 무관하게 유지되는 대표 상품 색인
+
+    - dedupe_members: 이미 본 상품 (source:id -> canonical_id), 재수집 시 바로 반환
+    - dedupe_canonical: 대표 상품의 정규화 이름/가격/카테고리
+    - dedupe_buckets: 대표 상품의 LSH 밴드 버킷 (band + 구간 바이트)
+
+    새 상품은 버킷을 공유하는 대표 상품과만 ProductDeduplicator 규칙으로 비교하므로
+    비용은 새로 들어온 상품 수에 비례한다. 매칭되지 않으면 새 대표 상품으로 등록한다.
+    """
+
+    def __init__(self, db_path: str, deduplicator: Optional[ProductDeduplicator] = None):
+        self.db_path = db_path
+        self.deduplicator = deduplicator or ProductDeduplicator()
+        self.lsh = self.deduplicator.lsh
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+        self._check_lsh_params()
+
+        self.stats = {"known": 0, "linked": 0, "registered": 0}
+
+    def _create_tables(self):
+        """테이블 생성"""
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS dedupe_canonical (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    canonical_id TEXT UNIQUE NOT NULL,
+                    source TEXT,
+                    name TEXT NOT NULL,
+                    price TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS dedupe_buckets (
+                    bucket BLOB NOT NULL,
+                    canonical_id TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_dedupe_buckets ON dedupe_buckets (bucket);
+                CREATE TABLE IF NOT EXISTS dedupe_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS dedupe_members (
+                    product_key TEXT PRIMARY KEY,
+                    canonical_id TEXT NOT NULL,
+                    first_seen TEXT NOT NULL
+                );
+            """)
+
+    def _check_lsh_params(self):
+        """LSH 설정이 바뀌었으면 대표 상품 버킷 재구성"""
+        params = json.dumps({
+            "num_perm": self.lsh.num_perm,
+            "bands": self.lsh.bands,
+            "ngram_size": self.lsh.ngram_size,
+            "seed": self.lsh.seed
+        })
+        row = self.conn.execute("SELECT value FROM dedupe_meta WHERE key = 'lsh'").fetchone()
+        if row and row[0] == params:
+            return
+
+        with self.conn:
+            if row:
+                logger.info("LSH 설정 변경, 중복 색인 버킷 재구성")
+                self.conn.execute("DELETE FROM dedupe_buckets")
+                for canonical_id, name in self.conn.execute(
+                    "SELECT canonical_id, name FROM dedupe_canonical WHERE name != ''"
+                ).fetchall():
+                    self.conn.executemany(
+                        "INSERT INTO dedupe_buckets (bucket, canonical_id) VALUES (?, ?)",
+                        [(bucket, canonical_id) for bucket in self._bucket_keys(name)]
+                    )
+            self.conn.execute("INSERT OR REPLACE INTO dedupe_meta (key, value) VALUES ('lsh', ?)", (params,))
+
+    async def link_products(self, products: List[UnifiedProduct]) -> List[str]:
+        """상품별 대표 상품 ID 연결 (metadata['canonical_id']에도 기록)
+
+        같은 배치 안에서 먼저 등록된 대표 상품도 이후 상품의 비교 대상이 된다.
+        """
+        canonical_ids = []
+        now = datetime.now().isoformat()
+
+        with self.conn:
+            for product in products:
+                product_key = f"{product.source}:{product.id}"
+                row = self.conn.execute(
+                    "SELECT canonical_id FROM dedupe_members WHERE product_key = ?", (product_key,)
+                ).fetchone()
+
+                if row:
+                    canonical_id = row[0]
+                    self.stats["known"] += 1
+                else:
+                    canonical_id = await self._find_canonical(product)
+                    if canonical_id:
+                        self.stats["linked"] += 1
+                    else:
+                        canonical_id = self._register_canonical(product, now)
+                        self.stats["registered"] += 1
+
+                    self.conn.execute(
+                        "INSERT INTO dedupe_members (product_key, canonical_id, first_seen) VALUES (?, ?, ?)",
+                        (product_key, canonical_id, now)
+                    )
+
+                product.metadata['canonical_id'] = canonical_id
+                canonical_ids.append(canonical_id)
+
+        logger.info(
+            f"중복 색인 연결: {len(products)}개 (기존 {self.stats['known']}, "
+            f"연결 {self.stats['linked']}, 신규 {self.stats['registered']} 누적)"
+        )
+        return canonical_ids
+
+    async def _find_canonical(self, product: UnifiedProduct) -> Optional[str]:
+        """버킷을 공유하는 대표 상품 중 먼저 등록된 유사 상품"""
+        name = product.name_normalized
+        if not name:
+            return None
+
+        buckets = self._bucket_keys(name)
+        placeholders = ",".join("?" * len(buckets))
+        rows = self.conn.execute(
+            f"""
+            SELECT canonical_id, source, name, price, category FROM dedupe_canonical
+            WHERE canonical_id IN (SELECT canonical_id FROM dedupe_buckets WHERE bucket IN ({placeholders}))
+            ORDER BY seq
+            """,
+            buckets
+        ).fetchall()
+
+        for canonical_id, source, canonical_name, price, category in rows:
+            canonical = UnifiedProduct(
+                id=canonical_id,
+                source=source,
+                name={'original': canonical_name, 'normalized': canonical_name, 'searchable': canonical_name},
+                price={'amount': Decimal(price), 'currency': 'KRW'},
+                category=json.loads(category)
+            )
+            if await self.deduplicator._are_similar(product, canonical):
+                return canonical_id
+
+        return None
+
+    def _register_canonical(self, product: UnifiedProduct, now: str) -> str:
+        """새 대표 상품 등록"""
+        canonical_id = f"{product.source}:{product.id}"
+        name = product.name_normalized
+
+        self.conn.execute(
+            """
+            INSERT INTO dedupe_canonical (canonical_id, source, name, price, category, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                canonical_id,
+                product.source,
+                name,
+                str(product.amount),
+                json.dumps(product.category, ensure_ascii=False),
+                now
+            )
+        )
+        if name:
+            self.conn.executemany(
+                "INSERT INTO dedupe_buckets (bucket, canonical_id) VALUES (?, ?)",
+                [(bucket, canonical_id) for bucket in self._bucket_keys(name)]
+            )
+        return canonical_id
+
+    def _bucket_keys(self, name: str) -> List[bytes]:
+        """밴드 번호를 앞에 붙인 버킷 키"""
+        return [
+            band.to_bytes(2, 'big') + key
+            for band, key in self.lsh.band_keys(self.lsh.signature(name))
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        """색인 통계"""
+        canonical_count = self.conn.execute("SELECT COUNT(*) FROM dedupe_canonical").fetchone()[0]
+        member_count = self.conn.execute("SELECT COUNT(*) FROM dedupe_members").fetchone()[0]
+        return {**self.stats, "canonical_count": canonical_count, "member_count": member_count}
+
+    def close(self):
+        """연결 종료"""
+        self.conn.close()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+스트리밍 수집 파이프라인 - 페이지 수집 → 변환/정규화 → 중복 제거 → 배치 임베딩/색인
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config import ProcureMateSettings
+from modules.data_processor import DataIntegrator, ProductDeduplicator, UnifiedProduct
+from modules.dedupe_index import DedupeIndex
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+# 단계 종료 신호
+_END = object()
+
+
+class IngestionPipeline:
+    """출처 API 페이지를 받는 즉시 색인까지 흘려보내는 비동기 파이프라인
+
+    단계 사이는 크기가 제한된 asyncio.Queue로 연결되어, 뒤 단계(임베딩/색인)가 밀리면
+    앞 단계의 put이 대기하면서 페이지 수집도 멈춘다(backpressure). 따라서 메모리에는
+    큐 크기 x 페이지/배치 크기만큼만 남고, 첫 배치는 전체 수집이 끝나기 전에 검색 가능해진다.
+
+    - 변환/정규화: DataIntegrator (페이지 단위 일괄 정규화, 이벤트 루프 밖 스레드에서 실행)
+    - 중복 제거: DedupeIndex가 있으면 수집 전체에 걸쳐 대표 상품만 색인,
+      없으면 배치 안에서 ProductDeduplicator로 제거
+    - 임베딩/색인: vector_db.add_products (배치 단위)
+    """
+
+    SOURCES = ("g2b", "coupang")
+
+    def __init__(
+        self,
+        vector_db,
+        data_integrator: Optional[DataIntegrator] = None,
+        deduplicator: Optional[ProductDeduplicator] = None,
+        dedupe_index: Optional[DedupeIndex] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.vector_db = vector_db
+        self.data_integrator = data_integrator or DataIntegrator()
+        self.deduplicator = deduplicator or ProductDeduplicator()
+        self.dedupe_index = dedupe_index
+        self.queue_size = queue_size or ProcureMateSettings.INGEST_QUEUE_SIZE
+        self.batch_size = batch_size or ProcureMateSettings.INGEST_BATCH_SIZE
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self) -> Dict[str, Any]:
+        return {
+            'pages': {source: 0 for source in self.SOURCES},
+            'fetched': 0,
+            'converted': 0,
+            'duplicates_removed': 0,
+            'indexed': 0,
+            'batches': 0,
+            'first_batch_seconds': None,
+            'elapsed_seconds': 0.0
+        }
+
+    async def stream(self, page_sources: Dict[str, AsyncIterator[List[Dict]]]) -> AsyncIterator[List[UnifiedProduct]]:
+        """출처별 페이지 비동기 이터레이터를 받아 색인된 배치를 순서대로 반환
+
+        page_sources: {'g2b' | 'coupang': 원본 항목 리스트를 페이지 단위로 내는 async iterator}
+        """
+        self.stats = self._empty_stats()
+        started = time.perf_counter()
+
+        pages: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        products: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        tasks = [
+            asyncio.create_task(self._run_stage(self._fetch_pages(page_sources, pages), pages)),
+            asyncio.create_task(self._run_stage(self._convert_pages(pages, products), products)),
+            asyncio.create_task(self._run_stage(self._dedupe_batches(products, batches), batches))
+        ]
+
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is _END:
+                    break
+
+                await self.vector_db.add_products(batch)
+                self.stats['indexed'] += len(batch)
+                self.stats['batches'] += 1
+                if self.stats['first_batch_seconds'] is None:
+                    self.stats['first_batch_seconds'] = time.perf_counter() - started
+                yield batch
+
+            # 앞 단계에서 난 예외 전파
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.stats['elapsed_seconds'] = time.perf_counter() - started
+
+        logger.info(
+            f"스트리밍 수집 완료: 수집 {self.stats['fetched']}개, 색인 {self.stats['indexed']}개 "
+            f"({self.stats['batches']}개 배치, 중복 {self.stats['duplicates_removed']}개 제거)"
+        )
+
+    async def run(self, page_sources: Dict[str, AsyncIterator[List[Dict]]]) -> Dict[str, Any]:
+        """파이프라인 끝까지 실행 후 통계 반환"""
+        async for _ in self.stream(page_sources):
+            pass
+        return self.stats
+
+    async def _run_stage(self, work, out: asyncio.Queue):
+        """단계 실행 후 (오류가 나도) 다음 단계에 종료 신호 전달"""
+        try:
+            await work
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await out.put(_END)
+            raise
+        await out.put(_END)
+
+    async def _fetch_pages(self, page_sources: Dict[str, AsyncIterator[List[Dict]]], out: asyncio.Queue):
+        """출처별 페이지를 동시에 받아 큐에 적재"""
+        async def fetch(source: str, pages: AsyncIterator[List[Dict]]):
+            try:
+                async for items in pages:
+                    if not items:
+                        continue
+                    self.stats['pages'][source] += 1
+                    self.stats['fetched'] += len(items)
+                    await out.put((source, items))
+            finally:
+                # 중단 시에도 클라이언트 세션을 닫도록 제너레이터 정리
+                if hasattr(pages, 'aclose'):
+                    await pages.aclose()
+
+        await asyncio.gather(*(fetch(source, pages) for source, pages in page_sources.items()))
+
+    async def _convert_pages(self, pages: asyncio.Queue, out: asyncio.Queue):
+        """페이지 단위 변환 및 이름 정규화 (integrate_*가 변환을 스레드로 넘기므로 수집 단계는 계속 진행)"""
+        while True:
+            page = await pages.get()
+            if page is _END:
+                return
+
+            source, items = page
+            if source == 'g2b':
+                converted = await self.data_integrator.integrate_g2b_data({'items': items})
+            else:
+                converted = await self.data_integrator.integrate_coupang_data({'items': items})
+
+            self.stats['converted'] += len(converted)
+            if converted:
+                await out.put(converted)
+
+    async def _dedupe_batches(self, products: asyncio.Queue, out: asyncio.Queue):
+        """상품을 색인 배치 크기로 모으고 중복 제거 후 전달"""
+        pending: List[UnifiedProduct] = []
+
+        while True:
+            converted = await products.get()
+            if converted is _END:
+                break
+
+            pending.extend(converted)
+            while len(pending) >= self.batch_size:
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                batch = await self._deduplicate(batch)
+                if batch:
+                    await out.put(batch)
+
+        if pending:
+            batch = await self._deduplicate(pending)
+            if batch:
+                await out.put(batch)
+
+    async def _deduplicate(self, batch: List[UnifiedProduct]) -> List[UnifiedProduct]:
+        """배치 중복 제거 (영속 색인이 있으면 대표 상품만 유지)"""
+        if self.dedupe_index:
+            canonical_ids = await self.dedupe_index.link_products(batch)
+            kept = [
+                product for product, canonical_id in zip(batch, canonical_ids)
+                if canonical_id == f"{product.source}:{product.id}"
+            ]
+        else:
+            duplicate_groups = await self.deduplicator.find_duplicates(batch)
+            to_remove = {idx for group in duplicate_groups for idx in group[1:]}
+            kept = [product for idx, product in enumerate(batch) if idx not in to_remove]
+
+        self.stats['duplicates_removed'] += len(batch) - len(kept)
+        return kept
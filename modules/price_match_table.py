@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+G2B-쿠팡 상품 매칭 테이블 - 전체 카탈로그 일괄 매칭(임베딩 ANN + 브랜드/단위 정규화) 결과의 영속 저장 (sqlite)
+"""
+
+import json
+import math
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import ProcureMateSettings
+from modules.data_processor import KoreanTextNormalizer, UnifiedProduct
+from normalization.text_embedder import create_text_embedder
+from utils import get_logger, IVFIndex
+
+logger = get_logger(__name__)
+
+
+class CatalogMatcher:
+    """G2B 카탈로그 전체를 쿠팡 카탈로그와 조인해 같은 상품 쌍을 찾는 일괄 매칭
+
+    - 매칭 텍스트: 정규화 이름(브랜드/단위/색상 표준화 완료)에서 조달 용어, 묶음 수량, 숫자만 있는 토큰을 빼고
+      수량 표기는 기준 단위로 통일 (1.5kg -> 1500g, 100cm -> 1000mm)
+    - 후보: 쿠팡 매칭 텍스트 임베딩의 IVF 근사 최근접 이웃 (상품 수가 적으면 전수 검색)
+    - 확정: 유사도 min_similarity 이상이고 브랜드가 겹치며(한쪽만 있으면 허용)
+      같은 차원의 수량(길이/무게/부피/화면/용량)이 서로 다르지 않은 후보를 G2B 상품당 top_k개까지
+    - 가격은 비교 대상이므로 매칭 조건에 넣지 않는다 (조달 예산과 판매가 차이가 곧 결과)
+
+    embedder를 넘기지 않으면 EMBEDDING_BACKEND 설정의 임베딩을 사용한다.
+    해싱 임베딩은 EMBEDDING_BACKEND=hashing 또는 embedder=HashingEmbedder(...)로 명시할 때만 사용한다.
+    """
+
+    PROCUREMENT_WORDS = frozenset(('구매', '구입', '납품', '설치', '임차', '제조', '입찰', '조달', '용역', '공고', '건'))
+    QUANTITY_PATTERN = re.compile(
+        r'(\d+(?:\.\d+)?)\s*(mm|cm|킬로그램|kg|미터|ml|리터|인치|inch|tb|gb|m|g|l)(?![a-z가-힣])',
+        re.IGNORECASE
+    )
+    NUMBER_TOKEN_PATTERN = re.compile(r'^[\d.\-]+$')
+    # 묶음 수량(2500개, 10세트)은 상품 동일성과 무관하므로 매칭 텍스트에서 제외
+    COUNT_PATTERN = re.compile(r'\d+\s*(?:개|세트|박스)(?![가-힣])')
+    # 단위 -> (차원, 기준 단위, 배수)
+    UNIT_SCALES = {
+        'mm': ('길이', 'mm', 1), 'cm': ('길이', 'mm', 10), 'm': ('길이', 'mm', 1000), '미터': ('길이', 'mm', 1000),
+        'g': ('무게', 'g', 1), 'kg': ('무게', 'g', 1000), '킬로그램': ('무게', 'g', 1000),
+        'ml': ('부피', 'ml', 1), 'l': ('부피', 'ml', 1000), '리터': ('부피', 'ml', 1000),
+        '인치': ('화면', '인치', 1), 'inch': ('화면', '인치', 1),
+        'gb': ('용량', 'gb', 1), 'tb': ('용량', 'gb', 1024)
+    }
+    CANDIDATE_FACTOR = 4  # 브랜드/단위 조건으로 걸러질 후보를 감안해 top_k의 배수만큼 조회
+    IVF_MIN_ITEMS = 20000  # 쿠팡 상품이 이보다 적으면 전수 검색
+
+    def __init__(
+        self,
+        normalizer: Optional[KoreanTextNormalizer] = None,
+        embedder=None,
+        min_similarity: Optional[float] = None,
+        top_k: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ):
+        self.normalizer = normalizer or KoreanTextNormalizer()
+        self.embedder = embedder or create_text_embedder()
+        self.min_similarity = min_similarity if min_similarity is not None else ProcureMateSettings.PRICE_MATCH_MIN_SIMILARITY
+        self.top_k = top_k or ProcureMateSettings.PRICE_MATCH_TOP_K
+        self.nprobe = nprobe or ProcureMateSettings.PRICE_MATCH_NPROBE
+
+        # 정규화 결과(표준 브랜드명)와 원문 표기 모두 표준 브랜드로 인식
+        # (상품마다 한 번씩 스캔하므로 오토마톤 대신 C 구현 정규식, 영문/숫자 표기만 단어 경계 검사)
+        self.brand_aliases = {
+            alias.lower(): brand
+            for brand, variants in self.normalizer.brand_mappings.items()
+            for alias in (brand, *variants)
+        }
+        self.brand_pattern = re.compile(
+            r'(?<![a-z0-9])(?:' + '|'.join(map(re.escape, sorted(self.brand_aliases, key=len, reverse=True))) + r')(?![a-z0-9])',
+            re.IGNORECASE
+        )
+        self.stats: Dict[str, Any] = {}
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """매칭 결과를 구분하는 설정 (테이블 메타데이터로 저장)"""
+        return {
+            'embedder': getattr(self.embedder, 'backend_id', type(self.embedder).__name__),
+            'min_similarity': self.min_similarity,
+            'top_k': self.top_k,
+            'nprobe': self.nprobe
+        }
+
+    def features(self, product: UnifiedProduct) -> Tuple[str, FrozenSet[str], Dict[str, FrozenSet[float]]]:
+        """(매칭 텍스트, 브랜드 집합, 차원별 수량 집합)"""
+        name = product.name_normalized or product.name_original
+        brands = frozenset(self.brand_aliases[alias.lower()] for alias in self.brand_pattern.findall(name))
+
+        measures: Dict[str, set] = {}
+
+        def canonical_quantity(match: re.Match) -> str:
+            dimension, unit, scale = self.UNIT_SCALES[match.group(2).lower()]
+            value = float(match.group(1)) * scale
+            measures.setdefault(dimension, set()).add(round(value, 3))
+            return f" {value:g}{unit} "
+
+        text = self.QUANTITY_PATTERN.sub(canonical_quantity, self.COUNT_PATTERN.sub(' ', name))
+        tokens = [
+            token for token in text.split()
+            if token not in self.PROCUREMENT_WORDS and not self.NUMBER_TOKEN_PATTERN.match(token)
+        ]
+        return ' '.join(tokens), brands, {dimension: frozenset(values) for dimension, values in measures.items()}
+
+    @staticmethod
+    def compatible(left: Tuple, right: Tuple) -> bool:
+        """브랜드/수량 조건 (features 결과 비교)"""
+        _, left_brands, left_measures = left
+        _, right_brands, right_measures = right
+        if left_brands and right_brands and left_brands.isdisjoint(right_brands):
+            return False
+        for dimension, values in left_measures.items():
+            other = right_measures.get(dimension)
+            if other and values.isdisjoint(other):
+                return False
+        return True
+
+    def encode(self, texts: Sequence[str], chunk_size: int = 8192) -> np.ndarray:
+        """매칭 텍스트 임베딩 (행 단위 L2 정규화)"""
+        if not texts:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        vectors = np.vstack([
+            np.asarray(self.embedder.encode(list(texts[start:start + chunk_size])), dtype=np.float32)
+            for start in range(0, len(texts), chunk_size)
+        ])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def match(
+        self,
+        g2b_products: Sequence[UnifiedProduct],
+        coupang_products: Sequence[UnifiedProduct]
+    ) -> List[Tuple[int, int, float]]:
+        """(G2B 인덱스, 쿠팡 인덱스, 유사도) 목록 (G2B 순서, 같은 G2B 상품 안에서는 유사도 내림차순)"""
+        started = time.perf_counter()
+        g2b_features = [self.features(product) for product in g2b_products]
+        coupang_features = [self.features(product) for product in coupang_products]
+
+        coupang_vectors = self.encode([text for text, _, _ in coupang_features])
+        nlist = int(math.sqrt(len(coupang_vectors))) if len(coupang_vectors) >= self.IVF_MIN_ITEMS else 0
+        index = IVFIndex(nlist=nlist, nprobe=self.nprobe).build(coupang_vectors)
+        indexed = time.perf_counter()
+
+        matches = []
+        rejected = 0
+        candidate_k = self.top_k * self.CANDIDATE_FACTOR
+        chunk_size = 8192
+        for start in range(0, len(g2b_features), chunk_size):
+            chunk = g2b_features[start:start + chunk_size]
+            scores, ids = index.search(self.encode([text for text, _, _ in chunk]), candidate_k)
+            for row, (features, row_scores, row_ids) in enumerate(zip(chunk, scores.tolist(), ids.tolist())):
+                if not features[0]:
+                    continue
+                kept = 0
+                for score, idx in zip(row_scores, row_ids):
+                    if idx < 0 or score < self.min_similarity:
+                        break
+                    if not coupang_features[idx][0] or not self.compatible(features, coupang_features[idx]):
+                        rejected += 1
+                        continue
+                    matches.append((start + row, idx, float(score)))
+                    kept += 1
+                    if kept == self.top_k:
+                        break
+
+        self.stats = {
+            'g2b_count': len(g2b_features),
+            'coupang_count': len(coupang_features),
+            'matched_g2b': len({g2b_idx for g2b_idx, _, _ in matches}),
+            'match_count': len(matches),
+            'rejected_by_attributes': rejected,
+            'ivf_lists': nlist,
+            'index_seconds': indexed - started,
+            'total_seconds': time.perf_counter() - started
+        }
+        logger.info(
+            f"카탈로그 매칭 완료: G2B {len(g2b_features)}개 x 쿠팡 {len(coupang_features)}개 -> "
+            f"{len(matches)}쌍 ({self.stats['total_seconds']:.1f}초)"
+        )
+        return matches
+
+
+class PriceMatchTable:
+    """G2B-쿠팡 매칭 결과 영속 테이블
+
+    - price_matches: (g2b_key, coupang_key) 쌍별 유사도/이름/가격, 키는 DedupeIndex와 같은 'source:id'
+    - 쿠팡 키 색인으로 어느 쪽 상품이든 키 조회만으로 가격 차이를 얻는다
+    - rebuild는 전체 카탈로그 매칭 결과로 테이블을 한 트랜잭션에서 교체
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        """테이블 생성"""
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS price_matches (
+                    g2b_key TEXT NOT NULL,
+                    coupang_key TEXT NOT NULL,
+                    similarity REAL NOT NULL,
+                    g2b_name TEXT NOT NULL,
+                    coupang_name TEXT NOT NULL,
+                    g2b_price INTEGER NOT NULL,
+                    coupang_price INTEGER NOT NULL,
+                    PRIMARY KEY (g2b_key, coupang_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_price_matches_coupang ON price_matches (coupang_key);
+                CREATE TABLE IF NOT EXISTS price_match_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    def rebuild(
+        self,
+        g2b_products: Sequence[UnifiedProduct],
+        coupang_products: Sequence[UnifiedProduct],
+        matcher: Optional[CatalogMatcher] = None
+    ) -> Dict[str, Any]:
+        """전체 카탈로그 매칭 후 테이블 교체, 매칭 통계 반환"""
+        matcher = matcher or CatalogMatcher()
+        matches = matcher.match(g2b_products, coupang_products)
+
+        def rows():
+            for g2b_idx, coupang_idx, similarity in matches:
+                g2b, coupang = g2b_products[g2b_idx], coupang_products[coupang_idx]
+                yield (
+                    f"{g2b.source}:{g2b.id}", f"{coupang.source}:{coupang.id}", similarity,
+                    g2b.name_original, coupang.name_original, g2b.amount, coupang.amount
+                )
+
+        stats = {**matcher.stats, 'built_at': datetime.now().isoformat()}
+        with self.conn:
+            self.conn.execute("DELETE FROM price_matches")
+            self.conn.executemany("INSERT OR REPLACE INTO price_matches VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO price_match_meta (key, value) VALUES (?, ?)",
+                [('params', json.dumps(matcher.params)), ('stats', json.dumps(stats))]
+            )
+
+        logger.info(f"가격 매칭 테이블 갱신: {len(matches)}쌍")
+        return stats
+
+    def lookup(self, source: str, product_id: str) -> List[Dict[str, Any]]:
+        """상품의 매칭 목록 (유사도 내림차순), price_gap = 이 상품 가격 - 상대 상품 가격"""
+        product_key = f"{source}:{product_id}"
+        if source == 'g2b':
+            query = """
+                SELECT coupang_key, coupang_name, similarity, g2b_price, coupang_price
+                FROM price_matches WHERE g2b_key = ? ORDER BY similarity DESC
+            """
+        else:
+            query = """
+                SELECT g2b_key, g2b_name, similarity, coupang_price, g2b_price
+                FROM price_matches WHERE coupang_key = ? ORDER BY similarity DESC
+            """
+
+        return [
+            {
+                'product_key': product_key,
+                'matched_key': matched_key,
+                'matched_name': matched_name,
+                'similarity': similarity,
+                'price': price,
+                'matched_price': matched_price,
+                'price_gap': price - matched_price if price > 0 and matched_price > 0 else None,
+                'gap_ratio': (price - matched_price) / matched_price if price > 0 and matched_price > 0 else None
+            }
+            for matched_key, matched_name, similarity, price, matched_price in self.conn.execute(query, (product_key,))
+        ]
+
+    def get_price_gap(self, source: str, product_id: str) -> Optional[Dict[str, Any]]:
+        """가장 유사한 매칭의 가격 차이 (매칭이 없으면 None)"""
+        matches = self.lookup(source, product_id)
+        return matches[0] if matches else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """테이블 통계 (마지막 rebuild 통계 포함)"""
+        row = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT g2b_key), COUNT(DISTINCT coupang_key) FROM price_matches"
+        ).fetchone()
+        meta = dict(self.conn.execute("SELECT key, value FROM price_match_meta").fetchall())
+        return {
+            'match_count': row[0],
+            'g2b_count': row[1],
+            'coupang_count': row[2],
+            'params': json.loads(meta['params']) if 'params' in meta else {},
+            'last_build': json.loads(meta['stats']) if 'stats' in meta else {}
+        }
+
+    def close(self):
+        """연결 종료"""
+        self.conn.close()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+상품 스냅샷 - UnifiedProduct 목록의 단일 파일 바이너리 열 포맷 (메모리 매핑 로드)
+"""
+
+import json
+import mmap
+import os
+import sys
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from modules.data_processor import UnifiedProduct, shared_keys
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"PMSNAP01"
+ALIGNMENT = 64
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NAT = np.iinfo(np.int64).min
+NAIVE_OFFSET = np.iinfo(np.int32).min
+TYPE_TAG = "__snapshot_type__"
+STRING_COLUMNS = ("id", "name_original", "name_normalized", "name_searchable")
+MAPPING_COLUMNS = ("specifications", "metadata")
+
+
+def _align(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class _Vocab:
+    """값 -> 코드 사전 (처음 등장한 순서)"""
+
+    def __init__(self):
+        self.codes: Dict[Any, int] = {}
+
+    def code(self, value) -> int:
+        try:
+            return self.codes[value]
+        except KeyError:
+            return self.codes.setdefault(value, len(self.codes))
+
+    def encode(self, values, dtype) -> np.ndarray:
+        """값 목록 -> 코드 배열"""
+        codes, code = self.codes, self.code
+        return np.array([codes[value] if value in codes else code(value) for value in values], dtype=dtype)
+
+    @property
+    def values(self) -> List:
+        return list(self.codes)
+
+
+def _encode_extra(value):
+    """JSON 기본 타입이 아닌 specifications/metadata 값 인코딩 (태그 dict, 로드 시 _decode_extra로 복원)"""
+    if isinstance(value, datetime):
+        return {TYPE_TAG: 'datetime', 'value': value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_TAG: 'date', 'value': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {TYPE_TAG: 'decimal', 'value': str(value)}
+    if isinstance(value, (set, frozenset)):
+        return {TYPE_TAG: 'frozenset' if isinstance(value, frozenset) else 'set', 'value': list(value)}
+    raise TypeError(f"스냅샷에 저장할 수 없는 값 타입: {type(value).__name__}")
+
+
+_EXTRA_DECODERS = {
+    'datetime': datetime.fromisoformat,
+    'date': date.fromisoformat,
+    'decimal': Decimal,
+    'set': set,
+    'frozenset': frozenset,
+}
+
+
+def _decode_extra(obj: Dict):
+    """_encode_extra 태그 dict 복원 (json.loads object_hook)"""
+    decoder = _EXTRA_DECODERS.get(obj.get(TYPE_TAG)) if len(obj) == 2 and 'value' in obj else None
+    return decoder(obj['value']) if decoder else obj
+
+
+def _terminated_blob(pieces: List[bytes], terminator: bytes) -> Tuple[bytes, np.ndarray]:
+    """각 조각 뒤에 종결 바이트를 붙여 이어 붙인 blob과 시작 오프셋 (n + 1개)"""
+    lengths = np.fromiter((len(piece) + 1 for piece in pieces), dtype=np.int64, count=len(pieces))
+    offsets = np.zeros(len(pieces) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return terminator.join(pieces) + (terminator if pieces else b''), offsets
+
+
+class ProductSnapshot(Sequence):
+    """상품 목록 스냅샷
+
+    파일 구성: MAGIC | 헤더 길이(uint64) | 헤더 JSON | 64바이트 정렬된 열 블록
+    - 문자열 열(id, 이름 3종): UTF-8 blob(항목마다 \\x00 종결) + 바이트 오프셋
+    - source/currency/카테고리: 코드표 + 정수 코드, 가격: 원 단위 int64
+    - specifications/metadata: 키 구성(layout) 코드 + 값 목록 JSON(항목마다 ',' 종결)
+      JSON 기본 타입 외에 datetime/date/Decimal/set/frozenset은 {"__snapshot_type__": 타입, "value": ...}
+      태그로 저장해 로드 시 같은 타입으로 복원하고, 그 밖의 타입은 save에서 TypeError
+    - timestamps: layout 코드 + datetime64[us] 값(UTC, None은 NaT) + UTC 오프셋(초, 시간대 없는 값은 NAIVE_OFFSET)
+      시간대가 있던 값은 같은 오프셋의 고정 시간대(datetime.timezone)로 복원된다.
+      시각과 오프셋은 보존되지만 ZoneInfo 같은 지역 시간대 정보(이름, 서머타임 규칙)는 저장하지 않는다.
+
+    load는 파일을 읽기 전용으로 메모리 매핑하고 열은 복사 없는 NumPy 뷰로만 연결한다.
+    상품 객체는 인덱스 접근 시 한 건씩, 순회 시에는 블록 단위로 열 전체를 한 번에 디코딩해 만든다.
+    """
+
+    VERSION = 2
+    ITER_BLOCK = 8192
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._buffer[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"상품 스냅샷 파일이 아닙니다: {self.path}")
+
+        header_length = int(np.frombuffer(self._buffer, dtype='<u8', count=1, offset=len(MAGIC))[0])
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._buffer[header_start:header_start + header_length], object_hook=_decode_extra)
+        if header.get('version') != self.VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 상품 스냅샷 버전: {header.get('version')} (필요: {self.VERSION})")
+        data_start = _align(header_start + header_length)
+
+        self.count: int = header['count']
+        self.metadata: Dict[str, Any] = header.get('metadata', {})
+        self._split_safe: Dict[str, bool] = header['split_safe']
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.frombuffer(
+                self._buffer, dtype=spec['dtype'], count=spec['count'], offset=data_start + spec['offset']
+            )
+            for name, spec in header['columns'].items()
+        }
+
+        vocab = header['vocab']
+        self.sources = [sys.intern(value) for value in vocab['source']]
+        self.currencies = [sys.intern(value) for value in vocab['currency']]
+        self.categories = [sys.intern(value) if isinstance(value, str) else value for value in vocab['category']]
+        self.layouts = {
+            name: [shared_keys(tuple(keys)) for keys in vocab[f'{name}_layouts']]
+            for name in (*MAPPING_COLUMNS, 'timestamps')
+        }
+
+    # === 저장 ===
+
+    @classmethod
+    def save(cls, products: List[UnifiedProduct], path: Path, metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """상품 목록을 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        count = len(products)
+
+        columns: Dict[str, np.ndarray] = {}
+        blobs: Dict[str, bytes] = {}
+        split_safe: Dict[str, bool] = {}
+
+        for name in STRING_COLUMNS:
+            values = [getattr(product, name) for product in products]
+            split_safe[name] = not any('\x00' in value for value in values)
+            blobs[name], columns[f'{name}_offsets'] = _terminated_blob(
+                [value.encode('utf-8') for value in values], b'\x00'
+            )
+
+        source_vocab, currency_vocab, category_vocab = _Vocab(), _Vocab(), _Vocab()
+        columns['source'] = source_vocab.encode([p.source for p in products], np.int16)
+        columns['currency'] = currency_vocab.encode([p.currency for p in products], np.int16)
+        columns['amount'] = np.fromiter((p.amount for p in products), dtype=np.int64, count=count)
+        columns['vat_included'] = np.fromiter((p.vat_included for p in products), dtype=np.bool_, count=count)
+
+        columns['category_codes'] = category_vocab.encode([value for p in products for value in p.category], np.int32)
+        columns['category_offsets'] = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum([len(p.category) for p in products], out=columns['category_offsets'][1:])
+
+        layout_vocabs = {}
+        for name in MAPPING_COLUMNS:
+            layout_vocab = layout_vocabs[name] = _Vocab()
+            packed = [cls._packed(getattr(product, f'_{name}')) for product in products]
+            columns[f'{name}_layout'] = np.fromiter(
+                (layout_vocab.code(keys) if keys else -1 for keys, _ in packed), dtype=np.int32, count=count
+            )
+            blobs[name], columns[f'{name}_offsets'] = _terminated_blob(
+                cls._encoded_values(name, products, packed), b','
+            )
+
+        timestamp_vocab = layout_vocabs['timestamps'] = _Vocab()
+        packed = [cls._packed(product._timestamps) for product in products]
+        columns['timestamps_layout'] = np.fromiter(
+            (timestamp_vocab.code(keys) if keys else -1 for keys, _ in packed), dtype=np.int32, count=count
+        )
+        columns['timestamps_offsets'] = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum([len(values) for _, values in packed], out=columns['timestamps_offsets'][1:])
+        timestamps = [value for _, values in packed for value in values]
+        columns['timestamps_offset'] = np.array([
+            NAIVE_OFFSET if value is None or value.tzinfo is None else int(value.utcoffset().total_seconds())
+            for value in timestamps
+        ], dtype=np.int32)
+        # datetime 목록을 바로 datetime64로 바꾸는 것보다 마이크로초 정수로 계산하는 편이 빠름
+        columns['timestamps_values'] = np.array([
+            NAT if value is None
+            else ((value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value) - EPOCH) // MICROSECOND
+            for value in timestamps
+        ], dtype=np.int64).view('datetime64[us]')
+
+        for name, blob in blobs.items():
+            columns[f'{name}_data'] = np.frombuffer(blob, dtype=np.uint8)
+
+        # 열 배치 (각 열은 64바이트 정렬)
+        specs = {}
+        position = 0
+        for name, column in columns.items():
+            column = columns[name] = np.ascontiguousarray(column)
+            specs[name] = {'dtype': column.dtype.str, 'count': int(column.size), 'offset': position}
+            position = _align(position + column.nbytes)
+
+        header = json.dumps({
+            'version': cls.VERSION,
+            'count': count,
+            'metadata': metadata or {},
+            'split_safe': split_safe,
+            'columns': specs,
+            'vocab': {
+                'source': source_vocab.values,
+                'currency': currency_vocab.values,
+                'category': category_vocab.values,
+                **{f'{name}_layouts': [list(keys) for keys in vocab.values] for name, vocab in layout_vocabs.items()}
+            }
+        }, ensure_ascii=False, default=_encode_extra).encode('utf-8')
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(np.array([len(header)], dtype='<u8').tobytes())
+            f.write(header)
+            data_start = _align(len(MAGIC) + 8 + len(header))
+            f.write(b'\x00' * (data_start - f.tell()))
+            for name, column in columns.items():
+                f.write(b'\x00' * (data_start + specs[name]['offset'] - f.tell()))
+                f.write(column.tobytes())
+        os.replace(tmp_path, path)
+
+        logger.info(f"상품 스냅샷 저장: {count}개 -> {path}")
+        return path
+
+    @staticmethod
+    def _encoded_values(name: str, products: List[UnifiedProduct], packed: List[Tuple[Tuple, Tuple]]) -> List[bytes]:
+        """행별 값 튜플 -> JSON 배열 바이트 (저장할 수 없는 값은 상품 id와 필드를 밝혀 TypeError)"""
+        encode_values = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_encode_extra).encode
+        encoded = []
+        for product, (keys, values) in zip(products, packed):
+            try:
+                encoded.append(encode_values(values).encode('utf-8'))
+            except TypeError as e:
+                raise TypeError(f"상품 {product.id}의 {name} 값을 스냅샷에 저장할 수 없습니다 (키 {list(keys)}): {e}") from e
+            except ValueError as e:
+                # 순환 참조 등
+                raise ValueError(f"상품 {product.id}의 {name} 값을 스냅샷에 저장할 수 없습니다: {e}") from e
+        return encoded
+
+    @staticmethod
+    def _packed(mapping) -> Tuple[Tuple, Tuple]:
+        """UnifiedProduct의 압축 매핑 (접근 후 dict로 바뀐 경우 포함) -> (키 튜플, 값 튜플)"""
+        if not mapping:
+            return (), ()
+        if isinstance(mapping, dict):
+            return tuple(mapping), tuple(mapping.values())
+        return mapping
+
+    @classmethod
+    def load(cls, path: Path) -> 'ProductSnapshot':
+        """스냅샷 파일에 읽기 전용 메모리 매핑으로 연결"""
+        return cls(path)
+
+    # === 열 접근 ===
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """원 단위 가격 열 (메모리 매핑 뷰)"""
+        return self._columns['amount']
+
+    @property
+    def source_codes(self) -> np.ndarray:
+        """출처 코드 열 (self.sources 기준)"""
+        return self._columns['source']
+
+    # === 상품 접근 ===
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self.count)
+            if step == 1:
+                return self._materialize(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        if idx < 0:
+            idx += self.count
+        if not 0 <= idx < self.count:
+            raise IndexError(idx)
+        return self._materialize(idx, idx + 1)[0]
+
+    def __iter__(self) -> Iterator[UnifiedProduct]:
+        for start in range(0, self.count, self.ITER_BLOCK):
+            yield from self._materialize(start, min(start + self.ITER_BLOCK, self.count))
+
+    def to_products(self) -> List[UnifiedProduct]:
+        """전체 상품 목록"""
+        return self._materialize(0, self.count)
+
+    def _strings(self, name: str, start: int, stop: int) -> List[str]:
+        """문자열 열 범위 디코딩 (구분자가 없는 열은 디코딩/분할 한 번)"""
+        offsets = self._columns[f'{name}_offsets']
+        data = self._columns[f'{name}_data']
+        if start == stop:
+            return []
+        if self._split_safe[name]:
+            return data[offsets[start]:offsets[stop] - 1].tobytes().decode('utf-8').split('\x00')
+        return [data[offsets[i]:offsets[i + 1] - 1].tobytes().decode('utf-8') for i in range(start, stop)]
+
+    def _mapping_values(self, name: str, start: int, stop: int) -> List[List]:
+        """specifications/metadata 값 목록 범위 디코딩 (JSON 배열 한 번)"""
+        offsets = self._columns[f'{name}_offsets']
+        data = self._columns[f'{name}_data']
+        if start == stop:
+            return []
+        return json.loads(b'[' + data[offsets[start]:offsets[stop] - 1].tobytes() + b']', object_hook=_decode_extra)
+
+    def _ragged(self, name: str, values: List, start: int, stop: int) -> List[Tuple]:
+        """오프셋 열 기준으로 값 목록을 행별 튜플로 분할"""
+        offsets = self._columns[f'{name}_offsets'][start:stop + 1]
+        offsets = (offsets - offsets[0]).tolist()
+        return [tuple(values[begin:end]) for begin, end in zip(offsets, offsets[1:])]
+
+    def _packed_column(self, name: str, values: List, start: int, stop: int) -> List[Optional[Tuple[Tuple, Tuple]]]:
+        """layout 코드 + 행별 값 -> UnifiedProduct의 압축 매핑 (키가 없으면 None)"""
+        layouts = self.layouts[name]
+        codes = self._columns[f'{name}_layout'][start:stop].tolist()
+        return [(layouts[code], tuple(row)) if code >= 0 else None for code, row in zip(codes, values)]
+
+    def _materialize(self, start: int, stop: int) -> List[UnifiedProduct]:
+        """[start, stop) 범위 상품 생성 (열마다 한 번에 디코딩한 뒤 행으로 조립)"""
+        columns = self._columns
+
+        categories = self.categories
+        category_offsets = columns['category_offsets']
+        category_names = [
+            categories[code]
+            for code in columns['category_codes'][category_offsets[start]:category_offsets[stop]].tolist()
+        ]
+
+        timestamp_offsets = columns['timestamps_offsets']
+        begin, end = timestamp_offsets[start], timestamp_offsets[stop]
+        timestamp_values = columns['timestamps_values'][begin:end].astype(object).tolist()
+        offsets = columns['timestamps_offset'][begin:end]
+        zones = {}
+        for idx in np.flatnonzero(offsets != NAIVE_OFFSET).tolist():
+            offset = int(offsets[idx])
+            zone = zones.get(offset)
+            if zone is None:
+                zone = zones[offset] = timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+            timestamp_values[idx] = timestamp_values[idx].replace(tzinfo=timezone.utc).astimezone(zone)
+
+        sources, currencies = self.sources, self.currencies
+        return list(map(
+            UnifiedProduct._from_fields,
+            self._strings('id', start, stop),
+            [sources[code] for code in columns['source'][start:stop].tolist()],
+            self._strings('name_original', start, stop),
+            self._strings('name_normalized', start, stop),
+            self._strings('name_searchable', start, stop),
+            columns['amount'][start:stop].tolist(),
+            [currencies[code] for code in columns['currency'][start:stop].tolist()],
+            columns['vat_included'][start:stop].tolist(),
+            self._ragged('category', category_names, start, stop),
+            *(
+                self._packed_column(name, self._mapping_values(name, start, stop), start, stop)
+                for name in MAPPING_COLUMNS
+            ),
+            self._packed_column(
+                'timestamps', self._ragged('timestamps', timestamp_values, start, stop), start, stop
+            )
+        ))
+
+    def close(self):
+        """매핑 해제 (열 뷰가 남아 있으면 가비지 컬렉션 후 해제)"""
+        self._columns = {}
+        try:
+            self._buffer.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self) -> 'ProductSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+상품 열 저장소 - 가격 통계/패싯용 NumPy 열 (검색 색인과 공유)
+"""
+
+import json
+from datetime import timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.data_processor import UnifiedProduct
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProductTable:
+    """상품 목록의 열 단위 표현
+
+    - ids: 상품 ID (고정 폭 유니코드 배열)
+    - source_codes / sources: 출처 코드와 코드표
+    - category_codes / categories: 최상위 카테고리 코드와 코드표 (없으면 -1)
+    - prices: 원 단위 가격 (float64)
+    - created: 생성 시각 (datetime64[us], 없으면 NaT)
+
+    통계는 열 전체에 대한 벡터 연산으로 계산하고, save/load(mmap_mode='r')로
+    공유 색인 세대에 함께 저장해 워커 간 같은 페이지를 공유한다.
+    """
+
+    COLUMNS = ("ids", "source_codes", "category_codes", "prices", "created")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        source_codes: np.ndarray,
+        sources: List[str],
+        category_codes: np.ndarray,
+        categories: List[str],
+        prices: np.ndarray,
+        created: np.ndarray
+    ):
+        self.ids = ids
+        self.source_codes = source_codes
+        self.sources = sources
+        self.category_codes = category_codes
+        self.categories = categories
+        self.prices = prices
+        self.created = created
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @classmethod
+    def from_products(cls, products: Sequence[UnifiedProduct]) -> 'ProductTable':
+        """상품 목록에서 열 구성"""
+        source_index: Dict[str, int] = {}
+        category_index: Dict[str, int] = {}
+        columns = cls._encode(products, source_index, category_index)
+        return cls(sources=list(source_index), categories=list(category_index), **columns)
+
+    @staticmethod
+    def _encode(
+        products: Sequence[UnifiedProduct],
+        source_index: Dict[str, int],
+        category_index: Dict[str, int]
+    ) -> Dict[str, np.ndarray]:
+        """상품 행 -> 열 (코드표 dict에 없는 출처/카테고리는 뒤에 추가)"""
+        count = len(products)
+        source_codes = np.empty(count, dtype=np.int16)
+        category_codes = np.empty(count, dtype=np.int32)
+        prices = np.empty(count, dtype=np.float64)
+        created = np.empty(count, dtype='datetime64[us]')
+
+        for idx, product in enumerate(products):
+            source_codes[idx] = source_index.setdefault(product.source, len(source_index))
+            top_category = product.category[0] if product.category else None
+            category_codes[idx] = category_index.setdefault(top_category, len(category_index)) if top_category else -1
+            prices[idx] = product.amount
+
+            timestamp = product.timestamps.get('created')
+            if timestamp is not None and timestamp.tzinfo is not None:
+                timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            created[idx] = np.datetime64(timestamp, 'us') if timestamp else np.datetime64('NaT')
+
+        return {
+            'ids': np.array([product.id for product in products], dtype=str),
+            'source_codes': source_codes,
+            'category_codes': category_codes,
+            'prices': prices,
+            'created': created
+        }
+
+    def with_rows(
+        self,
+        replaced: Sequence[Tuple[int, UnifiedProduct]] = (),
+        appended: Sequence[UnifiedProduct] = ()
+    ) -> 'ProductTable':
+        """일부 행을 교체하고 뒤에 행을 추가한 새 표 (기존 표와 메모리 매핑 열은 그대로 두고, 바뀐 상품만 인코딩)
+
+        코드표는 뒤에만 추가되므로 기존 출처/카테고리 코드는 새 표에서도 같다.
+        """
+        source_index = {source: code for code, source in enumerate(self.sources)}
+        category_index = {category: code for code, category in enumerate(self.categories)}
+        batch = self._encode([product for _, product in replaced] + list(appended), source_index, category_index)
+        rows = np.array([idx for idx, _ in replaced], dtype=np.int64)
+
+        columns = {}
+        for column in self.COLUMNS:
+            values = batch[column]
+            columns[column] = np.concatenate([np.asarray(getattr(self, column)), values[len(rows):]])
+            columns[column][rows] = values[:len(rows)]
+        return ProductTable(sources=list(source_index), categories=list(category_index), **columns)
+
+    def update_postings(
+        self,
+        postings: Dict[str, np.ndarray],
+        previous: 'ProductTable',
+        changed_rows: Sequence[int]
+    ) -> Dict[str, np.ndarray]:
+        """previous의 카테고리 색인(postings)을 with_rows로 만든 이 표에 맞게 갱신 (바뀐 행과 추가된 행만 반영)"""
+        postings = dict(postings)
+        changed = np.unique(np.asarray(changed_rows, dtype=np.int64))
+        old_codes = np.asarray(previous.category_codes)[changed]
+        is_moved = np.asarray(self.category_codes)[changed] != old_codes
+        moved, moved_old_codes = changed[is_moved], old_codes[is_moved]
+
+        for code in np.unique(moved_old_codes[moved_old_codes >= 0]).tolist():
+            category = self.categories[code]
+            remaining = np.setdiff1d(postings[category], moved[moved_old_codes == code], assume_unique=True)
+            if len(remaining):
+                postings[category] = remaining
+            else:
+                del postings[category]
+
+        rows = np.concatenate([moved, np.arange(len(previous), len(self), dtype=np.int64)])
+        codes = np.asarray(self.category_codes)[rows]
+        for code in np.unique(codes[codes >= 0]).tolist():
+            category = self.categories[code]
+            postings[category] = np.union1d(postings.get(category, np.array([], dtype=np.int64)), rows[codes == code])
+        return postings
+
+    def save(self, path: Path):
+        """열(.npy)과 코드표(table.json) 저장"""
+        path = Path(path)
+        for column in self.COLUMNS:
+            np.save(path / f"{column}.npy", getattr(self, column))
+        with open(path / "table.json", 'w', encoding='utf-8') as f:
+            json.dump({'sources': self.sources, 'categories': self.categories}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: Path, mmap_mode: Optional[str] = 'r') -> 'ProductTable':
+        """저장된 열 로드 (기본은 읽기 전용 메모리 매핑)"""
+        path = Path(path)
+        with open(path / "table.json", 'r', encoding='utf-8') as f:
+            vocab = json.load(f)
+        columns = {column: np.load(path / f"{column}.npy", mmap_mode=mmap_mode) for column in cls.COLUMNS}
+        return cls(sources=vocab['sources'], categories=vocab['categories'], **columns)
+
+    def category_postings(self) -> Dict[str, np.ndarray]:
+        """최상위 카테고리별 상품 인덱스 (오름차순)"""
+        order = np.argsort(self.category_codes, kind='stable')
+        sorted_codes = self.category_codes[order]
+        codes = np.arange(len(self.categories))
+        starts = np.searchsorted(sorted_codes, codes, side='left')
+        ends = np.searchsorted(sorted_codes, codes, side='right')
+        return {
+            category: order[start:end]
+            for category, start, end in zip(self.categories, starts, ends)
+            if end > start
+        }
+
+    def _positive_prices(self) -> np.ndarray:
+        """가격 정보가 있는 상품의 정렬된 가격"""
+        prices = np.asarray(self.prices)
+        return np.sort(prices[prices > 0])
+
+    def price_summary(self) -> Dict[str, Any]:
+        """가격 요약 통계 (가격 0 제외)"""
+        prices = self._positive_prices()
+        if not len(prices):
+            return {'price_count': 0}
+
+        return {
+            'price_count': int(len(prices)),
+            'min_price': float(prices[0]),
+            'max_price': float(prices[-1]),
+            'avg_price': float(prices.mean()),
+            'median_price': float(prices[len(prices) // 2]),
+            'price_range': float(prices[-1] - prices[0]),
+            'price_std_dev': float(prices.std()) if len(prices) > 1 else 0.0
+        }
+
+    def price_distribution(self, bins: int = 5) -> Dict[str, int]:
+        """최솟값~최댓값 균등 구간별 상품 수 (마지막 구간은 최댓값 포함)"""
+        prices = self._positive_prices()
+        if not len(prices):
+            return {}
+
+        min_price, max_price = float(prices[0]), float(prices[-1])
+        range_size = (max_price - min_price) / bins
+
+        distribution = {}
+        for i in range(bins):
+            range_start = min_price + (i * range_size)
+            range_end = min_price + ((i + 1) * range_size)
+            side = 'right' if i == bins - 1 else 'left'
+            count = np.searchsorted(prices, range_end, side=side) - np.searchsorted(prices, range_start, side='left')
+            distribution[f"{range_start:.0f}-{range_end:.0f}"] = int(count)
+
+        return distribution
+
+    def source_comparison(self) -> Dict[str, Dict[str, float]]:
+        """출처별 가격 통계 (가격 0 제외, 처음 등장한 순서)"""
+        prices = np.asarray(self.prices)
+        mask = prices > 0
+        codes = np.asarray(self.source_codes)[mask]
+        prices = prices[mask]
+        if not len(prices):
+            return {}
+
+        size = len(self.sources)
+        counts = np.bincount(codes, minlength=size)
+        sums = np.bincount(codes, weights=prices, minlength=size)
+        mins = np.full(size, np.inf)
+        maxs = np.full(size, -np.inf)
+        np.minimum.at(mins, codes, prices)
+        np.maximum.at(maxs, codes, prices)
+
+        present, first_seen = np.unique(codes, return_index=True)
+        return {
+            self.sources[code]: {
+                'count': int(counts[code]),
+                'avg_price': float(sums[code] / counts[code]),
+                'min_price': float(mins[code]),
+                'max_price': float(maxs[code])
+            }
+            for code in present[np.argsort(first_seen)]
+        }
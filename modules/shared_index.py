@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+워커 간 공유 하이브리드 색인 - 메모리 매핑 파일 기반 세대(generation) 관리
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from modules.data_processor import UnifiedProduct
+from modules.product_snapshot import ProductSnapshot
+from modules.product_table import ProductTable
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class SharedIndexGeneration:
+    """읽기 전용으로 연결된 색인 세대"""
+
+    def __init__(self, generation: int, path: Path):
+        self.generation = generation
+        self.path = path
+
+        with open(path / "manifest.json", 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        # 임베딩 행렬, 상품 스냅샷, 검색 색인 배열은 페이지 캐시를 통해 모든 워커가 공유
+        self.embeddings = np.load(path / "embeddings.npy", mmap_mode='r')
+        self.table = ProductTable.load(path, mmap_mode='r')
+        self.prices = self.table.prices
+        self.products = ProductSnapshot.load(path / "products.snap")
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.load(path / f"{name}.npy", mmap_mode='r')
+            for name in self.manifest.get('arrays', [])
+        }
+
+    def close(self):
+        """연결 해제"""
+        self.products.close()
+
+
+class SharedIndexStore:
+    """공유 색인 게시/연결 저장소
+
+    게시 프로세스는 새 세대 디렉토리를 임시 이름으로 작성한 뒤 rename하고,
+    CURRENT 포인터 파일을 os.replace로 교체하여 원자적으로 전환한다.
+    워커는 CURRENT가 가리키는 세대를 np.load(mmap_mode='r')로 읽기 전용 연결한다.
+    arrays로 넘긴 검색 색인 배열(BM25 역색인, 텍스트 해시 등)도 이름별 .npy로 함께 게시한다.
+    """
+
+    def __init__(self, base_dir: str, keep_generations: int = 2):
+        self.base_dir = Path(base_dir)
+        self.keep_generations = keep_generations
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def publish(
+        self,
+        products: List[UnifiedProduct],
+        embeddings: np.ndarray,
+        arrays: Optional[Dict[str, np.ndarray]] = None
+    ) -> int:
+        """새 색인 세대 게시"""
+        arrays = arrays or {}
+        generation = (self.current_generation() or 0) + 1
+        final_dir = self.base_dir / f"gen_{generation:06d}"
+        tmp_dir = self.base_dir / f".gen_{generation:06d}.{os.getpid()}.tmp"
+
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        ProductSnapshot.save(products, tmp_dir / "products.snap")
+        np.save(tmp_dir / "embeddings.npy", np.ascontiguousarray(embeddings, dtype=np.float32))
+        ProductTable.from_products(products).save(tmp_dir)
+        for name, array in arrays.items():
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(array))
+
+        with open(tmp_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'generation': generation,
+                'product_count': len(products),
+                'embedding_dim': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+                'arrays': sorted(arrays),
+                'published_at': time.time()
+            }, f)
+
+        os.rename(tmp_dir, final_dir)
+        self._write_current(generation)
+        self._cleanup_old_generations(generation)
+
+        logger.info(f"공유 색인 게시 완료: 세대 {generation}, {len(products)}개 상품")
+        return generation
+
+    def current_generation(self) -> Optional[int]:
+        """현재 게시된 세대 번호"""
+        try:
+            with open(self.base_dir / "CURRENT", 'r', encoding='utf-8') as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def attach(self, generation: Optional[int] = None, retries: int = 3) -> Optional[SharedIndexGeneration]:
+        """게시된 세대에 읽기 전용으로 연결
+
+        연결 도중 게시 프로세스가 해당 세대를 정리하면(FileNotFoundError) CURRENT를 다시 읽어
+        최신 세대로 재시도. 재시도 후에도 실패하면 None 반환 (호출자는 기존 색인 유지)
+        """
+        generation = generation or self.current_generation()
+        for _ in range(retries):
+            if generation is None:
+                return None
+
+            try:
+                attached = SharedIndexGeneration(generation, self.base_dir / f"gen_{generation:06d}")
+            except FileNotFoundError:
+                latest = self.current_generation()
+                logger.warning(f"공유 색인 세대 {generation} 정리됨, 현재 세대 {latest}로 재시도")
+                generation = latest
+                continue
+
+            logger.info(f"공유 색인 연결: 세대 {generation}, {len(attached.products)}개 상품")
+            return attached
+
+        logger.warning(f"공유 색인 연결 실패: {self.base_dir} ({retries}회 재시도)")
+        return None
+
+    def _write_current(self, generation: int):
+        """CURRENT 포인터 원자적 교체"""
+        tmp_path = self.base_dir / f".CURRENT.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(str(generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.base_dir / "CURRENT")
+
+    def _cleanup_old_generations(self, current: int):
+        """오래된 세대 정리 (연결 중인 워커의 매핑은 파일 삭제 후에도 유지됨)"""
+        for path in self.base_dir.glob("gen_*"):
+            try:
+                generation = int(path.name.split('_')[1])
+            except (IndexError, ValueError):
+                continue
+            if generation <= current - self.keep_generations:
+                shutil.rmtree(path, ignore_errors=True)
@@ -1,5 +1,3 @@
-import chromadb
-from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
@@ -8,6 +6,7 @@ import json
 from datetime import datetime
 from utils import get_logger, ModuleValidator
 from config import ProcureMateSettings
+from modules.chroma_client import create_chroma_client, stable_document_id, text_hash
 
 logger = get_logger(__name__)
 
@@ -31,8 +30,8 @@ class VectorDbModule:
     
     def _initialize_database(self):
         if self.db_type.lower() == "chroma":
-            # 새로운 ChromaDB API 사용
-            self.client = chromadb.PersistentClient(path="./chroma_db")
+            # VECTOR_DB_MODE에 따라 embedded 또는 HTTP 서버 클라이언트 사용
+            self.client = create_chroma_client("./chroma_db")
             
             # 컬렉션 생성 또는 가져오기
             try:
@@ -70,42 +69,95 @@ class VectorDbModule:
  
     
     def add_product_data(self, product_data: Dict[str, Any]) -> bool:
-        """상품 데이터 추가"""
+        """상품 데이터 추가 (같은 상품은 upsert, 내용이 같으면 재임베딩 생략)"""
         if not self.collection:
             logger.error("컬렉션이 초기화되지 않음")
             return False
         
-        # 검색 가능한 텍스트 생성
-        searchable_text = self._create_searchable_text(product_data)
+        return self.add_products_batch([product_data]) >= 0
+    
+    def _document_id(self, product_data: Dict[str, Any], searchable_text: str) -> str:
+        """플랫폼 + 원본 상품 ID 기반 결정적 문서 ID"""
+        source_id = (
+            product_data.get("product_id")
+            or product_data.get("bid_ntce_no")
+            or product_data.get("id")
+        )
+        return stable_document_id(product_data.get("platform", ""), source_id, searchable_text)
+    
+    def _filter_unchanged(self, collection, ids: List[str], texts: List[str]) -> List[int]:
+        """저장된 text_hash와 다른(신규 또는 변경) 문서 위치만 반환"""
+        existing = {}
+        batch_size = ProcureMateSettings.VECTOR_DB_BATCH_SIZE
+        for start in range(0, len(ids), batch_size):
+            result = collection.get(ids=ids[start:start + batch_size], include=["metadatas"])
+            for doc_id, metadata in zip(result["ids"], result["metadatas"]):
+                existing[doc_id] = (metadata or {}).get("text_hash")
+        
+        return [
+            idx for idx, doc_id in enumerate(ids)
+            if existing.get(doc_id) != text_hash(texts[idx])
+        ]
+    
+    def add_products_batch(self, products: List[Dict[str, Any]]) -> int:
+        """상품 데이터 배치 upsert (변경된 상품만 일괄 임베딩, VECTOR_DB_BATCH_SIZE 단위 저장)"""
+        if not self.collection:
+            logger.error("컬렉션이 초기화되지 않음")
+            return 0
         
-        # 임베딩 생성
-        embedding = self._create_embedding(searchable_text)
+        if not products:
+            return 0
         
-        # 고유 ID 생성
-        doc_id = str(uuid.uuid4())
+        # 같은 상품이 배치에 여러 번 있으면 마지막 값 사용
+        latest: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        for product in products:
+            searchable_text = self._create_searchable_text(product)
+            latest[self._document_id(product, searchable_text)] = (product, searchable_text)
         
-        # 메타데이터 준비
-        metadata = {
-            "platform": product_data.get("platform", ""),
-            "name": product_data.get("name", ""),
-            "price": product_data.get("price", 0),
-            "vendor": product_data.get("vendor", ""),
-            "rating": product_data.get("rating", 0),
-            "added_at": datetime.now().isoformat()
-        }
+        ids = list(latest.keys())
+        searchable_texts = [latest[doc_id][1] for doc_id in ids]
         
-        # 컬렉션에 추가
-        self.collection.add(
-            embeddings=[embedding],
-            documents=[searchable_text],
-            metadatas=[metadata],
-            ids=[doc_id]
-        )
+        changed = self._filter_unchanged(self.collection, ids, searchable_texts)
+        if not changed:
+            logger.debug(f"변경된 상품 없음, 재임베딩 생략: {len(ids)}개")
+            return 0
         
-        logger.debug(f"상품 데이터 추가 완료: {product_data.get('name', 'Unknown')}")
-        return True
+        ids = [ids[idx] for idx in changed]
+        searchable_texts = [searchable_texts[idx] for idx in changed]
+        changed_products = [latest[doc_id][0] for doc_id in ids]
         
-
+        if self.embedding_model:
+            embeddings = self.embedding_model.encode(searchable_texts, batch_size=32).tolist()
+        else:
+            embeddings = [self._create_embedding(text) for text in searchable_texts]
+        
+        added_at = datetime.now().isoformat()
+        metadatas = [
+            {
+                "platform": product.get("platform", ""),
+                "name": product.get("name", ""),
+                "price": product.get("price", 0),
+                "vendor": product.get("vendor", ""),
+                "rating": product.get("rating", 0),
+                "text_hash": text_hash(searchable_text),
+                "added_at": added_at
+            }
+            for product, searchable_text in zip(changed_products, searchable_texts)
+        ]
+        
+        batch_size = ProcureMateSettings.VECTOR_DB_BATCH_SIZE
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self.collection.upsert(
+                embeddings=embeddings[start:end],
+                documents=searchable_texts[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
+        
+        logger.info(f"상품 데이터 upsert 완료: 변경 {len(ids)}개 / 전체 {len(latest)}개")
+        return len(ids)
+    
     def _create_searchable_text(self, product_data: Dict[str, Any]) -> str:
         """검색 가능한 텍스트 생성"""
         text_parts = []
@@ -163,7 +215,7 @@ class VectorDbModule:
         
     
     def add_procurement_history(self, procurement_data: Dict[str, Any]) -> bool:
-        """조달 이력 추가"""
+        """조달 이력 추가 (요청마다 별도 기록, 상품 문서와 달리 upsert하지 않음)"""
 
         # 조달 요청을 검색 가능한 형태로 변환
         history_text = self._create_procurement_text(procurement_data)
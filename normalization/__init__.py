@@ -4,20 +4,28 @@
 """
 
 from .embedding_engine import EmbeddingNormalizationEngine
-from .similarity_mapping import SimilarityMappingSystem, NormalizationRule
+from .similarity_mapping import SimilarityMappingSystem, NormalizationRule, flush_pending_rules
 from .color_normalizer import ColorNormalizer
 from .brand_normalizer import BrandNormalizer
 from .unit_normalizer import UnitNormalizer
 from .text_processor import UnifiedTextProcessor
+from .prefilter import TermPrefilter
+from .hashing_embedder import HashingEmbedder
+from .text_embedder import TransformerEmbedder, create_text_embedder
 
 __all__ = [
     'EmbeddingNormalizationEngine',
     'SimilarityMappingSystem',
     'NormalizationRule',
+    'flush_pending_rules',
     'ColorNormalizer',
     'BrandNormalizer', 
     'UnitNormalizer',
-    'UnifiedTextProcessor'
+    'UnifiedTextProcessor',
+    'TermPrefilter',
+    'HashingEmbedder',
+    'TransformerEmbedder',
+    'create_text_embedder'
 ]
 
 __version__ = '1.0.0'
@@ -5,21 +5,22 @@
 
 from typing import Dict, List, Optional
 from .similarity_mapping import SimilarityMappingSystem
-from utils import get_logger
+from utils import get_logger, MultiPatternMatcher
 
 logger = get_logger(__name__)
 
 class BrandNormalizer:
     """브랜드명 정규화"""
     
-    def __init__(self):
-        self.mapping_system = SimilarityMappingSystem()
+    def __init__(self, prefilter_enabled: Optional[bool] = None):
+        self.mapping_system = SimilarityMappingSystem(snapshot_key="brands", prefilter_enabled=prefilter_enabled)
         self.is_initialized = False
     
     async def initialize(self):
         """초기화"""
         await self.mapping_system.initialize()
         await self._ensure_brand_rules()
+        await self.mapping_system.save_snapshot()
         self.is_initialized = True
         logger.info("브랜드명 정규화 모듈 초기화 완료")
     
@@ -45,9 +46,11 @@ class BrandNormalizer:
             "에이서": ["Acer", "ACER", "acer", "에이서"]
         }
         
-        for standard, variants in brand_mappings.items():
-            for variant in variants:
-                await self.mapping_system.add_new_variant(standard, variant, "brands")
+        await self.mapping_system.add_variants_bulk(brand_mappings, "brands")
+    
+    def get_matcher(self) -> MultiPatternMatcher:
+        """텍스트 내 브랜드명 치환용 오토마톤"""
+        return self.mapping_system.get_matcher("brands")
     
     async def normalize_brand(self, brand_text: str) -> str:
         """브랜드명 정규화"""
@@ -56,6 +59,13 @@ class BrandNormalizer:
         
         return await self.mapping_system.normalize_term(brand_text, "brands")
     
+    async def normalize_brands(self, brand_texts: List[str]) -> Dict[str, str]:
+        """브랜드명 일괄 정규화 (원문 -> 표준 용어)"""
+        if not self.is_initialized:
+            await self.initialize()
+        
+        return await self.mapping_system.normalize_terms(brand_texts, "brands")
+    
     async def detect_brands_in_text(self, text: str) -> List[Dict]:
         """텍스트에서 브랜드 감지 및 정규화"""
         if not self.is_initialized:
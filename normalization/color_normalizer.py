@@ -5,21 +5,22 @@
 
 from typing import Dict, List, Optional
 from .similarity_mapping import SimilarityMappingSystem
-from utils import get_logger
+from utils import get_logger, MultiPatternMatcher
 
 logger = get_logger(__name__)
 
 class ColorNormalizer:
     """색상 정규화"""
     
-    def __init__(self):
-        self.mapping_system = SimilarityMappingSystem()
+    def __init__(self, prefilter_enabled: Optional[bool] = None):
+        self.mapping_system = SimilarityMappingSystem(snapshot_key="colors", prefilter_enabled=prefilter_enabled)
         self.is_initialized = False
     
     async def initialize(self):
         """초기화"""
         await self.mapping_system.initialize()
         await self._ensure_color_rules()
+        await self.mapping_system.save_snapshot()
         self.is_initialized = True
         logger.info("색상 정규화 모듈 초기화 완료")
     
@@ -38,9 +39,11 @@ class ColorNormalizer:
             "분홍색": ["핑크", "pink", "PINK", "분홍", "핑크색"]
         }
         
-        for standard, variants in color_mappings.items():
-            for variant in variants:
-                await self.mapping_system.add_new_variant(standard, variant, "colors")
+        await self.mapping_system.add_variants_bulk(color_mappings, "colors")
+    
+    def get_matcher(self) -> MultiPatternMatcher:
+        """텍스트 내 색상 치환용 오토마톤"""
+        return self.mapping_system.get_matcher("colors")
     
     async def normalize_color(self, color_text: str) -> str:
         """색상 정규화"""
@@ -49,6 +52,13 @@ class ColorNormalizer:
         
         return await self.mapping_system.normalize_term(color_text, "colors")
     
+    async def normalize_colors(self, color_texts: List[str]) -> Dict[str, str]:
+        """색상 일괄 정규화 (원문 -> 표준 용어)"""
+        if not self.is_initialized:
+            await self.initialize()
+        
+        return await self.mapping_system.normalize_terms(color_texts, "colors")
+    
     async def detect_colors_in_text(self, text: str) -> List[Dict]:
         """텍스트에서 색상 감지 및 정규화"""
         if not self.is_initialized:
@@ -7,6 +7,8 @@ import numpy as np
 from typing import List, Dict, Tuple, Optional
 import json
 import os
+from .hashing_embedder import HashingEmbedder
+from config import ProcureMateSettings
 from utils import get_logger
 
 logger = get_logger(__name__)
@@ -14,15 +16,32 @@ logger = get_logger(__name__)
 class EmbeddingNormalizationEngine:
     """임베딩 기반 정규화 엔진"""
     
-    def __init__(self, model_name: str = "jhgan/ko-sroberta-multitask", threshold: float = 0.8):
+    def __init__(
+        self,
+        model_name: str = "jhgan/ko-sroberta-multitask",
+        threshold: float = 0.8,
+        backend: Optional[str] = None
+    ):
         self.model_name = model_name
         self.threshold = threshold
+        self.backend = (backend or ProcureMateSettings.EMBEDDING_BACKEND).lower()
         self.model = None
         self.device = "cpu"
         self.is_initialized = False
+        self.hashing_embedder = HashingEmbedder(dim=ProcureMateSettings.EMBEDDING_HASH_DIM)
         
+    @property
+    def backend_id(self) -> str:
+        """임베딩 결과를 구분하는 백엔드 식별자 (스냅샷 버전 관리용)"""
+        return self.model_name if self.model is not None else self.hashing_embedder.backend_id
+    
     async def initialize(self):
         """모델 초기화"""
+        if self.backend == "hashing":
+            self.is_initialized = True
+            logger.info(f"해싱 임베딩 백엔드 사용: {self.hashing_embedder.backend_id}")
+            return
+        
         from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer(self.model_name)
         self.model.to(self.device)
@@ -44,15 +63,8 @@ class EmbeddingNormalizationEngine:
         return embeddings
     
     def _mock_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Mock 임베딩 (개발용)"""
-        embeddings = []
-        for text in texts:
-            text_hash = hash(text) % 10000
-            np.random.seed(text_hash)
-            vector = np.random.normal(0, 1, 384)
-            vector = vector / np.linalg.norm(vector)
-            embeddings.append(vector)
-        return np.array(embeddings)
+        """모델 없이 해싱 임베딩 사용 (hashing 백엔드 또는 모델 미로드 시)"""
+        return self.hashing_embedder.encode(texts)
     
     async def find_similar_terms(self, query_term: str, candidate_terms: List[str]) -> List[Tuple[str, float]]:
         """유사한 용어 찾기"""
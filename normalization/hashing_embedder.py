@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+해싱 기반 임베딩 - 모델 없이 동작하는 결정적 CPU 백엔드
+"""
+
+import unicodedata
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+FNV_OFFSET = np.uint64(0x811C9DC5)
+FNV_PRIME = np.uint64(0x01000193)
+MASK_32 = np.uint64(0xFFFFFFFF)
+
+class HashingEmbedder:
+    """문자 n-gram + 자모 n-gram 특징 해싱 임베딩
+
+    - 음절 n-gram: 표기 그대로의 부분 문자열 (대소문자 통일)
+    - 자모 n-gram: NFD 분해 결과의 n-gram (받침/오타 변형에 강함)
+    - 배치 전체를 하나의 코드포인트 배열로 이어 붙여 numpy 연산으로 해싱 (텍스트별 Python 루프 없음)
+    - FNV-1a 기반 고정 해시라 프로세스/실행과 무관하게 같은 벡터 생성
+    - 부호 해싱으로 충돌 편향을 줄이고 결과는 행 단위 L2 정규화
+    """
+
+    SEPARATOR = 0  # 텍스트 경계 (n-gram이 경계를 넘지 않도록 제외)
+
+    def __init__(
+        self,
+        dim: int = 512,
+        char_ngrams: Tuple[int, ...] = (2, 3),
+        jamo_ngrams: Tuple[int, ...] = (3,),
+        jamo_weight: float = 0.5
+    ):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.jamo_ngrams = jamo_ngrams
+        self.jamo_weight = jamo_weight
+
+    @property
+    def backend_id(self) -> str:
+        """임베딩 결과를 구분하는 백엔드 식별자"""
+        return f"hashing:{self.dim}:{'-'.join(map(str, self.char_ngrams))}:{'-'.join(map(str, self.jamo_ngrams))}"
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 배치 임베딩 (n x dim, float32)"""
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        padded = [f" {text.lower()} " if text else "" for text in texts]
+        matrix = np.zeros(len(texts) * self.dim, dtype=np.float64)
+
+        for ngrams, weight, normalize in (
+            (self.char_ngrams, 1.0, 'NFC'),
+            (self.jamo_ngrams, self.jamo_weight, 'NFD')
+        ):
+            if not ngrams or weight == 0:
+                continue
+            codepoints, rows = self._codepoints(padded, normalize)
+            for n in ngrams:
+                self._accumulate(matrix, codepoints, rows, n, weight, seed=n * 2 + (normalize == 'NFD'))
+
+        matrix = matrix.reshape(len(texts), self.dim).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _codepoints(self, texts: List[str], normalize: str) -> Tuple[np.ndarray, np.ndarray]:
+        """배치를 구분자로 이어 붙인 코드포인트 배열과 위치별 행 번호"""
+        joined = "\x00".join(unicodedata.normalize(normalize, text) for text in texts) + "\x00"
+        codepoints = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        rows = np.cumsum(codepoints == self.SEPARATOR) - (codepoints == self.SEPARATOR)
+        return codepoints, rows
+
+    def _accumulate(
+        self,
+        matrix: np.ndarray,
+        codepoints: np.ndarray,
+        rows: np.ndarray,
+        n: int,
+        weight: float,
+        seed: int
+    ):
+        """n-gram 해시를 (행, 버킷)별로 누적"""
+        count = len(codepoints) - n + 1
+        if count <= 0:
+            return
+
+        hashes = np.full(count, (FNV_OFFSET + np.uint64(seed)) & MASK_32, dtype=np.uint64)
+        valid = np.ones(count, dtype=bool)
+        for offset in range(n):
+            window = codepoints[offset:offset + count]
+            valid &= window != self.SEPARATOR
+            hashes = ((hashes ^ window) * FNV_PRIME) & MASK_32
+
+        hashes = hashes[valid]
+        if not len(hashes):
+            return
+
+        # 상위 비트 혼합 후 버킷/부호 결정
+        mixed = (hashes ^ (hashes >> np.uint64(15))) & MASK_32
+        buckets = (mixed % np.uint64(self.dim)).astype(np.int64)
+        signs = np.where((mixed >> np.uint64(31)) & np.uint64(1), -weight, weight)
+
+        flat_index = rows[:count][valid].astype(np.int64) * self.dim + buckets
+        matrix += np.bincount(flat_index, weights=signs, minlength=len(matrix))
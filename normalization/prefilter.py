@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+임베딩 매칭 전 어휘 기반 사전 필터
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+from config import ProcureMateSettings
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STOPWORDS = {
+    "및", "등", "외", "용", "의", "을", "를", "이", "가", "은", "는", "에", "와", "과",
+    "정품", "국내", "새상품", "최신형", "신형", "상품", "제품", "무료", "배송"
+}
+
+class TermPrefilter:
+    """명백히 매칭될 수 없는 토큰을 임베딩 모델 호출 전에 제외
+
+    - 길이: min_length 미만 또는 max_length 초과
+    - 문자 종류: 한글/영문자가 없는 토큰 (숫자, 기호)
+    - 모델 코드: 영문과 숫자가 섞인 코드형 토큰 (예: SM-G991N, 27GL850)
+    - 불용어: 조사, 수식어 등
+    - 문자 n-gram: 카테고리 변형어와 공유하는 n-gram이 min_shared_ngrams 미만
+
+    활성화 여부와 n-gram 설정의 기본값은 ProcureMateSettings.NORMALIZATION_PREFILTER_*
+    """
+
+    MODEL_CODE_PATTERN = re.compile(r'^(?=.*\d)(?=.*[A-Za-z])[A-Za-z0-9\-_./]+$')
+    LETTER_PATTERN = re.compile(r'[A-Za-z가-힣ㄱ-ㆎ]')
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ngram_size: Optional[int] = None,
+        min_shared_ngrams: Optional[int] = None,
+        min_length: int = 1,
+        max_length: int = 30,
+        stopwords: Optional[Iterable[str]] = None,
+        reject_model_codes: bool = True
+    ):
+        self.enabled = ProcureMateSettings.NORMALIZATION_PREFILTER_ENABLED if enabled is None else enabled
+        self.ngram_size = ngram_size or ProcureMateSettings.NORMALIZATION_PREFILTER_NGRAM_SIZE
+        self.min_shared_ngrams = ProcureMateSettings.NORMALIZATION_PREFILTER_MIN_SHARED if min_shared_ngrams is None else min_shared_ngrams
+        self.min_length = min_length
+        self.max_length = max_length
+        self.stopwords: Set[str] = set(DEFAULT_STOPWORDS if stopwords is None else stopwords)
+        self.reject_model_codes = reject_model_codes
+
+        self._ngrams: Dict[str, Set[str]] = {}
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """카운터 초기화"""
+        self.stats = {
+            "checked": 0,
+            "passed": 0,
+            "rejected_length": 0,
+            "rejected_script": 0,
+            "rejected_model_code": 0,
+            "rejected_stopword": 0,
+            "rejected_ngram": 0
+        }
+
+    def has_category(self, category: str) -> bool:
+        return category in self._ngrams
+
+    def index_category(self, category: str, terms: Iterable[str]):
+        """카테고리 변형어 n-gram 색인 생성"""
+        ngrams: Set[str] = set()
+        for term in terms:
+            ngrams.update(self._term_ngrams(term))
+            # n보다 짧은 토큰은 글자 단위로 비교
+            ngrams.update(term.lower())
+        self._ngrams[category] = ngrams
+
+    def invalidate(self, category: Optional[str] = None):
+        """규칙 변경 시 색인 무효화"""
+        if category is None:
+            self._ngrams.clear()
+        else:
+            self._ngrams.pop(category, None)
+
+    def accepts(self, term: str, category: str) -> bool:
+        """임베딩 매칭 단계로 보낼 토큰인지 판정"""
+        return bool(self.accepted_categories(term, [category]))
+
+    def accepted_categories(self, term: str, categories: Iterable[str]) -> List[str]:
+        """토큰이 임베딩 매칭 대상이 되는 카테고리 목록 (통계는 카테고리 수와 무관하게 토큰당 한 번 집계)"""
+        categories = list(categories)
+        if not self.enabled or not categories:
+            return categories
+
+        self.stats["checked"] += 1
+        reason = self._reject_reason(term)
+        accepted = [] if reason else [category for category in categories if self._shares_ngrams(term, category)]
+        if not accepted:
+            self.stats[f"rejected_{reason or 'ngram'}"] += 1
+            return []
+
+        self.stats["passed"] += 1
+        return accepted
+
+    def filter_terms(self, terms: List[str], category: str) -> List[str]:
+        """임베딩 매칭 대상 토큰만 반환"""
+        return [term for term in terms if self.accepts(term, category)]
+
+    def get_stats(self) -> Dict[str, float]:
+        """필터 통계 (토큰 단위, passed = 임베딩 단계 도달 토큰 수)"""
+        stats = dict(self.stats)
+        stats["pass_rate"] = stats["passed"] / stats["checked"] if stats["checked"] else 0.0
+        return stats
+
+    def _reject_reason(self, term: str) -> Optional[str]:
+        """카테고리와 무관한 제외 사유 (통과 시 None)"""
+        stripped = term.strip()
+        if not (self.min_length <= len(stripped) <= self.max_length):
+            return "length"
+
+        if not self.LETTER_PATTERN.search(stripped):
+            return "script"
+
+        if self.reject_model_codes and self.MODEL_CODE_PATTERN.match(stripped):
+            return "model_code"
+
+        if stripped in self.stopwords:
+            return "stopword"
+
+        return None
+
+    def _shares_ngrams(self, term: str, category: str) -> bool:
+        """카테고리 변형어와 min_shared_ngrams개 이상 n-gram 공유 여부 (색인 없는 카테고리는 통과)"""
+        category_ngrams = self._ngrams.get(category)
+        if category_ngrams is None:
+            return True
+        return len(self._term_ngrams(term.strip()) & category_ngrams) >= self.min_shared_ngrams
+
+    def _term_ngrams(self, term: str) -> Set[str]:
+        """소문자 문자 n-gram (n보다 짧은 용어는 용어 자체)"""
+        term = term.lower()
+        if len(term) <= self.ngram_size:
+            return {term}
+        return {term[i:i + self.ngram_size] for i in range(len(term) - self.ngram_size + 1)}
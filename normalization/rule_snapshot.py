@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+컴파일된 정규화 규칙 스냅샷 - 색인/변형어 임베딩 행렬을 한 번에 로드
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+class RuleSnapshot:
+    """정규화 규칙 스냅샷 저장소
+
+    디렉토리 구성 (key는 정규화기별 구분자, 예: brands/colors/units):
+    - {key}.CURRENT: 현재 스냅샷 디렉토리 이름 (os.replace로 원자적 교체)
+    - {key}.<생성시각>.<pid>/manifest.json: 포맷 버전, 키, 규칙 파일 해시, 임베딩 백엔드, 색인 옵션, 행렬 파일 목록
+    - {key}.<생성시각>.<pid>/index.json: 규칙, 정확 매칭 색인, 변형어 목록 (JSON만 사용, 오토마톤은 로드 후 재생성)
+    - {key}.<생성시각>.<pid>/matrix_XXX.npy: 카테고리별 L2 정규화 변형어 임베딩
+      (allow_pickle 없이 mmap_mode='r'로 로드, 워커 간 페이지 캐시 공유)
+
+    규칙 파일 해시나 임베딩 백엔드가 다르면 스냅샷을 사용하지 않는다.
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, path: str, key: str = "default"):
+        self.path = Path(path)
+        self.key = key
+
+    @staticmethod
+    def hash_rules_text(text: str) -> str:
+        """규칙 파일 내용 해시"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def current_dir(self) -> Optional[Path]:
+        """CURRENT 포인터가 가리키는 스냅샷 디렉토리"""
+        try:
+            with open(self.path / f"{self.key}.CURRENT", 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return self.path / name if name else None
+
+    def load(self, rules_hash: str, backend_id: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """유효한 스냅샷 로드 (없거나 버전이 다르면 None)"""
+        snapshot_dir = self.current_dir()
+        if snapshot_dir is None:
+            return None
+
+        try:
+            with open(snapshot_dir / "manifest.json", 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if (
+            manifest.get('format_version') != self.FORMAT_VERSION
+            or manifest.get('key') != self.key
+            or manifest.get('rules_hash') != rules_hash
+            or manifest.get('backend_id') != backend_id
+            or manifest.get('options') != options
+        ):
+            logger.info("규칙 스냅샷 버전 불일치, 재구성 필요")
+            return None
+
+        try:
+            with open(snapshot_dir / "index.json", 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+
+            payload['variant_matrices'] = {
+                category: np.load(snapshot_dir / filename, mmap_mode='r', allow_pickle=False)
+                for category, filename in manifest['matrices'].items()
+            }
+        except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+            logger.warning(f"규칙 스냅샷 로드 실패: {str(e)}")
+            return None
+
+        logger.info(f"규칙 스냅샷 로드: {len(payload['rules'])} 카테고리, 행렬 {len(payload['variant_matrices'])}개")
+        return payload
+
+    def save(
+        self,
+        payload: Dict[str, Any],
+        variant_matrices: Dict[str, np.ndarray],
+        rules_hash: str,
+        backend_id: str,
+        options: Dict[str, Any]
+    ):
+        """스냅샷 저장 (새 디렉토리 작성 후 CURRENT 포인터 교체)
+
+        payload는 JSON 직렬화 가능한 값(규칙 dict, 색인, 변형어 목록)만 포함해야 한다.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        name = f"{self.key}.{time.time_ns()}.{os.getpid()}"
+        tmp_dir = self.path / f".{name}.tmp"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        matrices = {}
+        for idx, (category, matrix) in enumerate(variant_matrices.items()):
+            filename = f"matrix_{idx:03d}.npy"
+            np.save(tmp_dir / filename, np.ascontiguousarray(matrix, dtype=np.float32), allow_pickle=False)
+            matrices[category] = filename
+
+        with open(tmp_dir / "index.json", 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+        with open(tmp_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'format_version': self.FORMAT_VERSION,
+                'key': self.key,
+                'rules_hash': rules_hash,
+                'backend_id': backend_id,
+                'options': options,
+                'matrices': matrices
+            }, f, ensure_ascii=False)
+
+        # 완성된 디렉토리를 공개한 뒤 포인터만 교체 (이미 매핑한 워커는 이전 파일을 계속 사용)
+        previous = self.current_dir()
+        os.rename(tmp_dir, self.path / name)
+        self._write_current(name)
+        if previous is not None and previous.name != name:
+            shutil.rmtree(previous, ignore_errors=True)
+
+        logger.info(f"규칙 스냅샷 저장: {self.path / name}")
+
+    def _write_current(self, name: str):
+        """CURRENT 포인터 원자적 교체"""
+        tmp_path = self.path / f".{self.key}.CURRENT.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path / f"{self.key}.CURRENT")
@@ -4,14 +4,32 @@
 """
 
 import json
+import os
+import time
 import asyncio
-from typing import Dict, List, Optional, Set
+import atexit
+import unicodedata
+import weakref
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from .embedding_engine import EmbeddingNormalizationEngine
-from utils import get_logger
+from .prefilter import TermPrefilter
+from .rule_snapshot import RuleSnapshot
+from utils import get_logger, MultiPatternMatcher, BoundedLRUCache
 
 logger = get_logger(__name__)
 
+# 지연 저장 대기 중인 매핑 시스템 (종료 시 flush_pending_rules로 저장)
+_pending_systems: "weakref.WeakSet[SimilarityMappingSystem]" = weakref.WeakSet()
+
+def flush_pending_rules():
+    """저장 대기 중인 모든 매핑 시스템의 규칙을 동기 저장 (앱 종료 훅/atexit에서 호출)"""
+    for system in list(_pending_systems):
+        system.flush_sync()
+
+atexit.register(flush_pending_rules)
+
 @dataclass
 class NormalizationRule:
     """정규화 규칙"""
@@ -30,11 +48,52 @@ class NormalizationRule:
 class SimilarityMappingSystem:
     """임베딩 기반 유사어 매핑"""
     
-    def __init__(self, rules_file: str = "normalization_rules.json"):
+    def __init__(
+        self,
+        rules_file: str = "normalization_rules.json",
+        fold_case: bool = False,
+        save_debounce_seconds: float = 1.0,
+        cache_size: int = 50000,
+        prefilter: Optional[TermPrefilter] = None,
+        snapshot_dir: Optional[str] = None,
+        snapshot_key: str = "default",
+        use_snapshot: bool = True,
+        prefilter_enabled: Optional[bool] = None
+    ):
         self.engine = EmbeddingNormalizationEngine()
         self.rules_file = rules_file
+        self.fold_case = fold_case
+        
+        # 컴파일된 규칙 스냅샷 (규칙 파일 해시 + 임베딩 백엔드로 버전 관리, 정규화기별 snapshot_key로 구분)
+        self.snapshot = RuleSnapshot(snapshot_dir or f"{rules_file}.snapshot", snapshot_key) if use_snapshot else None
+        self._snapshot_hash: Optional[str] = None
+        
+        # 변경 시 즉시 저장하지 않고 마지막 변경 후 일정 시간 뒤 한 번만 저장
+        self.save_debounce_seconds = save_debounce_seconds
+        self._dirty = False
+        self._last_change = 0.0
+        self._save_task: Optional[asyncio.Task] = None
         self.rules: Dict[str, List[NormalizationRule]] = {}
         self.standard_terms: Dict[str, Set[str]] = {}
+        
+        # 정확 매칭 색인 (NFC 정규화 키 -> 표준 용어), self.rules와 함께 갱신
+        self.exact_index: Dict[str, Dict[str, str]] = {}
+        self.global_exact_index: Dict[str, str] = {}
+        
+        # 카테고리별 텍스트 내 치환용 오토마톤 (규칙 변경 시 재생성)
+        self._matchers: Dict[str, MultiPatternMatcher] = {}
+        
+        # (용어, 카테고리) -> 정규화 결과 메모 (미매칭 결과 포함, 규칙 변경 시 무효화)
+        self.term_cache = BoundedLRUCache(cache_size)
+        
+        # 임베딩 매칭 전 어휘 기반 사전 필터 (prefilter_enabled 미지정 시 NORMALIZATION_PREFILTER_ENABLED)
+        self.prefilter = prefilter or TermPrefilter(enabled=prefilter_enabled)
+        
+        # 카테고리별 변형어 임베딩 행렬 (행 단위 L2 정규화, 지연 생성)
+        self.variant_terms: Dict[str, List[str]] = {}
+        self.variant_standards: Dict[str, List[str]] = {}
+        self.variant_matrices: Dict[str, np.ndarray] = {}
+        self._pending_variants: Dict[str, List[Tuple[str, str]]] = {}
     
     async def initialize(self):
         """시스템 초기화"""
@@ -46,8 +105,14 @@ class SimilarityMappingSystem:
         """규칙 파일 로드"""
         try:
             with open(self.rules_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                raw = f.read()
+            
+            # 스냅샷이 유효하면 JSON 파싱과 변형어 임베딩 생략
+            if self._load_snapshot(RuleSnapshot.hash_rules_text(raw)):
+                return
             
+            data = json.loads(raw)
+            self._reset_variant_matrices()
             for category, rules_data in data.items():
                 self.rules[category] = [NormalizationRule.from_dict(rule) for rule in rules_data]
                 self.standard_terms[category] = set()
@@ -55,6 +120,7 @@ class SimilarityMappingSystem:
                 for rule in self.rules[category]:
                     self.standard_terms[category].add(rule.standard_term)
             
+            self._rebuild_exact_index()
             logger.info(f"규칙 로드 완료: {len(self.rules)} 카테고리")
             
         except FileNotFoundError:
@@ -110,70 +176,403 @@ class SimilarityMappingSystem:
         
         self.rules = {}
         self.standard_terms = {}
+        self._reset_variant_matrices()
         
         for category, rules_data in default_rules.items():
             self.rules[category] = [NormalizationRule.from_dict(rule) for rule in rules_data]
             self.standard_terms[category] = {rule["standard_term"] for rule in rules_data}
         
+        self._rebuild_exact_index()
         await self.save_rules()
     
-    async def save_rules(self):
-        """규칙 저장"""
+    def _serialize_rules(self) -> str:
+        """규칙 파일 내용 직렬화"""
         data = {}
         for category, rules in self.rules.items():
             data[category] = [rule.to_dict() for rule in rules]
-        
-        with open(self.rules_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    
+    async def save_rules(self):
+        """규칙 저장 (임시 파일 작성 후 rename으로 원자적 교체)"""
+        self._save_rules_sync()
+    
+    def _save_rules_sync(self):
+        """규칙 파일 동기 저장 (save_rules 본체)"""
+        tmp_path = f"{self.rules_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self._serialize_rules())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.rules_file)
+        self._dirty = False
+        _pending_systems.discard(self)
         
         logger.info("규칙 저장 완료")
     
+    async def flush(self):
+        """저장 대기 중인 변경 사항 즉시 저장"""
+        if self._dirty:
+            await self.save_rules()
+    
+    def flush_sync(self):
+        """저장 대기 중인 변경 사항 동기 저장 (이벤트 루프 밖, 종료 시점용)"""
+        if self._dirty:
+            self._save_rules_sync()
+    
+    def _mark_dirty(self):
+        """변경 표시 및 지연 저장 예약 (실행 중인 이벤트 루프가 없으면 즉시 동기 저장)"""
+        self._dirty = True
+        self._last_change = time.monotonic()
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_rules_sync()
+            return
+        
+        # 지연 저장 전에 프로세스가 종료되어도 flush_pending_rules에서 저장
+        _pending_systems.add(self)
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._debounced_save())
+    
+    async def _debounced_save(self):
+        """마지막 변경 후 save_debounce_seconds 동안 추가 변경이 없으면 저장"""
+        while True:
+            remaining = self._last_change + self.save_debounce_seconds - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+        await self.flush()
+    
+    async def save_snapshot(self, force: bool = False) -> bool:
+        """현재 규칙의 컴파일 스냅샷 저장 (색인/변형어 행렬 포함, 변경 없으면 생략)"""
+        if self.snapshot is None:
+            return False
+        
+        rules_hash = RuleSnapshot.hash_rules_text(self._serialize_rules())
+        if rules_hash == self._snapshot_hash and not force:
+            return False
+        
+        for category in self.rules:
+            await self._get_variant_matrix(category)
+        
+        # JSON 값만 저장 (로드 시 임의 코드 실행 없음, 오토마톤은 로드 후 지연 재생성)
+        payload = {
+            'rules': {category: [rule.to_dict() for rule in rules] for category, rules in self.rules.items()},
+            'exact_index': self.exact_index,
+            'global_exact_index': self.global_exact_index,
+            'variant_terms': self.variant_terms,
+            'variant_standards': self.variant_standards
+        }
+        self.snapshot.save(payload, self.variant_matrices, rules_hash, self.engine.backend_id, self._snapshot_options())
+        self._snapshot_hash = rules_hash
+        return True
+    
+    def _load_snapshot(self, rules_hash: str) -> bool:
+        """스냅샷으로 규칙/색인/행렬 복원"""
+        if self.snapshot is None:
+            return False
+        
+        payload = self.snapshot.load(rules_hash, self.engine.backend_id, self._snapshot_options())
+        if payload is None:
+            return False
+        
+        self._reset_variant_matrices()
+        self.rules = {
+            category: [NormalizationRule.from_dict(rule) for rule in rules]
+            for category, rules in payload['rules'].items()
+        }
+        self.standard_terms = {
+            category: {rule.standard_term for rule in rules} for category, rules in self.rules.items()
+        }
+        self.exact_index = payload['exact_index']
+        self.global_exact_index = payload['global_exact_index']
+        self._matchers = {}
+        self.variant_terms = payload['variant_terms']
+        self.variant_standards = payload['variant_standards']
+        self.variant_matrices = payload['variant_matrices']
+        self.prefilter.invalidate()
+        self.term_cache.clear()
+        self._snapshot_hash = rules_hash
+        return True
+    
+    def _snapshot_options(self) -> Dict:
+        """스냅샷 호환성에 영향을 주는 색인 옵션"""
+        return {"fold_case": self.fold_case}
+    
     async def normalize_term(self, term: str, category: Optional[str] = None) -> str:
         """용어 정규화"""
         if not term.strip():
             return term
         
-        categories_to_check = [category] if category else self.rules.keys()
+        cached = self.term_cache.get((term, category))
+        if cached is not None:
+            return cached
         
-        for cat in categories_to_check:
-            if cat not in self.rules:
-                continue
-            
-            # 정확한 매칭 우선
-            for rule in self.rules[cat]:
-                if term in rule.variants or term == rule.standard_term:
-                    return rule.standard_term
+        normalized = await self._resolve_term(term, category)
+        self.term_cache.put((term, category), normalized)
+        return normalized
+    
+    async def _resolve_term(self, term: str, category: Optional[str]) -> str:
+        """캐시 없이 용어 정규화"""
+        # 정확한 매칭 우선 (해시 조회)
+        exact_match = self.find_exact_match(term, category)
+        if exact_match is not None:
+            return exact_match
+        
+        categories_to_check = [cat for cat in ([category] if category else self.rules.keys()) if cat in self.rules]
+        query_embedding = None
+        
+        for cat in self._prefilter_categories(term, categories_to_check):
             
-            # 임베딩 기반 유사도 매칭
-            best_match = await self._find_best_embedding_match(term, cat)
+            # 임베딩 기반 유사도 매칭 (쿼리 임베딩은 한 번만 계산)
+            if query_embedding is None:
+                query_embedding = await self._embed_query(term)
+            best_match = await self._find_best_embedding_match(term, cat, query_embedding)
             if best_match:
                 return best_match
         
         return term
     
-    async def _find_best_embedding_match(self, term: str, category: str) -> Optional[str]:
-        """임베딩 기반 최적 매칭"""
-        if category not in self.rules:
-            return None
+    async def normalize_terms(self, terms: List[str], category: Optional[str] = None) -> Dict[str, str]:
+        """용어 일괄 정규화 (중복 제거 후 정확 매칭, 나머지는 카테고리별 한 번의 배치 임베딩)"""
+        result: Dict[str, str] = {}
+        unknown: List[str] = []
         
-        all_variants = []
-        variant_to_standard = {}
+        for term in dict.fromkeys(terms):
+            if not term.strip():
+                result[term] = term
+                continue
+            cached = self.term_cache.get((term, category))
+            if cached is not None:
+                result[term] = cached
+                continue
+            exact_match = self.find_exact_match(term, category)
+            if exact_match is not None:
+                result[term] = exact_match
+            else:
+                unknown.append(term)
         
-        for rule in self.rules[category]:
-            for variant in rule.variants + [rule.standard_term]:
-                all_variants.append(variant)
-                variant_to_standard[variant] = rule.standard_term
+        # 사전 필터를 통과한 토큰만 임베딩
+        categories_to_check = [cat for cat in ([category] if category else list(self.rules.keys())) if cat in self.rules]
+        candidates: Dict[str, List[int]] = {cat: [] for cat in categories_to_check}
+        for row, term in enumerate(unknown):
+            for cat in self._prefilter_categories(term, categories_to_check):
+                candidates[cat].append(row)
+        embed_rows = sorted({row for rows in candidates.values() for row in rows})
         
-        similar_terms = await self.engine.find_similar_terms(term, all_variants)
+        if embed_rows:
+            row_embeddings = self._normalize_rows(
+                await self.engine.get_embeddings([unknown[row] for row in embed_rows])
+            )
+            embeddings = np.zeros((len(unknown), row_embeddings.shape[1]), dtype=np.float32)
+            embeddings[embed_rows] = row_embeddings
+            resolved: Set[int] = set()
+            
+            for cat in categories_to_check:
+                rows = np.array([row for row in candidates[cat] if row not in resolved], dtype=np.int64)
+                if not len(rows):
+                    continue
+                matrix = await self._get_variant_matrix(cat)
+                if matrix is None:
+                    continue
+                
+                similarities = embeddings[rows] @ matrix.T
+                best_indices = similarities.argmax(axis=1)
+                best_scores = similarities[np.arange(len(rows)), best_indices]
+                
+                matched = best_scores >= self.engine.threshold
+                for row, variant_idx in zip(rows[matched], best_indices[matched]):
+                    result[unknown[row]] = self.variant_standards[cat][variant_idx]
+                    resolved.add(int(row))
+        
+        for term in unknown:
+            result.setdefault(term, term)
+        
+        for term, normalized in result.items():
+            if term.strip() and (term, category) not in self.term_cache:
+                self.term_cache.put((term, category), normalized)
+        
+        return result
+    
+    def get_cache_stats(self) -> Dict:
+        """정규화 메모 캐시 통계"""
+        return self.term_cache.get_stats()
+    
+    def get_prefilter_stats(self) -> Dict:
+        """사전 필터 통계 (passed = 임베딩 단계 도달 토큰 수)"""
+        return self.prefilter.get_stats()
+    
+    def _prefilter_categories(self, term: str, categories: List[str]) -> List[str]:
+        """사전 필터를 통과한 카테고리 목록 (카테고리 n-gram 색인은 지연 생성, 통계는 토큰당 한 번)"""
+        for category in categories:
+            if not self.prefilter.has_category(category):
+                self.prefilter.index_category(category, [
+                    variant for rule in self.rules.get(category, []) for variant in rule.variants + [rule.standard_term]
+                ])
+        return self.prefilter.accepted_categories(term, categories)
+    
+    def find_exact_match(self, term: str, category: Optional[str] = None) -> Optional[str]:
+        """변형어/표준 용어 정확 매칭 (카테고리 미지정 시 전체 색인 조회)"""
+        key = self._index_key(term)
+        if category is None:
+            return self.global_exact_index.get(key)
+        return self.exact_index.get(category, {}).get(key)
+    
+    def _index_key(self, term: str) -> str:
+        """색인 키 (NFC 정규화, fold_case 설정 시 대소문자 통일)"""
+        key = unicodedata.normalize('NFC', term)
+        return key.casefold() if self.fold_case else key
+    
+    def _index_term(self, category: str, term: str, standard_term: str):
+        """정확 매칭 색인에 용어 등록 (먼저 등록된 규칙 우선, 파생 색인 무효화는 호출자가 일괄 처리)"""
+        key = self._index_key(term)
+        self.exact_index.setdefault(category, {}).setdefault(key, standard_term)
+        self.global_exact_index.setdefault(key, standard_term)
+    
+    def _invalidate_category(self, category: str):
+        """규칙 변경 후 카테고리 치환기/사전 필터/정규화 메모 무효화 (변경 일괄 반영 후 한 번 호출)"""
+        self._matchers.pop(category, None)
+        self.prefilter.invalidate(category)
+        self.term_cache.clear()
+    
+    def get_matcher(self, category: str) -> MultiPatternMatcher:
+        """카테고리 변형어 전체를 컴파일한 다중 패턴 치환기"""
+        if category not in self._matchers:
+            matcher = MultiPatternMatcher()
+            for rule in self.rules.get(category, []):
+                for variant in rule.variants + [rule.standard_term]:
+                    matcher.add(variant, rule.standard_term, case_sensitive=not self.fold_case)
+            self._matchers[category] = matcher
+            logger.debug(f"치환 오토마톤 생성: {category} {len(matcher)}개 패턴")
+        return self._matchers[category]
+    
+    def _rebuild_exact_index(self):
+        """규칙 전체로 정확 매칭 색인 재구성"""
+        self.exact_index = {}
+        self.global_exact_index = {}
+        self._matchers.clear()
+        self.prefilter.invalidate()
+        self.term_cache.clear()
+        for category, rules in self.rules.items():
+            self.exact_index[category] = {}
+            for rule in rules:
+                for variant in rule.variants + [rule.standard_term]:
+                    self._index_term(category, variant, rule.standard_term)
+    
+    async def _find_best_embedding_match(
+        self,
+        term: str,
+        category: str,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> Optional[str]:
+        """임베딩 기반 최적 매칭 (캐시된 변형어 행렬과 행렬-벡터 곱 한 번)"""
+        matrix = await self._get_variant_matrix(category)
+        if matrix is None:
+            return None
         
-        if similar_terms and similar_terms[0][1] >= self.engine.threshold:
-            best_variant = similar_terms[0][0]
-            return variant_to_standard[best_variant]
+        if query_embedding is None:
+            query_embedding = await self._embed_query(term)
+        
+        similarities = matrix @ query_embedding
+        best_idx = int(np.argmax(similarities))
+        
+        if similarities[best_idx] >= self.engine.threshold:
+            return self.variant_standards[category][best_idx]
         
         return None
     
+    async def _embed_query(self, term: str) -> np.ndarray:
+        """쿼리 용어 임베딩 (L2 정규화)"""
+        embeddings = await self.engine.get_embeddings([term])
+        return self._normalize_rows(embeddings)[0]
+    
+    async def _get_variant_matrix(self, category: str) -> Optional[np.ndarray]:
+        """카테고리 변형어 행렬 조회 (최초 조회 시 생성, 이후 추가분만 임베딩)"""
+        if category not in self.rules:
+            return None
+        
+        if category not in self.variant_matrices:
+            terms, standards = [], []
+            for rule in self.rules[category]:
+                for variant in rule.variants + [rule.standard_term]:
+                    terms.append(variant)
+                    standards.append(rule.standard_term)
+            
+            self._pending_variants.pop(category, None)
+            if not terms:
+                return None
+            
+            embeddings = await self.engine.get_embeddings(terms)
+            self.variant_terms[category] = terms
+            self.variant_standards[category] = standards
+            self.variant_matrices[category] = self._normalize_rows(embeddings)
+            logger.debug(f"변형어 행렬 생성: {category} {len(terms)}개")
+        
+        pending = self._pending_variants.pop(category, None)
+        if pending:
+            embeddings = await self.engine.get_embeddings([variant for variant, _ in pending])
+            self.variant_matrices[category] = np.vstack([
+                self.variant_matrices[category], self._normalize_rows(embeddings)
+            ])
+            self.variant_terms[category].extend(variant for variant, _ in pending)
+            self.variant_standards[category].extend(standard for _, standard in pending)
+            logger.debug(f"변형어 행렬 갱신: {category} +{len(pending)}개")
+        
+        return self.variant_matrices[category]
+    
+    def _queue_variant(self, category: str, variant: str, standard_term: str):
+        """생성된 행렬에 반영할 신규 변형어 등록 (다음 조회 시 일괄 임베딩)"""
+        if category in self.variant_matrices:
+            self._pending_variants.setdefault(category, []).append((variant, standard_term))
+    
+    def _reset_variant_matrices(self):
+        """변형어 행렬 전체 무효화 (규칙 재로드 시)"""
+        self.variant_terms.clear()
+        self.variant_standards.clear()
+        self.variant_matrices.clear()
+        self._pending_variants.clear()
+    
+    @staticmethod
+    def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+        """행 단위 L2 정규화"""
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+    
     async def add_new_variant(self, standard_term: str, new_variant: str, category: str, confidence: float = 0.8):
-        """새로운 변형 추가"""
+        """새로운 변형 추가 (저장은 지연 일괄 처리)"""
+        if self._merge_variant(standard_term, new_variant, category, confidence):
+            self._invalidate_category(category)
+            self._mark_dirty()
+            logger.info(f"변형 추가: {new_variant} -> {standard_term}")
+    
+    async def add_variants_bulk(
+        self,
+        mappings: Dict[str, List[str]],
+        category: str,
+        confidence: float = 0.8,
+        persist: bool = True
+    ) -> int:
+        """표준 용어별 변형어 일괄 등록 (메모리에서 병합 후 한 번만 저장)"""
+        added = 0
+        for standard_term, variants in mappings.items():
+            for variant in variants:
+                if self._merge_variant(standard_term, variant, category, confidence):
+                    added += 1
+        
+        if added:
+            self._invalidate_category(category)
+            self._mark_dirty()
+            if persist:
+                await self.flush()
+        
+        logger.info(f"변형어 일괄 등록: {category} {added}개 추가")
+        return added
+    
+    def _merge_variant(self, standard_term: str, new_variant: str, category: str, confidence: float) -> bool:
+        """규칙/색인/변형어 행렬에 변형어 병합 (추가되었으면 True, 무효화는 호출자가 일괄 처리)"""
         if category not in self.rules:
             self.rules[category] = []
             self.standard_terms[category] = set()
@@ -181,11 +580,12 @@ class SimilarityMappingSystem:
         # 기존 규칙에 추가
         for rule in self.rules[category]:
             if rule.standard_term == standard_term:
-                if new_variant not in rule.variants:
-                    rule.variants.append(new_variant)
-                    await self.save_rules()
-                    logger.info(f"변형 추가: {new_variant} -> {standard_term}")
-                return
+                if new_variant in rule.variants:
+                    return False
+                rule.variants.append(new_variant)
+                self._index_term(category, new_variant, standard_term)
+                self._queue_variant(category, new_variant, standard_term)
+                return True
         
         # 새 규칙 생성
         new_rule = NormalizationRule(
@@ -196,35 +596,36 @@ class SimilarityMappingSystem:
         )
         self.rules[category].append(new_rule)
         self.standard_terms[category].add(standard_term)
-        await self.save_rules()
-        logger.info(f"새 규칙 생성: {new_variant} -> {standard_term}")
+        self._index_term(category, new_variant, standard_term)
+        self._index_term(category, standard_term, standard_term)
+        self._queue_variant(category, new_variant, standard_term)
+        self._queue_variant(category, standard_term, standard_term)
+        return True
     
     async def suggest_normalization(self, term: str, category: Optional[str] = None) -> List[Dict]:
         """정규화 제안"""
         suggestions = []
         categories_to_check = [category] if category else self.rules.keys()
+        query_embedding = await self._embed_query(term)
         
         for cat in categories_to_check:
-            if cat not in self.rules:
+            matrix = await self._get_variant_matrix(cat)
+            if matrix is None:
                 continue
             
-            all_variants = []
-            for rule in self.rules[cat]:
-                all_variants.extend(rule.variants + [rule.standard_term])
-            
-            similar_terms = await self.engine.find_similar_terms(term, all_variants)
+            similarities = matrix @ query_embedding
+            top_indices = np.argsort(-similarities)[:3]
             
-            for similar_term, similarity in similar_terms[:3]:
-                # 해당 변형이 속한 표준 용어 찾기
-                for rule in self.rules[cat]:
-                    if similar_term in rule.variants or similar_term == rule.standard_term:
-                        suggestions.append({
-                            "original": term,
-                            "suggested": rule.standard_term,
-                            "category": cat,
-                            "similarity": similarity,
-                            "matched_variant": similar_term
-                        })
-                        break
+            for idx in top_indices:
+                similarity = float(similarities[idx])
+                if similarity < self.engine.threshold:
+                    break
+                suggestions.append({
+                    "original": term,
+                    "suggested": self.variant_standards[cat][idx],
+                    "category": cat,
+                    "similarity": similarity,
+                    "matched_variant": self.variant_terms[cat][idx]
+                })
         
         return sorted(suggestions, key=lambda x: x["similarity"], reverse=True)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+동기 텍스트 임베딩 백엔드 - EMBEDDING_BACKEND 설정에 맞는 encode(texts) 구현 생성
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .hashing_embedder import HashingEmbedder
+from config import ProcureMateSettings
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+class TransformerEmbedder:
+    """sentence-transformers 모델 임베딩 (처음 encode할 때 모델 로드, 결과는 행 단위 L2 정규화)
+
+    변환 스레드/프로세스 안에서 바로 호출할 수 있도록 동기 encode만 제공한다.
+    sentence-transformers가 설치되지 않았으면 다른 임베딩 엔진과 같이 해싱 임베딩으로 대체한다.
+    """
+
+    def __init__(self, model_name: str = "jhgan/ko-sroberta-multitask", device: str = "cpu"):
+        self.model_name = model_name
+        self.device = device
+        self.model = None
+        self.fallback: Optional[HashingEmbedder] = None
+
+    @property
+    def backend_id(self) -> str:
+        """임베딩 결과를 구분하는 백엔드 식별자"""
+        self._load()
+        return self.fallback.backend_id if self.fallback else self.model_name
+
+    @property
+    def dim(self) -> int:
+        self._load()
+        return self.fallback.dim if self.fallback else self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 배치 임베딩 (n x dim, float32)"""
+        self._load()
+        if self.fallback:
+            return self.fallback.encode(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self.model.encode(
+            list(texts), convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False
+        ).astype(np.float32)
+
+    def _load(self):
+        if self.model is not None or self.fallback is not None:
+            return
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            self.fallback = HashingEmbedder(dim=ProcureMateSettings.EMBEDDING_HASH_DIM)
+            logger.warning(f"sentence-transformers 없음, 해싱 임베딩으로 대체: {self.fallback.backend_id}")
+            return
+        self.model = SentenceTransformer(self.model_name)
+        self.model.to(self.device)
+        logger.info(f"텍스트 임베딩 모델 로드 완료: {self.model_name}")
+
+def create_text_embedder(backend: Optional[str] = None):
+    """설정된 임베딩 백엔드의 동기 임베딩 객체 (hashing이면 EMBEDDING_HASH_DIM 차원 해싱 임베딩)"""
+    backend = (backend or ProcureMateSettings.EMBEDDING_BACKEND).lower()
+    if backend == "hashing":
+        return HashingEmbedder(dim=ProcureMateSettings.EMBEDDING_HASH_DIM)
+    return TransformerEmbedder()
@@ -15,10 +15,11 @@ logger = get_logger(__name__)
 class UnifiedTextProcessor:
     """통합 텍스트 전처리기"""
     
-    def __init__(self):
-        self.color_normalizer = ColorNormalizer()
-        self.brand_normalizer = BrandNormalizer()
-        self.unit_normalizer = UnitNormalizer()
+    def __init__(self, prefilter_enabled: Optional[bool] = None):
+        # prefilter_enabled 미지정 시 NORMALIZATION_PREFILTER_ENABLED 설정 사용
+        self.color_normalizer = ColorNormalizer(prefilter_enabled=prefilter_enabled)
+        self.brand_normalizer = BrandNormalizer(prefilter_enabled=prefilter_enabled)
+        self.unit_normalizer = UnitNormalizer(prefilter_enabled=prefilter_enabled)
         self.is_initialized = False
     
     async def initialize(self):
@@ -31,34 +32,55 @@ class UnifiedTextProcessor:
     
     async def process_text(self, text: str) -> Dict[str, str]:
         """텍스트 전체 처리"""
+        results = await self.process_texts([text])
+        return results[0]
+    
+    async def process_texts(self, texts: List[str]) -> List[Dict[str, str]]:
+        """텍스트 일괄 처리 (단계별로 배치 전체 토큰을 중복 제거 후 한 번에 정규화)"""
         if not self.is_initialized:
             await self.initialize()
         
-        if not text:
-            return {"original": "", "normalized": "", "searchable": ""}
-        
-        original = text.strip()
+        originals = [text.strip() if text else "" for text in texts]
         
         # 1. 기본 정규화
-        normalized = self._basic_normalize(original)
+        normalized = [self._basic_normalize(original) for original in originals]
         
-        # 2. 브랜드명 정규화
-        normalized = await self._normalize_brands_in_text(normalized)
+        # 2. 브랜드명 정규화 (등록된 변형어는 오토마톤 치환, 나머지 토큰만 임베딩 매칭)
+        brand_matcher = self.brand_normalizer.get_matcher()
+        normalized = [brand_matcher.replace(text) for text in normalized]
+        brand_mapping = await self.brand_normalizer.normalize_brands(self._collect_tokens(normalized))
+        normalized = [self._replace_tokens(text, brand_mapping) for text in normalized]
         
         # 3. 색상 정규화
-        normalized = await self._normalize_colors_in_text(normalized)
+        color_matcher = self.color_normalizer.get_matcher()
+        normalized = [color_matcher.replace(text) for text in normalized]
+        color_mapping = await self.color_normalizer.normalize_colors(self._collect_tokens(normalized))
+        normalized = [self._replace_tokens(text, color_mapping) for text in normalized]
         
-        # 4. 단위 정규화
-        normalized = await self.unit_normalizer.normalize_quantity_expression(normalized)
+        # 4. 단위 정규화 (텍스트마다 숫자+단위 표현을 정규식 한 번으로 치환)
+        normalized = await self.unit_normalizer.normalize_quantity_expressions(normalized)
         
         # 5. 검색용 텍스트 생성
-        searchable = self._create_searchable_text(normalized)
-        
-        return {
-            "original": original,
-            "normalized": normalized,
-            "searchable": searchable
-        }
+        results = []
+        for original, text in zip(originals, normalized):
+            if not original:
+                results.append({"original": "", "normalized": "", "searchable": ""})
+                continue
+            results.append({
+                "original": original,
+                "normalized": text,
+                "searchable": self._create_searchable_text(text)
+            })
+        
+        return results
+    
+    def _collect_tokens(self, texts: List[str]) -> List[str]:
+        """배치 전체의 고유 토큰"""
+        return list(dict.fromkeys(token for text in texts for token in text.split()))
+    
+    def _replace_tokens(self, text: str, mapping: Dict[str, str]) -> str:
+        """정규화된 토큰 치환 (공백 단위 토큰만 교체)"""
+        return ' '.join(mapping.get(token, token) for token in text.split())
     
     def _basic_normalize(self, text: str) -> str:
         """기본 정규화"""
@@ -75,24 +97,6 @@ class UnifiedTextProcessor:
         
         return text.strip()
     
-    async def _normalize_brands_in_text(self, text: str) -> str:
-        """텍스트 내 브랜드명 정규화"""
-        brands = await self.brand_normalizer.detect_brands_in_text(text)
-        
-        for brand_info in brands:
-            text = text.replace(brand_info["original"], brand_info["normalized"])
-        
-        return text
-    
-    async def _normalize_colors_in_text(self, text: str) -> str:
-        """텍스트 내 색상 정규화"""
-        colors = await self.color_normalizer.detect_colors_in_text(text)
-        
-        for color_info in colors:
-            text = text.replace(color_info["original"], color_info["normalized"])
-        
-        return text
-    
     def _create_searchable_text(self, text: str) -> str:
         """검색용 텍스트 생성"""
         # 한글, 영문, 숫자만 유지
@@ -103,6 +107,22 @@ class UnifiedTextProcessor:
         
         return searchable.strip().lower()
     
+    def get_cache_stats(self) -> Dict[str, Dict]:
+        """정규화기별 메모 캐시 통계"""
+        return {
+            "brands": self.brand_normalizer.mapping_system.get_cache_stats(),
+            "colors": self.color_normalizer.mapping_system.get_cache_stats(),
+            "units": self.unit_normalizer.mapping_system.get_cache_stats()
+        }
+    
+    def get_prefilter_stats(self) -> Dict[str, Dict]:
+        """정규화기별 사전 필터 통계 (임베딩 단계 도달 토큰 수 포함)"""
+        return {
+            "brands": self.brand_normalizer.mapping_system.get_prefilter_stats(),
+            "colors": self.color_normalizer.mapping_system.get_prefilter_stats(),
+            "units": self.unit_normalizer.mapping_system.get_prefilter_stats()
+        }
+    
     async def get_normalization_analysis(self, text: str) -> Dict:
         """정규화 분석 결과"""
         if not self.is_initialized:
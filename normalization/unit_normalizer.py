@@ -3,24 +3,31 @@
 단위 정규화 모듈
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import re
 from .similarity_mapping import SimilarityMappingSystem
-from utils import get_logger
+from utils import get_logger, MultiPatternMatcher
 
 logger = get_logger(__name__)
 
 class UnitNormalizer:
     """단위 정규화"""
     
-    def __init__(self):
-        self.mapping_system = SimilarityMappingSystem()
+    # 숫자+단위 패턴
+    UNIT_PATTERNS = [
+        re.compile(r'(\d+(?:\.\d+)?)\s*([a-zA-Z가-힣]+)'),
+        re.compile(r'(\d+(?:\.\d+)?)\s*([a-zA-Z가-힣"\']+)'),
+    ]
+    
+    def __init__(self, prefilter_enabled: Optional[bool] = None):
+        self.mapping_system = SimilarityMappingSystem(snapshot_key="units", prefilter_enabled=prefilter_enabled)
         self.is_initialized = False
     
     async def initialize(self):
         """초기화"""
         await self.mapping_system.initialize()
         await self._ensure_unit_rules()
+        await self.mapping_system.save_snapshot()
         self.is_initialized = True
         logger.info("단위 정규화 모듈 초기화 완료")
     
@@ -50,9 +57,11 @@ class UnitNormalizer:
             "피트": ["ft", "feet", "foot", "피트", "'"]
         }
         
-        for standard, variants in unit_mappings.items():
-            for variant in variants:
-                await self.mapping_system.add_new_variant(standard, variant, "units")
+        await self.mapping_system.add_variants_bulk(unit_mappings, "units")
+    
+    def get_matcher(self) -> MultiPatternMatcher:
+        """텍스트 내 단위 치환용 오토마톤"""
+        return self.mapping_system.get_matcher("units")
     
     async def normalize_unit(self, unit_text: str) -> str:
         """단위 정규화"""
@@ -66,47 +75,68 @@ class UnitNormalizer:
         if not self.is_initialized:
             await self.initialize()
         
-        detected_units = []
-        
-        # 숫자+단위 패턴 검색
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*([a-zA-Z가-힣]+)',
-            r'(\d+(?:\.\d+)?)\s*([a-zA-Z가-힣"\']+)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                number, unit = match.groups()
-                normalized_unit = await self.normalize_unit(unit)
-                
-                if normalized_unit != unit:
-                    detected_units.append({
-                        "original": f"{number}{unit}",
-                        "normalized": f"{number}{normalized_unit}",
-                        "number": number,
-                        "unit_original": unit,
-                        "unit_normalized": normalized_unit,
-                        "category": "unit"
-                    })
-        
-        return detected_units
+        candidates = self._find_unit_candidates(text)
+        units = {unit for _, unit in candidates}
+        mapping = {unit: await self.normalize_unit(unit) for unit in units}
+        return self._build_unit_detections(candidates, mapping)
     
     async def normalize_quantity_expression(self, text: str) -> str:
         """수량 표현 정규화"""
         if not self.is_initialized:
             await self.initialize()
         
-        normalized_text = text
-        units = await self.detect_units_in_text(text)
+        normalized_texts = await self.normalize_quantity_expressions([text])
+        return normalized_texts[0]
+    
+    async def normalize_quantity_expressions(self, texts: List[str]) -> List[str]:
+        """수량 표현 일괄 정규화 (전체 텍스트의 단위를 한 번에 정규화)"""
+        if not self.is_initialized:
+            await self.initialize()
+        
+        candidates_per_text = [self._find_unit_candidates(text) for text in texts]
+        units = [unit for candidates in candidates_per_text for _, unit in candidates]
+        mapping = await self.mapping_system.normalize_terms(units, "units")
         
-        for unit_info in units:
-            normalized_text = normalized_text.replace(
-                unit_info["original"], 
-                unit_info["normalized"]
-            )
+        return [self.replace_quantities(text, mapping) for text in texts]
+    
+    def replace_quantities(self, text: str, mapping: Dict[str, str]) -> str:
+        """숫자+단위 표현을 한 번의 정규식 치환으로 정규화 (치환 결과를 다시 검사하지 않음)"""
+        def replace(match: re.Match) -> str:
+            unit = match.group(2)
+            normalized_unit = mapping.get(unit, unit)
+            if normalized_unit == unit:
+                # 따옴표가 붙은 단위(예: 10kg")는 문자 부분만 정규화
+                letters = unit.rstrip('"\'')
+                if not letters or mapping.get(letters, letters) == letters:
+                    return match.group(0)
+                normalized_unit = mapping[letters] + unit[len(letters):]
+            return match.group(0)[:-len(unit)] + normalized_unit
         
-        return normalized_text
+        return self.UNIT_PATTERNS[-1].sub(replace, text)
+    
+    def _find_unit_candidates(self, text: str) -> List[Tuple[str, str]]:
+        """숫자+단위 패턴 검색"""
+        candidates = []
+        for pattern in self.UNIT_PATTERNS:
+            for match in pattern.finditer(text):
+                candidates.append(match.groups())
+        return candidates
+    
+    def _build_unit_detections(self, candidates: List[Tuple[str, str]], mapping: Dict[str, str]) -> List[Dict]:
+        """정규화 결과로 단위 감지 목록 생성 (변경된 단위만)"""
+        detected_units = []
+        for number, unit in candidates:
+            normalized_unit = mapping.get(unit, unit)
+            if normalized_unit != unit:
+                detected_units.append({
+                    "original": f"{number}{unit}",
+                    "normalized": f"{number}{normalized_unit}",
+                    "number": number,
+                    "unit_original": unit,
+                    "unit_normalized": normalized_unit,
+                    "category": "unit"
+                })
+        return detected_units
     
     async def suggest_unit_normalization(self, unit_text: str) -> List[Dict]:
         """단위 정규화 제안"""
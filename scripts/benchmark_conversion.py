@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+DataIntegrator 변환 벤치마크 - 항목별 변환 vs 일괄 변환 vs 프로세스 풀 일괄 변환
+
+사용법:
+    python scripts/benchmark_conversion.py --count 100000 --processes 4
+    python scripts/benchmark_conversion.py --count 20000 --source g2b
+
+프로세스 풀은 원본 항목을 워커로, 변환된 상품을 다시 부모로 피클링하므로 항목당
+피클링 왕복 비용도 함께 측정해 변환 비용 대비 비율과 CONVERT_CHUNK_SIZE 판단 근거로 출력한다.
+"""
+
+import argparse
+import asyncio
+import pickle
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.data_processor import DataIntegrator
+
+BRANDS = ["삼성", "LG", "한샘", "퍼시스", "레노버", "HP"]
+ITEMS = ["모니터", "노트북", "사무용 의자", "책상", "복합기", "컴퓨터"]
+CATEGORIES = ["사무/문구용품", "가구/인테리어", "가전디지털", "생활용품"]
+DATES = ["20250526", "2025-05-27", "2025.05.28"]
+
+
+def make_items(source: str, count: int, seed: int) -> List[Dict[str, Any]]:
+    """G2B/쿠팡 클라이언트 응답 항목과 같은 구성의 원본 항목"""
+    rng = random.Random(seed)
+    if source == 'g2b':
+        return [
+            {
+                'id': f"g2b_bid_{idx}",
+                'title': f"{rng.choice(BRANDS)} {rng.choice(ITEMS)} 구매 {idx}",
+                'budget': f"{rng.randint(100, 50000) * 1000:,}원",
+                'announcement_date': rng.choice(DATES),
+                'deadline': rng.choice(DATES),
+                'organization': f"기관{rng.randint(1, 300)}",
+                'announcement_number': f"2025{idx:08d}",
+                'industry_code': f"{rng.randint(1000, 9999)}"
+            }
+            for idx in range(count)
+        ]
+    return [
+        {
+            'id': f"coupang_{idx}",
+            'product_id': str(idx),
+            'name': f"{rng.choice(BRANDS)} {rng.choice(ITEMS)} 블랙 {idx}",
+            'price': rng.randint(10, 5000) * 100,
+            'original_price': rng.randint(10, 6000) * 100,
+            'discount_rate': rng.randint(0, 50),
+            'category_name': rng.choice(CATEGORIES),
+            'vendor_name': f"판매자{rng.randint(1, 500)}",
+            'rating': round(rng.uniform(3, 5), 1),
+            'url': f"https://www.coupang.com/vp/products/{idx}"
+        }
+        for idx in range(count)
+    ]
+
+
+async def convert_per_item(integrator: DataIntegrator, source: str, items: List[Dict]) -> int:
+    """항목마다 정규화/변환하는 기존 경로"""
+    convert = integrator._convert_g2b_item if source == 'g2b' else integrator._convert_coupang_item
+    return len([await convert(item) for item in items])
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DataIntegrator 변환 벤치마크")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--source", choices=["g2b", "coupang"], default="coupang")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    items = make_items(args.source, args.count, args.seed)
+    sequential = DataIntegrator(processes=0)
+    parallel = DataIntegrator(processes=args.processes, chunk_size=args.chunk_size)
+
+    results = {
+        "per-item": timed(lambda: asyncio.run(convert_per_item(sequential, args.source, items))),
+        "bulk": timed(sequential.convert_items, args.source, items),
+        f"bulk x{args.processes} procs": timed(parallel.convert_items, args.source, items)
+    }
+
+    print(f"{'path':<18} {'seconds':>9} {'items/s':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<18} {seconds:>9.2f} {args.count / seconds:>12,.0f}")
+
+    # 피클링 왕복 비용 (워커로 보내는 항목 + 돌려받는 상품)
+    sample = items[:min(len(items), 20_000)]
+    products = sequential.convert_items(args.source, sample)
+    pickle_seconds = (
+        timed(lambda: pickle.loads(pickle.dumps(sample, pickle.HIGHEST_PROTOCOL)))
+        + timed(lambda: pickle.loads(pickle.dumps(products, pickle.HIGHEST_PROTOCOL)))
+    )
+    convert_seconds = timed(sequential.convert_items, args.source, sample)
+    print(
+        f"\npickle round-trip: {pickle_seconds / len(sample) * 1e6:.1f} us/item "
+        f"({pickle_seconds / convert_seconds:.0%} of bulk conversion cost)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+임베딩 백엔드 벤치마크 - 해싱 임베딩 vs ko-sroberta (속도 / 검색 품질)
+
+사용법:
+    python scripts/benchmark_embedders.py --products 5000 --queries 500
+    python scripts/benchmark_embedders.py --backends hashing
+
+검색 품질은 합성 상품명 코퍼스에서 변형된 질의(영문 표기, 띄어쓰기 제거, 어순 변경, 자모 오타)로
+원본 상품을 찾는 Recall@1 / Recall@10으로 측정한다.
+"""
+
+import argparse
+import random
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from normalization.hashing_embedder import HashingEmbedder
+
+BRANDS = {"삼성": "Samsung", "엘지": "LG", "애플": "Apple", "레노버": "Lenovo", "델": "Dell", "한샘": "Hanssem", "퍼시스": "Fursys"}
+ITEMS = ["모니터", "노트북", "키보드", "마우스", "프린터", "사무용 의자", "책상", "복합기", "빔프로젝터", "파일 캐비닛", "화이트보드", "복사용지"]
+COLORS = {"검은색": "블랙", "흰색": "화이트", "회색": "그레이", "파란색": "블루", "빨간색": "레드"}
+SPECS = ["24인치", "27인치", "32인치", "A4", "1200mm", "무선", "유선", "메쉬", "가죽", "USB-C", "4K", "FHD"]
+
+
+def build_corpus(count: int, seed: int) -> List[str]:
+    """합성 상품명 코퍼스"""
+    rng = random.Random(seed)
+    corpus = set()
+    while len(corpus) < count:
+        corpus.add(" ".join([
+            rng.choice(list(BRANDS)),
+            rng.choice(ITEMS),
+            rng.choice(list(COLORS)),
+            rng.choice(SPECS),
+            f"{rng.randint(100, 9999)}"
+        ]))
+    return sorted(corpus)
+
+
+def jamo_typo(text: str, rng: random.Random) -> str:
+    """한글 음절 하나의 받침/모음 변형"""
+    positions = [i for i, ch in enumerate(text) if '가' <= ch <= '힣']
+    if not positions:
+        return text
+    idx = rng.choice(positions)
+    decomposed = list(unicodedata.normalize('NFD', text[idx]))
+    if len(decomposed) == 3:
+        decomposed = decomposed[:2]  # 받침 탈락
+    else:
+        decomposed.append('ᆫ')  # 받침 ㄴ 추가
+    return text[:idx] + unicodedata.normalize('NFC', ''.join(decomposed)) + text[idx + 1:]
+
+
+def perturb(text: str, rng: random.Random) -> str:
+    """질의 변형 (검색 시 실제로 들어오는 표기 차이 모사)"""
+    tokens = text.split()
+    for standard, english in BRANDS.items():
+        if tokens[0] == standard and rng.random() < 0.5:
+            tokens[0] = english
+    tokens = [COLORS.get(token, token) if rng.random() < 0.5 else token for token in tokens]
+    if rng.random() < 0.3:
+        rng.shuffle(tokens)
+    query = " ".join(tokens)
+    if rng.random() < 0.3:
+        query = query.replace(" ", "", 1)
+    if rng.random() < 0.3:
+        query = jamo_typo(query, rng)
+    return query
+
+
+def load_backends(names: List[str], model_name: str, dim: int) -> Dict[str, Callable[[List[str]], np.ndarray]]:
+    """사용 가능한 백엔드 로드 (transformer는 sentence-transformers 설치 시에만)"""
+    backends = {}
+    for name in names:
+        if name == "hashing":
+            embedder = HashingEmbedder(dim=dim)
+            backends[f"hashing({dim})"] = embedder.encode
+        elif name == "transformer":
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                print("sentence-transformers 미설치: transformer 백엔드 생략")
+                continue
+            model = SentenceTransformer(model_name)
+            backends[model_name] = lambda texts, model=model: model.encode(
+                texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False
+            )
+    return backends
+
+
+def evaluate(encode: Callable[[List[str]], np.ndarray], corpus: List[str], queries: List[Tuple[str, int]]) -> Dict[str, float]:
+    """속도 및 Recall@k 측정"""
+    start = time.perf_counter()
+    corpus_embeddings = np.asarray(encode(corpus), dtype=np.float32)
+    encode_seconds = time.perf_counter() - start
+
+    query_embeddings = np.asarray(encode([query for query, _ in queries]), dtype=np.float32)
+    scores = query_embeddings @ corpus_embeddings.T
+    targets = np.array([target for _, target in queries])
+
+    top10 = np.argpartition(-scores, kth=min(10, scores.shape[1] - 1), axis=1)[:, :10]
+    top1 = scores.argmax(axis=1)
+
+    return {
+        "texts_per_second": len(corpus) / encode_seconds if encode_seconds else float('inf'),
+        "recall@1": float(np.mean(top1 == targets)),
+        "recall@10": float(np.mean([target in row for target, row in zip(targets, top10)])),
+        "dim": corpus_embeddings.shape[1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--backends", nargs="+", default=["hashing", "transformer"])
+    parser.add_argument("--model", default="jhgan/ko-sroberta-multitask")
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(args.products, args.seed)
+    targets = rng.sample(range(len(corpus)), min(args.queries, len(corpus)))
+    queries = [(perturb(corpus[idx], rng), idx) for idx in targets]
+
+    print(f"코퍼스 {len(corpus)}개, 질의 {len(queries)}개")
+    print(f"{'backend':<36} {'dim':>5} {'texts/s':>10} {'R@1':>7} {'R@10':>7}")
+    for name, encode in load_backends(args.backends, args.model, args.dim).items():
+        result = evaluate(encode, corpus, queries)
+        print(f"{name:<36} {result['dim']:>5} {result['texts_per_second']:>10.0f} "
+              f"{result['recall@1']:>7.3f} {result['recall@10']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+UnifiedProduct 메모리 벤치마크 - 기존 dataclass 표현 vs __slots__ 고정 필드 표현
+
+사용법:
+    python scripts/benchmark_product_memory.py --count 1000000
+    python scripts/benchmark_product_memory.py --count 200000 --legacy-count 200000
+
+tracemalloc으로 상품 생성 전후 할당량을 측정해 상품당 바이트를 구하고 --count 기준 총량을 출력한다.
+기존 표현은 메모리 사용량이 커서 --legacy-count 개만 측정한 뒤 상품당 값으로 환산한다.
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.data_processor import UnifiedProduct
+
+
+@dataclass
+class LegacyUnifiedProduct:
+    """변경 전 UnifiedProduct (중첩 dict + Decimal 금액)"""
+    id: str
+    source: str
+    name: Dict[str, str]
+    price: Dict[str, Any]
+    specifications: Dict[str, Any] = field(default_factory=dict)
+    category: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    timestamps: Dict[str, datetime] = field(default_factory=dict)
+
+
+BRANDS = ["삼성", "엘지", "한샘", "퍼시스", "레노버", "델"]
+ITEMS = ["모니터", "노트북", "사무용 의자", "책상", "복합기", "파일 캐비닛"]
+CATEGORIES = [["사무용품", "쿠팡", "사무/문구용품"], ["가구", "쿠팡", "가구/인테리어"], ["전자제품", "쿠팡", "가전디지털"]]
+
+
+def product_fields(idx: int, rng: random.Random) -> Dict[str, Any]:
+    """쿠팡 변환 결과와 같은 구성의 상품 필드 (같은 값은 두 표현에서 동일하게 생성)"""
+    original = f"{rng.choice(BRANDS)} {rng.choice(ITEMS)} {rng.randint(100, 9999)}"
+    now = datetime.now()
+    return {
+        'id': f"coupang_{idx}",
+        'source': 'coupang',
+        'name': {'original': original, 'normalized': original, 'searchable': original.lower()},
+        'price': {'amount': Decimal(str(rng.randint(10, 5000) * 100)), 'currency': 'KRW', 'vat_included': True},
+        'specifications': {
+            'vendor': f"판매자{rng.randint(1, 500)}",
+            'rating': round(rng.uniform(3, 5), 1),
+            'review_count': rng.randint(0, 5000),
+            'delivery_fee': 0,
+            'is_free_shipping': True
+        },
+        'category': list(rng.choice(CATEGORIES)),
+        'metadata': {
+            'product_id': str(rng.randint(10 ** 8, 10 ** 9)),
+            'url': f"https://www.coupang.com/vp/products/{idx}",
+            'image_url': '',
+            'search_query': rng.choice(ITEMS),
+            'procurement_type': 'commercial'
+        },
+        'timestamps': {'created': now, 'retrieved': now}
+    }
+
+
+def measure(factory: Callable[..., Any], count: int, seed: int) -> Dict[str, float]:
+    """상품 count개 생성 시 상품당 할당 바이트와 생성 속도"""
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    products = [factory(**product_fields(idx, rng)) for idx in range(count)]
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del products
+
+    return {"bytes_per_product": allocated / count, "products_per_second": count / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UnifiedProduct 메모리 벤치마크")
+    parser.add_argument("--count", type=int, default=1_000_000, help="slots 표현 측정 상품 수 (총량 환산 기준)")
+    parser.add_argument("--legacy-count", type=int, default=100_000, help="기존 표현 측정 상품 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = {
+        "legacy dataclass": (measure(LegacyUnifiedProduct, args.legacy_count, args.seed), args.legacy_count),
+        "slots record": (measure(UnifiedProduct, args.count, args.seed), args.count)
+    }
+
+    print(f"{'representation':<18} {'measured':>10} {'bytes/product':>14} {f'total@{args.count:,}':>16} {'products/s':>12}")
+    for name, (result, measured) in results.items():
+        total_mb = result["bytes_per_product"] * args.count / 1024 ** 2
+        print(f"{name:<18} {measured:>10,} {result['bytes_per_product']:>14,.0f} "
+              f"{total_mb:>13,.0f} MB {result['products_per_second']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
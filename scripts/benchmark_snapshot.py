@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+상품 스냅샷 벤치마크 - JSON Lines(to_dict/from_dict) 왕복 vs ProductSnapshot 저장/연결/복원
+
+사용법:
+    python scripts/benchmark_snapshot.py --count 100000
+    python scripts/benchmark_snapshot.py --count 20000 --dir /tmp/snapshot_bench
+
+연결(open)은 메모리 매핑만 하므로 상품 수와 거의 무관하고, 복원(materialize)은
+전체 상품 객체를 만드는 비용이다. 파일 크기도 함께 출력한다.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from benchmark_conversion import make_items
+from modules.data_processor import DataIntegrator, UnifiedProduct
+from modules.product_snapshot import ProductSnapshot
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def save_json(products, path: Path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for product in products:
+            f.write(json.dumps(product.to_dict(), ensure_ascii=False) + "\n")
+
+
+def load_json(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [UnifiedProduct.from_dict(json.loads(line)) for line in f]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상품 스냅샷 벤치마크")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    integrator = DataIntegrator(processes=0)
+    half = args.count // 2
+    products = (
+        integrator.convert_items('g2b', make_items('g2b', half, args.seed))
+        + integrator.convert_items('coupang', make_items('coupang', args.count - half, args.seed + 1))
+    )
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        json_path = Path(tmp) / "products.jsonl"
+        snapshot_path = Path(tmp) / "products.snap"
+
+        json_save, _ = timed(save_json, products, json_path)
+        json_load, json_products = timed(load_json, json_path)
+
+        snapshot_save, _ = timed(ProductSnapshot.save, products, snapshot_path)
+        snapshot_open, snapshot = timed(ProductSnapshot.load, snapshot_path)
+        snapshot_row, _ = timed(lambda: [snapshot[idx] for idx in range(0, len(snapshot), max(1, len(snapshot) // 1000))])
+        snapshot_load, snapshot_products = timed(snapshot.to_products)
+
+        assert [p.to_dict() for p in snapshot_products] == [p.to_dict() for p in json_products]
+
+        print(f"{len(products):,} products")
+        print(f"{'format':<10} {'size MB':>9} {'save s':>8} {'open ms':>9} {'load s':>8}")
+        print(f"{'jsonl':<10} {json_path.stat().st_size / 1e6:>9.1f} {json_save:>8.2f} {'-':>9} {json_load:>8.2f}")
+        print(
+            f"{'snapshot':<10} {snapshot_path.stat().st_size / 1e6:>9.1f} {snapshot_save:>8.2f} "
+            f"{snapshot_open * 1000:>9.2f} {snapshot_load:>8.2f}"
+        )
+        print(f"\nsnapshot random row access: {snapshot_row / 1000 * 1e6:.1f} us/row")
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
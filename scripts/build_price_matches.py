@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+G2B-쿠팡 가격 매칭 테이블 생성 - 전체 카탈로그 일괄 매칭 후 sqlite 테이블 교체
+
+사용법:
+    python scripts/build_price_matches.py --g2b data/g2b.snap --coupang data/coupang.snap --db data/price_matches.db
+    python scripts/build_price_matches.py --synthetic 100000 --db /tmp/price_matches.db --backend hashing
+
+카탈로그는 ProductSnapshot 파일로 받는다. --synthetic은 벤치마크용 합성 카탈로그를 만들어
+매칭 시간과 키 조회 지연을 출력한다. --backend를 생략하면 EMBEDDING_BACKEND 설정을 따른다.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from benchmark_conversion import make_items
+from modules.data_processor import DataIntegrator
+from modules.price_match_table import CatalogMatcher, PriceMatchTable
+from modules.product_snapshot import ProductSnapshot
+from normalization.text_embedder import create_text_embedder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="G2B-쿠팡 가격 매칭 테이블 생성")
+    parser.add_argument("--g2b", help="G2B 카탈로그 스냅샷")
+    parser.add_argument("--coupang", help="쿠팡 카탈로그 스냅샷")
+    parser.add_argument("--synthetic", type=int, default=0, help="출처별 합성 상품 수")
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=["transformer", "hashing"], help="매칭 임베딩 백엔드 (기본: EMBEDDING_BACKEND)")
+    args = parser.parse_args()
+
+    integrator = DataIntegrator(processes=0)
+    if args.synthetic:
+        g2b_products = integrator.convert_items('g2b', make_items('g2b', args.synthetic, args.seed))
+        coupang_products = integrator.convert_items('coupang', make_items('coupang', args.synthetic, args.seed + 1))
+    elif args.g2b and args.coupang:
+        g2b_products = ProductSnapshot.load(Path(args.g2b))
+        coupang_products = ProductSnapshot.load(Path(args.coupang))
+    else:
+        parser.error("--g2b/--coupang 또는 --synthetic이 필요합니다")
+
+    table = PriceMatchTable(args.db)
+    matcher = CatalogMatcher(normalizer=integrator.normalizer, embedder=create_text_embedder(args.backend))
+    stats = table.rebuild(g2b_products, coupang_products, matcher)
+    for key, value in stats.items():
+        print(f"{key:<24} {value:.2f}" if isinstance(value, float) else f"{key:<24} {value}")
+
+    sample = [g2b_products[idx] for idx in range(0, len(g2b_products), max(1, len(g2b_products) // 1000))]
+    start = time.perf_counter()
+    for product in sample:
+        table.get_price_gap(product.source, product.id)
+    print(f"\nprice gap lookup: {(time.perf_counter() - start) / max(len(sample), 1) * 1e6:.1f} us/key")
+    table.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,12 @@ from pathlib import Path
 import numpy as np
 
 sys.path.append(str(Path(__file__).parent.parent))
-from modules.advanced_rag_module import KoreanEmbeddingEngine, BM25Scorer, HybridSearchEngine, AdvancedRAGModule
+from modules.advanced_rag_module import (
+    KoreanEmbeddingEngine, BM25Scorer, SharedBM25Scorer, HybridSearchEngine, AdvancedVectorDbModule, VectorShard
+)
 from modules.data_processor import UnifiedProduct
+from modules.chroma_client import stable_document_id
+from modules.product_snapshot import ProductSnapshot
 from decimal import Decimal
 
 class TestAdvancedRAG:
@@ -22,30 +26,33 @@ class TestAdvancedRAG:
         return BM25Scorer()
     
     @pytest.fixture
-    def sample_products(self):
-        return [
+    def sample_products(self, tmp_path):
+        products = [
             UnifiedProduct(
                 id="p1", source="test",
-                name={"original": "사무용 의자", "normalized": "사무용 의자"},
+                name={"original": "사무용 의자", "normalized": "사무용 의자", "searchable": "사무용 의자"},
                 price={"amount": Decimal("100000"), "currency": "KRW"},
                 category=["사무용품", "의자"],
                 specifications={"색상": "검정", "재질": "가죽"}
             ),
             UnifiedProduct(
                 id="p2", source="test",
-                name={"original": "컴퓨터 책상", "normalized": "컴퓨터 책상"},
+                name={"original": "컴퓨터 책상", "normalized": "컴퓨터 책상", "searchable": "컴퓨터 책상"},
                 price={"amount": Decimal("200000"), "currency": "KRW"},
                 category=["사무용품", "책상"],
                 specifications={"크기": "120x60cm", "재질": "목재"}
             ),
             UnifiedProduct(
                 id="p3", source="test", 
-                name={"original": "무선 마우스", "normalized": "무선 마우스"},
+                name={"original": "무선 마우스", "normalized": "무선 마우스", "searchable": "무선 마우스"},
                 price={"amount": Decimal("30000"), "currency": "KRW"},
                 category=["전자제품", "마우스"],
                 specifications={"연결": "무선", "배터리": "AA"}
             )
         ]
+        # 저장/공유 색인과 같은 스냅샷 형식을 거쳐 로드
+        with ProductSnapshot.load(ProductSnapshot.save(products, tmp_path / "sample_products.snap")) as snapshot:
+            return snapshot.to_products()
     
     def test_korean_embedding_engine_init(self, embedding_engine):
         try:
@@ -69,6 +76,30 @@ class TestAdvancedRAG:
             print(f"ERROR: {str(e)}")
             raise
     
+    @pytest.mark.asyncio
+    async def test_hashing_embedding_backend(self):
+        try:
+            engine = KoreanEmbeddingEngine(backend="hashing")
+            await engine.initialize()
+            assert engine.model is None
+            
+            texts = ["삼성 모니터 블랙 27인치", "삼성모니터 블랙 27인치", "사무용 의자 메쉬"]
+            embeddings = await engine.create_embeddings(texts)
+            
+            # 결정적이고 배치 구성과 무관, L2 정규화
+            single = await engine.create_embeddings([texts[2]])
+            assert np.allclose(embeddings[2], single[0])
+            assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+            
+            # 띄어쓰기만 다른 텍스트가 다른 상품보다 가까움
+            similarities = embeddings @ embeddings[0]
+            assert similarities[1] > 0.7 > similarities[2]
+            
+            print(f"DEBUG: 해싱 임베딩 유사도 {similarities.round(3).tolist()}")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
     def test_bm25_scoring(self, bm25_scorer, sample_products):
         try:
             # BM25 인덱스 구축
@@ -106,10 +137,238 @@ class TestAdvancedRAG:
             print(f"ERROR: {str(e)}")
             raise
     
+    @pytest.mark.asyncio
+    async def test_cascade_search(self, sample_products):
+        try:
+            hybrid_engine = HybridSearchEngine(retrieval_mode="cascade", candidate_pool=2)
+            hybrid_engine.is_initialized = True  # Mock 임베딩 사용
+            await hybrid_engine.index_products(sample_products)
+            
+            # 어휘 후보 안에서만 재순위화
+            results = await hybrid_engine.search("의자", k=3)
+            assert [r["product"].id for r in results] == ["p1"]
+
+            # 하이브리드 검색과 같이 점수가 0인 가장 약한 후보는 제외
+            results = await hybrid_engine.search("사무용 의자", k=3)
+            assert [r["product"].id for r in results] == ["p1"]
+            assert all(r["score"] > 0 for r in results)
+
+            # 패싯 필터 적용
+            results = await hybrid_engine.search("책상", k=3, filters={"category": "전자제품"})
+            assert all(r["product"].category[0] == "전자제품" for r in results)
+            
+            # 어휘 재현율이 없으면 의미적 검색으로 대체
+            results = await hybrid_engine.search("존재하지않는검색어", k=2)
+            assert len(results) == 2
+            
+            print(f"DEBUG: 캐스케이드 검색 결과 {len(results)}개")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
+    @pytest.mark.asyncio
+    async def test_incremental_indexing(self, sample_products):
+        try:
+            hybrid_engine = HybridSearchEngine()
+            hybrid_engine.is_initialized = True  # Mock 임베딩 사용
+            await hybrid_engine.index_products(sample_products[:2])
+            
+            # 신규 상품 추가 및 기존 상품 교체
+            updated = UnifiedProduct(
+                id="p1", source="test",
+                name={"original": "사무용 의자 고급", "normalized": "사무용 의자 고급", "searchable": "사무용 의자 고급"},
+                price={"amount": Decimal("120000"), "currency": "KRW"},
+                category=["사무용품", "의자"]
+            )
+            await hybrid_engine.add_products([sample_products[2], updated])
+            
+            assert len(hybrid_engine.products) == 3
+            assert hybrid_engine.embeddings.shape[0] == 3
+            assert hybrid_engine.products[0].name["normalized"] == "사무용 의자 고급"
+            assert hybrid_engine.bm25.get_scores("고급")[0] > 0
+
+            # 임베딩 텍스트가 같아도 BM25 텍스트가 바뀌면 재임베딩 없이 BM25만 갱신
+            embeddings_before = hybrid_engine.embeddings.copy()
+            renamed = UnifiedProduct(
+                id="p3", source="test",
+                name={"original": "무선 마우스", "normalized": "무선 마우스", "searchable": "무선 마우스 블루투스"},
+                price={"amount": Decimal("30000"), "currency": "KRW"},
+                category=["전자제품", "마우스"],
+                specifications={"연결": "무선", "배터리": "AA"}
+            )
+            await hybrid_engine.add_products([renamed])
+            assert (hybrid_engine.embeddings == embeddings_before).all()
+            assert hybrid_engine.products[2] is renamed
+            assert hybrid_engine.bm25.get_scores("블루투스")[2] > 0
+
+            # 패싯은 바뀐 행만 반영해도 전체 재구성과 같음
+            rebuilt = hybrid_engine._build_facets(hybrid_engine.products)
+            assert hybrid_engine.state.prices.tolist() == rebuilt['prices'].tolist()
+            assert {c: list(rows) for c, rows in hybrid_engine.state.category_postings.items()} == {
+                c: list(rows) for c, rows in rebuilt['category_postings'].items()
+            }
+
+            print("DEBUG: 증분 인덱싱 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
+    @pytest.mark.asyncio
+    async def test_updates_keep_search_state_intact(self, sample_products):
+        try:
+            hybrid_engine = HybridSearchEngine()
+            hybrid_engine.is_initialized = True  # Mock 임베딩 사용
+            await hybrid_engine.index_products(sample_products[:2])
+
+            # 진행 중인 검색이 쥐고 있는 상태
+            state = hybrid_engine.state
+            embeddings_before = state.embeddings.copy()
+            scores_before = state.bm25.get_scores("사무용 의자")
+
+            updated = UnifiedProduct(
+                id="p1", source="test",
+                name={"original": "사무용 의자 고급", "normalized": "사무용 의자 고급", "searchable": "사무용 의자 고급"},
+                price={"amount": Decimal("120000"), "currency": "KRW"},
+                category=["사무용품", "의자"]
+            )
+            await hybrid_engine.add_products([updated, sample_products[2]])
+
+            # 갱신은 새 상태로 교체되고 이전 상태의 상품/임베딩/BM25/패싯은 그대로
+            assert hybrid_engine.state is not state
+            assert [p.id for p in state.products] == ["p1", "p2"]
+            assert state.products[0] is sample_products[0]
+            assert (state.embeddings == embeddings_before).all()
+            assert np.array_equal(state.bm25.get_scores("사무용 의자"), scores_before)
+            assert state.bm25.get_scores("고급").sum() == 0
+            assert len(state.prices) == len(state.text_hashes) == 2
+
+            new_state = hybrid_engine.state
+            assert len(new_state.products) == new_state.embeddings.shape[0] == len(new_state.prices) == 3
+            assert new_state.bm25.get_scores("고급")[0] > 0
+            print("DEBUG: 색인 갱신 시 검색 상태 보존 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_idempotent_reindexing(self, sample_products):
+        try:
+            hybrid_engine = HybridSearchEngine()
+            hybrid_engine.is_initialized = True  # Mock 임베딩 사용
+            await hybrid_engine.index_products(sample_products)
+            embeddings_before = hybrid_engine.embeddings.copy()
+            
+            # 동일 상품 재수집 시 중복 없이 그대로 유지
+            await hybrid_engine.add_products(sample_products)
+            
+            assert len(hybrid_engine.products) == len(sample_products)
+            assert (hybrid_engine.embeddings == embeddings_before).all()
+            
+            # 원본 ID 기반 문서 ID는 내용과 무관하게 결정적
+            assert stable_document_id("coupang", "p1", "a") == stable_document_id("coupang", "p1", "b")
+            assert stable_document_id("g2b", None, "a") == stable_document_id("g2b", None, "a")
+            assert stable_document_id("g2b", None, "a") != stable_document_id("g2b", None, "b")
+            
+            print("DEBUG: 재인덱싱 멱등성 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_shard_merge_normalizes_globally(self, sample_products):
+        try:
+            single = HybridSearchEngine()
+            single.is_initialized = True  # Mock 임베딩 사용
+            await single.index_products(sample_products)
+
+            shards = []
+            for shard_products in (sample_products[:1], sample_products[1:]):
+                engine = HybridSearchEngine()
+                engine.is_initialized = True
+                await engine.index_products(shard_products)
+                shards.append(engine)
+
+            query = "사무용 의자"
+            query_embedding = await single.embedding_engine.create_embeddings([query])
+            rag_module = AdvancedVectorDbModule()
+            merged = rag_module._merge_shard_candidates(
+                [engine.score_candidates(query, query_embedding, 3) for engine in shards], 3
+            )
+            expected = single.search_with_embedding(query, query_embedding, k=3)
+
+            # 샤드별 최고 점수가 각각 1.0이 되지 않고 단일 색인과 같은 의미적 점수 기준으로 병합
+            merged_semantic = {r["product"].id: round(r["semantic_score"], 6) for r in merged}
+            expected_semantic = {r["product"].id: round(r["semantic_score"], 6) for r in expected}
+            assert merged_semantic == expected_semantic
+            assert sum(score == 1.0 for score in merged_semantic.values()) == 1
+            assert merged[0]["product"].id == expected[0]["product"].id == "p1"
+
+            print(f"DEBUG: 샤드 병합 점수 {merged_semantic}")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_shared_index_publish_attach_swap(self, sample_products, tmp_path):
+        try:
+            def make_module(publisher):
+                # initialize 없이 단일 컬렉션 샤드 구성 (Chroma 미사용)
+                rag_module = AdvancedVectorDbModule(
+                    shard_by="", shared_index_dir=str(tmp_path / "shared"), shared_index_publisher=publisher
+                )
+                rag_module.hybrid_search.is_initialized = True  # Mock 임베딩 사용
+                rag_module.shards = {"default": VectorShard("default", None, rag_module.hybrid_search)}
+                return rag_module
+
+            publisher = make_module(True)
+            worker = make_module(False)
+
+            # 게시 → 워커 연결
+            await publisher.hybrid_search.index_products(sample_products[:2])
+            assert publisher.publish_shared_index() == {"default": 1}
+            assert worker.refresh_shared_index(force=True)
+            assert worker.hybrid_search.shared_generation == 1
+            assert [p.id for p in worker.hybrid_search.products] == ["p1", "p2"]
+
+            # BM25 역색인/IDF/텍스트 해시는 다시 만들지 않고 게시된 배열에 메모리 매핑으로 연결
+            worker_bm25 = worker.hybrid_search.bm25
+            assert isinstance(worker_bm25, SharedBM25Scorer)
+            assert isinstance(worker_bm25.docs, np.memmap)
+            assert isinstance(worker.hybrid_search.text_hashes, np.memmap)
+            for query in ("사무용 의자", "책상 목재", "없는단어"):
+                assert np.array_equal(worker_bm25.get_scores(query), publisher.hybrid_search.bm25.get_scores(query))
+
+            # 새 세대 게시 후 검색 시 이벤트 루프 밖에서 교체
+            await publisher.hybrid_search.add_products(sample_products[2:])
+            await publisher._publish_if_publisher(["default"])
+            worker._last_shared_check = 0.0
+            results = await worker.search_similar_products("무선 마우스", limit=3)
+            assert worker.hybrid_search.shared_generation == 2
+            assert len(worker.hybrid_search.products) == 3
+            assert results[0]["metadata"]["name"] == "무선 마우스"
+
+            # 같은 세대면 다시 연결하지 않음
+            assert not worker.refresh_shared_index(force=True)
+
+            # 워커에서 상품을 추가하면 로컬 색인으로 분리 (같은 내용은 재임베딩 없음)
+            embeddings_before = np.array(worker.hybrid_search.embeddings)
+            await worker.hybrid_search.add_products(sample_products[:1])
+            assert worker.hybrid_search.shared_generation is None
+            assert isinstance(worker.hybrid_search.bm25, BM25Scorer)
+            assert (worker.hybrid_search.embeddings == embeddings_before).all()
+            assert np.array_equal(
+                worker.hybrid_search.bm25.get_scores("무선 마우스"), publisher.hybrid_search.bm25.get_scores("무선 마우스")
+            )
+
+            print("DEBUG: 공유 색인 게시/연결/교체 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
     @pytest.mark.asyncio
     async def test_advanced_rag_module(self, sample_products):
         try:
-            rag_module = AdvancedRAGModule()
+            rag_module = AdvancedVectorDbModule()
             
             # 제품 인덱싱
             await rag_module.index_products(sample_products)
@@ -128,7 +387,7 @@ class TestAdvancedRAG:
     @pytest.mark.asyncio
     async def test_product_matching(self, sample_products):
         try:
-            rag_module = AdvancedRAGModule()
+            rag_module = AdvancedVectorDbModule()
             await rag_module.index_products(sample_products)
             
             # 매칭 요구사항
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import ProcureMateSettings
+from modules.category_classifier import CategoryClassifier
+from modules.data_processor import DataIntegrator
+from normalization.hashing_embedder import HashingEmbedder
+
+class TestCategoryClassifier:
+
+    @pytest.fixture
+    def classifier(self):
+        return CategoryClassifier(
+            DataIntegrator()._initialize_category_mappings(), embedder=HashingEmbedder(dim=256), min_similarity=0.3
+        )
+
+    def test_keyword_priority_matches_mapping_order(self, classifier):
+        try:
+            # 먼저 나온 키워드(컴퓨터)가 아니라 매핑 순서상 앞선 카테고리(가구)를 선택
+            assert classifier.match_keywords("컴퓨터책상/의자") == "가구"
+            # 겹치는 키워드도 모두 검사 (사무/문구용품 안의 문구)
+            assert classifier.match_keywords("사무/문구용품") == "사무용품"
+            # 대소문자 구분 (소문자 제목에서는 IT가 매칭되지 않음)
+            assert classifier.match_keywords("it 장비") is None
+            assert classifier.match_keywords("IT 장비") == "전자제품"
+            print("DEBUG: 키워드 분류 우선순위 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_batch_classification_with_fallback(self, classifier):
+        try:
+            texts = ["가구/인테리어", "전자 칠판", "주방세제", "", "차량 임차"]
+            results = classifier.classify(texts)
+            assert results == ["가구", "전자제품", None, None, "차량"]
+
+            stats = classifier.get_stats()
+            assert stats["hits"]["가구"] == {"keyword": 1, "embedding": 0}
+            assert stats["hits"]["전자제품"] == {"keyword": 0, "embedding": 1}
+            assert stats["unmatched"] == 2
+            assert stats["items"] == 5 and stats["batches"] == 1
+            assert stats["total_ms"] > 0
+
+            # 중심 벡터는 한 번만 계산
+            assert classifier.centroids is classifier.centroids
+            print("DEBUG: 배치 카테고리 분류 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_defaults_follow_settings(self, monkeypatch):
+        try:
+            monkeypatch.setattr(ProcureMateSettings, "EMBEDDING_BACKEND", "hashing")
+            monkeypatch.setattr(ProcureMateSettings, "EMBEDDING_HASH_DIM", 128)
+            monkeypatch.setattr(ProcureMateSettings, "CATEGORY_FALLBACK_MIN_SIMILARITY", 0.25)
+
+            # 임베딩 백엔드/차원과 최소 유사도는 설정에서, 주입한 임베딩은 그대로 사용
+            integrator = DataIntegrator(processes=0)
+            classifier = integrator.category_classifier
+            assert isinstance(classifier.embedder, HashingEmbedder)
+            assert classifier.embedder.dim == 128
+            assert classifier.min_similarity == 0.25
+            assert classifier.centroids.shape == (len(integrator.category_mappings), 128)
+
+            embedder = HashingEmbedder(dim=64)
+            assert DataIntegrator(processes=0, embedder=embedder).category_classifier.embedder is embedder
+            print("DEBUG: 카테고리 분류 설정 기본값 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
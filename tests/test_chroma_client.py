@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import ProcureMateSettings
+import modules.chroma_client as chroma_client
+from modules.chroma_client import ChromaClientPool, create_chroma_client, text_hash
+
+class FakeCollection:
+    """호출 기록용 Chroma 컬렉션 대역"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = {}
+        self.calls = []
+
+    def add(self, ids, documents, metadatas, embeddings=None):
+        self.calls.append(("add", len(ids)))
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.rows[doc_id] = (document, metadata)
+
+    def upsert(self, ids, documents, metadatas, embeddings=None):
+        self.calls.append(("upsert", len(ids)))
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.rows[doc_id] = (document, metadata)
+
+    def get(self, ids, include=None):
+        found = [doc_id for doc_id in ids if doc_id in self.rows]
+        return {"ids": found, "metadatas": [self.rows[doc_id][1] for doc_id in found]}
+
+    def query(self, n_results, query_texts=None, query_embeddings=None):
+        queries = query_texts if query_texts is not None else query_embeddings
+        self.calls.append(("query", len(queries)))
+        ids = list(self.rows)[:n_results]
+        return {
+            "ids": [ids for _ in queries],
+            "documents": [[self.rows[doc_id][0] for doc_id in ids] for _ in queries],
+            "distances": [[0.1] * len(ids) for _ in queries],
+            "included": ["documents", "distances"]
+        }
+
+class FakeClient:
+    """생성 인자를 기록하는 Chroma 클라이언트 대역"""
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        self.kwargs = kwargs
+        self.collections = {}
+
+    def get_or_create_collection(self, name):
+        return self.collections.setdefault(name, FakeCollection(name))
+
+class TestChromaClient:
+
+    @pytest.fixture
+    def fake_chromadb(self, monkeypatch):
+        created = []
+
+        def make(kind):
+            def factory(**kwargs):
+                created.append(FakeClient(kind, **kwargs))
+                return created[-1]
+            return factory
+
+        monkeypatch.setattr(chroma_client, "chromadb", SimpleNamespace(
+            HttpClient=make("http"), PersistentClient=make("embedded")
+        ))
+        monkeypatch.setattr(ProcureMateSettings, "VECTOR_DB_HOST", "chroma.internal")
+        monkeypatch.setattr(ProcureMateSettings, "VECTOR_DB_PORT", 8100)
+        monkeypatch.setattr(ProcureMateSettings, "VECTOR_DB_POOL_SIZE", 3)
+        return created
+
+    @pytest.fixture
+    def pool(self):
+        return ChromaClientPool(mode="embedded", batch_size=2, client=FakeClient("embedded"))
+
+    def test_mode_selection(self, fake_chromadb, monkeypatch):
+        try:
+            monkeypatch.setattr(ProcureMateSettings, "VECTOR_DB_MODE", "http")
+            client = create_chroma_client("./chroma_db")
+            assert client.kind == "http"
+            assert (client.kwargs["host"], client.kwargs["port"]) == ("chroma.internal", 8100)
+
+            # HTTP 모드 풀은 VECTOR_DB_POOL_SIZE개 클라이언트 생성
+            assert ChromaClientPool().size == 3
+            assert [c.kind for c in fake_chromadb[1:]] == ["http"] * 3
+
+            monkeypatch.setattr(ProcureMateSettings, "VECTOR_DB_MODE", "embedded")
+            client = create_chroma_client("/tmp/chroma")
+            assert client.kind == "embedded" and client.kwargs["path"] == "/tmp/chroma"
+            assert ChromaClientPool().size == 1
+
+            # 알 수 없는 모드는 embedded로 대체, 명시한 mode가 설정보다 우선
+            assert create_chroma_client(mode="grpc").kind == "embedded"
+            assert create_chroma_client(mode="HTTP").kind == "http"
+            print("DEBUG: Chroma 모드 선택 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_add_and_query_batching(self, pool):
+        try:
+            ids = [f"doc{i}" for i in range(5)]
+            await pool.add("products", ids=ids, documents=[f"문서 {i}" for i in ids], metadatas=[{}] * 5)
+            collection = pool.client.collections["products"]
+            assert collection.calls == [("add", 2), ("add", 2), ("add", 1)]
+            assert len(collection.rows) == 5
+
+            # 쿼리도 batch_size 단위로 나누어 검색 후 쿼리 순서대로 병합
+            results = await pool.query("products", n_results=2, query_texts=["의자", "책상", "모니터"])
+            assert collection.calls[3:] == [("query", 2), ("query", 1)]
+            assert len(results["ids"]) == len(results["documents"]) == 3
+            assert results["ids"][0] == ["doc0", "doc1"]
+            assert results["included"] == ["documents", "distances"]
+            print("DEBUG: Chroma 배치 추가/검색 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_upsert_changed_skips_unchanged(self, pool):
+        try:
+            ids = ["a", "b", "c"]
+            documents = ["사무용 의자", "컴퓨터 책상", "무선 마우스"]
+            assert await pool.upsert_changed("products", ids=ids, documents=documents, metadatas=[{}] * 3) == 3
+            collection = pool.client.collections["products"]
+            assert collection.rows["a"][1]["text_hash"] == text_hash("사무용 의자")
+
+            # 같은 내용 재수집은 upsert 생략
+            collection.calls.clear()
+            assert await pool.upsert_changed("products", ids=ids, documents=documents, metadatas=[{}] * 3) == 0
+            assert collection.calls == []
+
+            # 바뀐 문서만 upsert, 배치 내 중복 ID는 마지막 값 사용
+            changed = await pool.upsert_changed(
+                "products",
+                ids=["a", "b", "b"],
+                documents=["사무용 의자", "컴퓨터 책상", "컴퓨터 책상 1200"],
+                metadatas=[{}, {}, {"price": 1}]
+            )
+            assert changed == 1
+            assert collection.calls == [("upsert", 1)]
+            assert collection.rows["b"] == ("컴퓨터 책상 1200", {"price": 1, "text_hash": text_hash("컴퓨터 책상 1200")})
+            print("DEBUG: Chroma 변경분 upsert 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,19 +1,24 @@
 #!/usr/bin/env python3
 
 import pytest
+import random
 import sys
+import numpy as np
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 from modules.data_processor import UnifiedProduct, KoreanTextNormalizer, DataIntegrator, ProductDeduplicator
+from modules.product_snapshot import ProductSnapshot
+from utils import MultiPatternMatcher
+from normalization.hashing_embedder import HashingEmbedder
 from decimal import Decimal
 from datetime import datetime
 
 class TestDataProcessor:
     
     @pytest.fixture
-    def sample_product(self):
-        return UnifiedProduct(
+    def sample_product(self, tmp_path):
+        product = UnifiedProduct(
             id="test-001",
             source="test",
             name={"original": "사무용 의자", "normalized": "사무용 의자"},
@@ -23,6 +28,9 @@ class TestDataProcessor:
             metadata={"supplier": "테스트업체"},
             timestamps={"created": datetime.now()}
         )
+        # 저장/공유 색인과 같은 스냅샷 형식을 거쳐 로드
+        with ProductSnapshot.load(ProductSnapshot.save([product], tmp_path / "sample_product.snap")) as snapshot:
+            return snapshot[0]
     
     @pytest.fixture
     def normalizer(self):
@@ -42,6 +50,48 @@ class TestDataProcessor:
             print(f"ERROR: {str(e)}")
             raise
     
+    def test_compact_product_record(self, sample_product):
+        try:
+            # 고정 필드 + 원 단위 정수 금액
+            assert not hasattr(sample_product, "__dict__")
+            assert sample_product.amount == 100000
+            assert isinstance(sample_product.price["amount"], int)
+            assert sample_product.name["normalized"] == sample_product.name_normalized
+            
+            # 처음 접근 시 생성된 metadata dict는 이후 수정이 유지됨
+            sample_product.metadata["canonical_id"] = "test:001"
+            assert sample_product.metadata["canonical_id"] == "test:001"
+            sample_product.timestamps["indexed"] = datetime(2025, 1, 1)
+            assert sample_product.timestamps["indexed"] == datetime(2025, 1, 1)
+
+            assert sample_product.to_dict()["name"] == {
+                "original": "사무용 의자", "normalized": "사무용 의자", "searchable": ""
+            }
+
+            # name/price 항목 수정은 고정 필드에 반영 (금액 검증 포함), 키 추가/삭제는 불가
+            sample_product.name["normalized"] = "의자"
+            assert sample_product.name_normalized == "의자"
+            sample_product.price["amount"] = Decimal("99999.5")
+            assert sample_product.amount == 100000
+            with pytest.raises(ValueError):
+                sample_product.price["amount"] = -1
+            with pytest.raises(KeyError):
+                sample_product.name["alias"] = "체어"
+            with pytest.raises(TypeError):
+                del sample_product.price["currency"]
+            sample_product.name = {"original": "사무용 의자", "normalized": "사무용 의자"}
+            assert sample_product.name == {"original": "사무용 의자", "normalized": "사무용 의자", "searchable": ""}
+            sample_product.category.append("사무가구")
+            assert sample_product.category == ["사무용품", "의자", "사무가구"]
+
+            restored = UnifiedProduct.from_dict(sample_product.to_dict())
+            assert restored == sample_product
+            assert restored.category == ["사무용품", "의자", "사무가구"]
+            print("DEBUG: 고정 필드 상품 레코드 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
     def test_price_validation(self):
         try:
             # 잘못된 가격으로 테스트
@@ -117,6 +167,243 @@ class TestDataProcessor:
         except Exception as e:
             print(f"ERROR: {str(e)}")
             raise
+    
+    def test_multi_pattern_normalization(self, normalizer):
+        try:
+            result = normalizer.normalize_text("SAMSUNG 모니터 BLACK 2EA")
+            assert result["normalized"] == "삼성 모니터 검은색 2개"
+            
+            # 단어 경계: 영문 단어 내부의 단위/한 글자 한글 단위는 치환하지 않음
+            result = normalizer.normalize_text("LG전자 monitor 3대 대형")
+            assert result["normalized"] == "엘지 monitor 3개 대형"
+            
+            # 매핑 변경 후 오토마톤 재생성
+            normalizer.brand_mappings["레노버"] = ["Lenovo"]
+            normalizer.rebuild_matcher()
+            assert normalizer.normalize_text("lenovo 노트북")["normalized"] == "레노버 노트북"
+            print("DEBUG: 다중 패턴 정규화 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
+    def test_multi_pattern_matcher_leftmost_longest(self):
+        try:
+            matcher = MultiPatternMatcher(word_boundary=False)
+            patterns = {"ab": "1", "abc": "2", "bc": "3", "c": "4", "가나": "5"}
+            for pattern, replacement in patterns.items():
+                matcher.add(pattern, replacement)
+            
+            def brute_force(text):
+                pieces, i = [], 0
+                while i < len(text):
+                    best = max((p for p in patterns if text.startswith(p, i)), key=len, default=None)
+                    pieces.append(patterns[best] if best else text[i])
+                    i += len(best) if best else 1
+                return ''.join(pieces)
+            
+            for text in ["abcabc", "aabbcc", "가나abc가", "cbabc", ""]:
+                assert matcher.replace(text) == brute_force(text)
+            print("DEBUG: 최장 일치 치환 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
+    def test_bulk_normalization_matches_single(self, normalizer):
+        try:
+            texts = [
+                "  SAMSUNG 모니터 BLACK 2EA  ",
+                "[특가] LG전자 노트북 (15인치) 무료배송!!",
+                "",
+                None,
+                "apple\n키보드\x00화이트 1set",
+                "사무용 의자 - 블랙 3대"
+            ]
+            columns = normalizer.normalize_texts(texts, chunk_size=2)
+            assert set(columns) == {"original", "normalized", "searchable"}
+            assert all(len(values) == len(texts) for values in columns.values())
+            
+            for idx, text in enumerate(texts):
+                expected = normalizer.normalize_text(text)
+                assert {key: values[idx] for key, values in columns.items()} == expected
+            print("DEBUG: 일괄 정규화 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_bulk_conversion_matches_per_item(self):
+        try:
+            items = [
+                {"id": "g2b_1", "title": "LG 모니터 구매", "budget": "1,200,000원", "announcement_date": "20250526", "deadline": "2025-06-02"},
+                {"title": "사무용품 문구 일괄 구매", "budget": 350000, "announcement_date": "2025.05.27", "deadline": "잘못된 날짜"},
+                {"id": "g2b_3", "title": "컴퓨터 IT 장비", "budget": 0, "announcement_date": "2025/05/28", "organization": "조달청"},
+                {"id": "g2b_4", "title": "책상 구매", "budget": 99.5, "announcement_date": "20250529"}
+            ]
+            integrator = DataIntegrator(processes=0)
+            bulk = integrator.convert_items("g2b", items)
+            per_item = [await integrator._convert_g2b_item(item) for item in items]
+
+            # 프로세스 풀 경로도 같은 결과 (청크 2개)
+            parallel = DataIntegrator(processes=2, chunk_size=2).convert_items("g2b", items)
+
+            def comparable(product):
+                timestamps = {key: value for key, value in product.timestamps.items() if key != "created"}
+                return product.to_dict() | {"timestamps": timestamps}
+
+            assert [comparable(p) for p in bulk] == [comparable(p) for p in per_item] == [comparable(p) for p in parallel]
+            assert bulk[0].amount == 1200000
+            assert bulk[0].timestamps["deadline"] == datetime(2025, 6, 2)
+            assert bulk[1].timestamps["deadline"] is None
+            assert bulk[1].id == per_item[1].id
+
+            # _parse_date도 출처별 파서를 재사용 (형식/결과 캐시 유지)
+            assert integrator._parse_date("2025-07-01") == datetime(2025, 7, 1)
+            assert integrator.date_parsers["g2b"].cached_format == "%Y-%m-%d"
+            print("DEBUG: 일괄 변환 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_content_id_for_missing_source_id(self):
+        try:
+            item = {"title": "사무용품 문구 일괄 구매", "budget": 350000, "announcement_date": "20250527"}
+            first = DataIntegrator(processes=0).convert_items("g2b", [item])[0]
+
+            # 수집 시각과 무관하게 재수집해도 같은 ID, 빈 문자열 ID도 원본 ID 없음으로 취급
+            again = DataIntegrator(processes=0).convert_items("g2b", [dict(item)])[0]
+            assert first.id == again.id
+            assert first.id.startswith("g2b_") and len(first.id) == len("g2b_") + 16
+            assert DataIntegrator(processes=0).convert_items("g2b", [{**item, "id": ""}])[0].id.startswith("g2b_")
+
+            # 내용이 바뀌면 다른 ID
+            changed = DataIntegrator(processes=0).convert_items("g2b", [{**item, "budget": 360000}])[0]
+            assert changed.id != first.id
+            print("DEBUG: 원본 ID 없는 항목의 내용 해시 ID 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_lsh_deduplication_matches_bruteforce(self):
+        try:
+            rng = random.Random(7)
+            brands = ["삼성", "엘지", "한샘", "퍼시스"]
+            items = ["모니터", "사무용 의자", "책상", "복합기", "파일 캐비닛"]
+            specs = ["24인치", "1200mm", "메쉬", "A4", "무선"]
+            products = []
+            for _ in range(80):
+                base = f"{rng.choice(brands)} {rng.choice(items)} {rng.choice(specs)} {rng.randint(100, 999)}"
+                price = rng.choice([0, 800, 1000, rng.randint(10000, 500000)])
+                category = rng.choice([["사무용품", "쿠팡"], ["가구", "G2B"], []])
+                for variant in range(rng.randint(1, 3)):
+                    chars = list(base)
+                    if variant:
+                        chars.insert(rng.randrange(len(chars)), rng.choice("가나ab1 "))
+                    products.append(UnifiedProduct(
+                        id=f"p{len(products)}",
+                        source="test",
+                        name={"original": "", "normalized": "".join(chars), "searchable": ""},
+                        price={"amount": Decimal(str(int(price * rng.choice([1, 0.8, 1.25, 0.5])))), "currency": "KRW"},
+                        category=category
+                    ))
+            # 이름 없는 상품 (같은 가격/카테고리여도 두 경로 모두 중복으로 묶지 않음)
+            for blank in ["", "", "  ", "  "]:
+                products.append(UnifiedProduct(
+                    id=f"blank{len(products)}",
+                    source="test",
+                    name={"original": "", "normalized": blank, "searchable": ""},
+                    price={"amount": Decimal("10000"), "currency": "KRW"},
+                    category=["사무용품"]
+                ))
+            rng.shuffle(products)
+
+            brute_force = await ProductDeduplicator(use_lsh=False).find_duplicates(products)
+            with_lsh = await ProductDeduplicator().find_duplicates(products)
+            assert brute_force
+            assert with_lsh == brute_force
+            grouped_ids = {products[idx].id for group in with_lsh for idx in group}
+            assert not any(product_id.startswith("blank") for product_id in grouped_ids)
+            print(f"DEBUG: LSH 중복 검사 테스트 통과 ({len(with_lsh)}개 그룹)")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
+    @pytest.mark.asyncio
+    async def test_embedding_deduplication(self):
+        try:
+            names = [
+                "삼성 모니터 27인치 검은색",
+                "삼성 모니터 27인치 검은색 ",
+                "삼성모니터 27인치 검은색",
+                "엘지 모니터 27인치 검은색",
+                "삼성 노트북 15인치",
+                "사무용 의자 메쉬 블랙",
+                "사무용의자 메쉬 블랙",
+                "사무용 의자 메쉬 블랙"
+            ]
+            prices = [300000, 310000, 290000, 300000, 1200000, 150000, 150000, 50000]
+            products = [
+                UnifiedProduct(
+                    id=f"p{idx}",
+                    source="test",
+                    name={"original": name, "normalized": name, "searchable": name},
+                    price={"amount": Decimal(str(price)), "currency": "KRW"},
+                    category=["사무용품"]
+                )
+                for idx, (name, price) in enumerate(zip(names, prices))
+            ]
+            embeddings = HashingEmbedder().encode(names)
+            
+            deduplicator = ProductDeduplicator(embedding_threshold=0.84, knn_k=3)
+            groups = await deduplicator.find_duplicates_by_embedding(products, embeddings, chunk_size=3)
+            
+            # 마지막 의자는 가격 비율 조건으로 제외
+            assert groups == [[0, 1, 2], [5, 6]]
+            print("DEBUG: 임베딩 중복 검사 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+    
+    @pytest.mark.asyncio
+    async def test_embedding_deduplication_ann_recall(self):
+        try:
+            # 원본 1000개 + 잡음을 섞은 근접 중복 1000개
+            rng = np.random.RandomState(0)
+            base = rng.randn(1000, 32).astype(np.float32)
+            embeddings = np.vstack([base, base + 0.3 * rng.randn(1000, 32).astype(np.float32)])
+            products = [
+                UnifiedProduct(
+                    id=f"p{idx}",
+                    source="test",
+                    name={"original": "상품", "normalized": "상품", "searchable": "상품"},
+                    price={"amount": Decimal("10000"), "currency": "KRW"},
+                    category=["사무용품"]
+                )
+                for idx in range(len(embeddings))
+            ]
+            
+            def pairs(groups):
+                return {(a, b) for group in groups for a in group for b in group if a < b}
+            
+            exact = pairs(await ProductDeduplicator(embedding_threshold=0.9, knn_k=5).find_duplicates_by_embedding(products, embeddings))
+            assert exact
+            
+            # nprobe가 클수록 재현율이 오르고, 모든 목록을 조회하면 전수 검색과 같음 (근사 검색은 오탐을 만들지 않음)
+            recalls = []
+            for nprobe in (1, 4, 44):
+                approx = pairs(await ProductDeduplicator(
+                    embedding_threshold=0.9, knn_k=5, nprobe=nprobe, ann_min_items=1
+                ).find_duplicates_by_embedding(products, embeddings))
+                assert approx <= exact
+                recalls.append(len(approx) / len(exact))
+            
+            assert recalls == sorted(recalls)
+            assert recalls[0] >= 0.8 and recalls[1] >= 0.95
+            assert recalls[-1] == 1.0
+            print(f"DEBUG: 근사 이웃 중복 검사 재현율 {recalls}")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
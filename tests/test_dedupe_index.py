@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+from pathlib import Path
+from decimal import Decimal
+
+sys.path.append(str(Path(__file__).parent.parent))
+from modules.data_processor import UnifiedProduct
+from modules.dedupe_index import DedupeIndex
+
+def make_product(product_id: str, source: str, name: str, price: int) -> UnifiedProduct:
+    return UnifiedProduct(
+        id=product_id,
+        source=source,
+        name={"original": name, "normalized": name, "searchable": name.lower()},
+        price={"amount": Decimal(str(price)), "currency": "KRW", "vat_included": True},
+        category=["사무용품"]
+    )
+
+class TestDedupeIndex:
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "dedupe" / "index.db")
+
+    @pytest.mark.asyncio
+    async def test_incremental_linking_across_runs(self, db_path):
+        try:
+            index = DedupeIndex(db_path)
+            first_run = [
+                make_product("c1", "coupang", "삼성 모니터 27인치 검은색", 300000),
+                make_product("c2", "coupang", "삼성 모니터 27인치 검은색 ", 310000),
+                make_product("c3", "coupang", "사무용 의자 메쉬", 150000)
+            ]
+            ids = await index.link_products(first_run)
+            assert ids == ["coupang:c1", "coupang:c1", "coupang:c3"]
+            assert first_run[1].metadata["canonical_id"] == "coupang:c1"
+            index.close()
+
+            # 다음 실행: 다른 출처의 같은 상품은 기존 대표 상품에 연결, 이미 본 상품은 재비교 없이 반환
+            index = DedupeIndex(db_path)
+            second_run = [
+                make_product("g1", "g2b", "삼성 모니터 27인치 검은색", 295000),
+                make_product("c3", "coupang", "사무용 의자 메쉬", 150000),
+                make_product("g2", "g2b", "사무용 의자 메쉬", 50000)
+            ]
+            ids = await index.link_products(second_run)
+            assert ids == ["coupang:c1", "coupang:c3", "g2b:g2"]
+
+            stats = index.get_stats()
+            assert stats["known"] == 1
+            assert stats["linked"] == 1
+            assert stats["registered"] == 1
+            assert stats["canonical_count"] == 3
+            assert stats["member_count"] == 5
+            index.close()
+            print("DEBUG: 영속 중복 색인 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
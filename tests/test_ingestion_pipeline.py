@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+import asyncio
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from modules.ingestion_pipeline import IngestionPipeline
+
+BRANDS = ["삼성", "엘지", "한샘", "퍼시스", "레노버"]
+ITEMS = ["모니터", "노트북", "사무용 의자", "책상", "복합기"]
+
+class RecordingVectorDb:
+    """add_products 호출을 기록하는 색인 대상 (gate가 열릴 때까지 대기)"""
+
+    def __init__(self, gate: asyncio.Event = None):
+        self.batches = []
+        self.gate = gate
+
+    async def add_products(self, products):
+        if self.gate:
+            await self.gate.wait()
+        self.batches.append(products)
+
+def coupang_page(page: int, page_size: int):
+    return [
+        {
+            "id": f"coupang_{page}_{idx}",
+            "name": f"{BRANDS[idx % 5]} {ITEMS[(page + idx) % 5]} {page * 100 + idx}",
+            "price": 10000 * (idx + 1),
+            "category_name": "사무용품"
+        }
+        for idx in range(page_size)
+    ]
+
+def g2b_page(page: int, page_size: int):
+    return [
+        {
+            "id": f"g2b_{page}_{idx}",
+            "title": f"{ITEMS[idx % 5]} 구매 {page * 100 + idx}",
+            "budget": 5000000 + idx,
+            "announcement_date": "2025-05-26"
+        }
+        for idx in range(page_size)
+    ]
+
+class TestIngestionPipeline:
+
+    @pytest.fixture
+    def fetch_log(self):
+        return []
+
+    def make_sources(self, fetch_log, num_pages: int, page_size: int):
+        async def pages(source, make_page):
+            for page in range(num_pages):
+                fetch_log.append((source, page))
+                yield make_page(page, page_size)
+
+        return {
+            "g2b": pages("g2b", g2b_page),
+            "coupang": pages("coupang", coupang_page)
+        }
+
+    @pytest.mark.asyncio
+    async def test_stream_indexes_batches_incrementally(self, fetch_log):
+        try:
+            vector_db = RecordingVectorDb()
+            pipeline = IngestionPipeline(vector_db, queue_size=2, batch_size=8)
+
+            first_batch_fetched = None
+            async for batch in pipeline.stream(self.make_sources(fetch_log, num_pages=10, page_size=5)):
+                assert 0 < len(batch) <= 8
+                if first_batch_fetched is None:
+                    first_batch_fetched = len(fetch_log)
+
+            # 첫 배치는 전체 페이지 수집이 끝나기 전에 색인됨
+            assert first_batch_fetched < 20
+
+            stats = pipeline.stats
+            assert stats["pages"] == {"g2b": 10, "coupang": 10}
+            assert stats["fetched"] == stats["converted"] == 100
+            assert stats["indexed"] == sum(len(batch) for batch in vector_db.batches)
+            assert stats["indexed"] + stats["duplicates_removed"] == 100
+            assert stats["batches"] == len(vector_db.batches)
+            assert stats["first_batch_seconds"] is not None
+            print("DEBUG: 스트리밍 수집 증분 색인 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_fetching(self, fetch_log):
+        try:
+            gate = asyncio.Event()
+            vector_db = RecordingVectorDb(gate)
+            pipeline = IngestionPipeline(vector_db, queue_size=1, batch_size=5)
+            run = asyncio.create_task(pipeline.run(self.make_sources(fetch_log, num_pages=50, page_size=5)))
+
+            # 색인이 막혀 있으면 큐가 찬 뒤 페이지 수집도 멈춤
+            await asyncio.sleep(0.2)
+            assert len(fetch_log) < 20
+            assert not run.done()
+
+            gate.set()
+            stats = await run
+            assert len(fetch_log) == 100
+            assert stats["fetched"] == 500
+            print("DEBUG: 스트리밍 수집 backpressure 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_conversion_runs_off_event_loop(self, fetch_log):
+        try:
+            pipeline = IngestionPipeline(RecordingVectorDb(), queue_size=1, batch_size=5)
+            loop_thread = threading.get_ident()
+            convert_threads = set()
+            original_convert = pipeline.data_integrator._convert_chunk
+
+            def recording_convert(source, items):
+                convert_threads.add(threading.get_ident())
+                return original_convert(source, items)
+
+            pipeline.data_integrator._convert_chunk = recording_convert
+            stats = await pipeline.run(self.make_sources(fetch_log, num_pages=2, page_size=5))
+
+            # 변환/정규화는 이벤트 루프 스레드를 막지 않음
+            assert convert_threads and loop_thread not in convert_threads
+            assert stats["converted"] == 20
+            print("DEBUG: 스트리밍 수집 변환 스레드 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_source_error_propagates(self):
+        try:
+            async def failing_pages():
+                yield coupang_page(0, 5)
+                raise RuntimeError("페이지 조회 실패")
+
+            pipeline = IngestionPipeline(RecordingVectorDb(), queue_size=1, batch_size=5)
+            with pytest.raises(RuntimeError):
+                await pipeline.run({"coupang": failing_pages()})
+            print("DEBUG: 스트리밍 수집 오류 전파 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import ProcureMateSettings
+from modules.data_processor import DataIntegrator
+from modules.price_match_table import CatalogMatcher, PriceMatchTable
+from normalization.hashing_embedder import HashingEmbedder
+from normalization.text_embedder import TransformerEmbedder
+from utils import IVFIndex
+
+class TestPriceMatchTable:
+
+    @pytest.fixture
+    def catalogs(self):
+        integrator = DataIntegrator(processes=0)
+        g2b = integrator.convert_items("g2b", [
+            {"id": "1", "title": "삼성 27인치 모니터 구매", "budget": "5,000,000원"},
+            {"id": "2", "title": "LG 노트북 15인치 구입", "budget": "3,000,000원"},
+            {"id": "3", "title": "복사용지 A4 80g 납품", "budget": "900,000원"},
+            {"id": "4", "title": "청사 경비 용역", "budget": "100,000,000원"}
+        ])
+        coupang = integrator.convert_items("coupang", [
+            {"id": "a", "name": "Samsung 모니터 27인치 블랙", "price": 250000, "category_name": "가전디지털"},
+            {"id": "b", "name": "삼성 모니터 32인치", "price": 400000, "category_name": "가전디지털"},
+            {"id": "c", "name": "LG전자 노트북 15인치", "price": 1200000, "category_name": "가전디지털"},
+            {"id": "d", "name": "삼성 노트북 15인치", "price": 1100000, "category_name": "가전디지털"},
+            {"id": "e", "name": "A4 복사용지 80g 2500매", "price": 25000, "category_name": "사무/문구용품"}
+        ])
+        return integrator, g2b, coupang
+
+    def test_match_features(self, catalogs):
+        try:
+            integrator, g2b, coupang = catalogs
+            matcher = CatalogMatcher(normalizer=integrator.normalizer)
+
+            # 조달 용어 제거, 브랜드 표기 통일, 수량은 기준 단위로
+            assert matcher.features(g2b[0]) == ("삼성 27인치 모니터", frozenset({"삼성"}), {"화면": frozenset({27.0})})
+            assert matcher.features(coupang[2])[1] == frozenset({"엘지"})
+            # 묶음 수량은 매칭 텍스트에서 제외
+            assert matcher.features(coupang[4])[0] == "A4 복사용지 80g"
+
+            # 같은 차원 수량이 다르거나 브랜드가 다르면 매칭하지 않음
+            assert not matcher.compatible(matcher.features(g2b[0]), matcher.features(coupang[1]))
+            assert not matcher.compatible(matcher.features(g2b[1]), matcher.features(coupang[3]))
+            assert matcher.compatible(matcher.features(g2b[1]), matcher.features(coupang[2]))
+            print("DEBUG: 매칭 특징 추출 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_rebuild_and_lookup(self, catalogs, tmp_path):
+        try:
+            integrator, g2b, coupang = catalogs
+            table = PriceMatchTable(str(tmp_path / "price_matches.db"))
+            # 기대 매칭은 해싱 임베딩 기준 (명시적으로 선택)
+            embedder = HashingEmbedder(dim=ProcureMateSettings.EMBEDDING_HASH_DIM)
+            stats = table.rebuild(g2b, coupang, CatalogMatcher(normalizer=integrator.normalizer, embedder=embedder))
+            assert stats["match_count"] == 3 and stats["matched_g2b"] == 3
+
+            gap = table.get_price_gap("g2b", "1")
+            assert gap["matched_key"] == "coupang:a"
+            assert gap["price_gap"] == 5000000 - 250000
+            assert [m["matched_key"] for m in table.lookup("g2b", "2")] == ["coupang:c"]
+            assert table.get_price_gap("g2b", "4") is None
+
+            # 쿠팡 상품 쪽에서도 키 조회
+            reverse = table.get_price_gap("coupang", "e")
+            assert reverse["matched_key"] == "g2b:3" and reverse["price_gap"] == 25000 - 900000
+
+            # 다시 만들면 테이블 교체, 다시 연결해도 유지
+            table.rebuild(g2b[:1], coupang, CatalogMatcher(normalizer=integrator.normalizer, embedder=embedder))
+            table.close()
+            table = PriceMatchTable(str(tmp_path / "price_matches.db"))
+            assert table.get_stats()["match_count"] == 1
+            assert table.get_price_gap("g2b", "2") is None
+            table.close()
+            print("DEBUG: 가격 매칭 테이블 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_default_embedder_follows_settings(self, monkeypatch):
+        try:
+            # 설정된 백엔드가 기본값, 해싱은 EMBEDDING_BACKEND=hashing일 때만
+            monkeypatch.setattr(ProcureMateSettings, "EMBEDDING_BACKEND", "transformer")
+            assert isinstance(CatalogMatcher().embedder, TransformerEmbedder)
+
+            monkeypatch.setattr(ProcureMateSettings, "EMBEDDING_BACKEND", "hashing")
+            monkeypatch.setattr(ProcureMateSettings, "EMBEDDING_HASH_DIM", 64)
+            matcher = CatalogMatcher()
+            assert isinstance(matcher.embedder, HashingEmbedder)
+            assert matcher.params["embedder"] == matcher.embedder.backend_id
+            assert matcher.encode(["삼성 모니터"]).shape == (1, 64)
+            print("DEBUG: 매칭 임베딩 기본 백엔드 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_ivf_index_matches_exact_search(self):
+        try:
+            rng = np.random.RandomState(0)
+            centers = rng.randn(50, 32).astype(np.float32)
+            vectors = np.repeat(centers, 40, axis=0) + 0.1 * rng.randn(2000, 32).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            queries = vectors[::10]
+
+            exact_scores, exact_ids = IVFIndex().build(vectors).search(queries, 5)
+            assert (exact_ids[:, 0] == np.arange(0, 2000, 10)).all()
+            assert (np.diff(exact_scores, axis=1) <= 0).all()
+
+            index = IVFIndex(nlist=50, nprobe=4).build(vectors)
+            assert sum(len(members) for members in index.lists) == 2000
+            scores, ids = index.search(queries, 5)
+            assert np.mean(np.isclose(scores[:, 0], exact_scores[:, 0])) == 1.0
+            print("DEBUG: IVF 근사 검색 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
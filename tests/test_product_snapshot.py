@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+from pathlib import Path
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from modules.data_processor import UnifiedProduct
+from modules.product_snapshot import ProductSnapshot
+from modules.shared_index import SharedIndexStore
+
+class TestProductSnapshot:
+
+    @pytest.fixture
+    def sample_products(self):
+        return [
+            UnifiedProduct(
+                id="g2b_001", source="g2b",
+                name={"original": "사무용 의자 구매", "normalized": "사무용 의자 구매", "searchable": "사무용 의자"},
+                price={"amount": Decimal("1200000"), "currency": "KRW", "vat_included": True},
+                specifications={"region": "서울", "industry_code": "1234"},
+                category=["가구", "G2B"],
+                metadata={"organization": "조달청", "procurement_type": "public_bid"},
+                timestamps={"created": datetime(2025, 5, 26, 9), "deadline": None}
+            ),
+            UnifiedProduct(
+                id="coupang_002", source="coupang",
+                name={"original": "LG 모니터 27인치", "normalized": "LG 모니터 27인치", "searchable": "lg 모니터 27인치"},
+                price={"amount": 350000, "currency": "KRW", "vat_included": False},
+                specifications={"rating": 4.5, "discount_rate": 10, "tags": ["로켓배송"]},
+                category=["전자제품", "쿠팡"],
+                timestamps={"retrieved": datetime(2025, 5, 26, 9, tzinfo=timezone.utc)}
+            ),
+            UnifiedProduct(
+                id="empty\x00id", source="coupang",
+                name={"original": "", "normalized": "", "searchable": ""},
+                price={"amount": 0, "currency": "KRW"}
+            )
+        ]
+
+    @pytest.fixture
+    def snapshot(self, sample_products, tmp_path):
+        snapshot = ProductSnapshot.load(
+            ProductSnapshot.save(sample_products, tmp_path / "products.snap", metadata={"search_query": "의자"})
+        )
+        yield snapshot
+        snapshot.close()
+
+    def test_round_trip(self, sample_products, snapshot):
+        try:
+            assert len(snapshot) == 3
+            assert snapshot.metadata == {"search_query": "의자"}
+            assert [p.to_dict() for p in snapshot.to_products()] == [p.to_dict() for p in sample_products]
+            assert [p.to_dict() for p in snapshot] == [p.to_dict() for p in sample_products]
+
+            # 한 건 접근과 슬라이스
+            assert snapshot[-1].id == "empty\x00id"
+            assert snapshot[1] == sample_products[1]
+            assert snapshot[1].timestamps["retrieved"].tzinfo == timezone.utc
+            assert [p.id for p in snapshot[0:2]] == ["g2b_001", "coupang_002"]
+            with pytest.raises(IndexError):
+                snapshot[3]
+
+            # 숫자 열은 파일을 가리키는 읽기 전용 뷰
+            assert snapshot.amounts.tolist() == [1200000, 350000, 0]
+            assert not snapshot.amounts.flags.writeable
+            assert [snapshot.sources[code] for code in snapshot.source_codes] == ["g2b", "coupang", "coupang"]
+            print("DEBUG: 상품 스냅샷 왕복 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_empty_snapshot_and_invalid_file(self, tmp_path):
+        try:
+            with ProductSnapshot.load(ProductSnapshot.save([], tmp_path / "empty.snap")) as snapshot:
+                assert len(snapshot) == 0
+                assert snapshot.to_products() == []
+
+            (tmp_path / "products.jsonl").write_text("{}\n", encoding="utf-8")
+            with pytest.raises(ValueError):
+                ProductSnapshot.load(tmp_path / "products.jsonl")
+            print("DEBUG: 빈 스냅샷/잘못된 파일 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_timezone_offsets_preserved(self, tmp_path):
+        try:
+            kst = timezone(timedelta(hours=9))
+            created = datetime(2025, 5, 26, 18, 30, tzinfo=kst)
+            product = UnifiedProduct(
+                id="g2b_tz", source="g2b",
+                name={"original": "의자", "normalized": "의자", "searchable": "의자"},
+                price={"amount": 1000, "currency": "KRW"},
+                timestamps={"created": created, "retrieved": datetime(2025, 5, 26, 9), "deadline": None}
+            )
+
+            with ProductSnapshot.load(ProductSnapshot.save([product], tmp_path / "tz.snap")) as snapshot:
+                timestamps = snapshot[0].timestamps
+                # 같은 시각 + 같은 UTC 오프셋 (UTC로 바뀌지 않음), 시간대 없는 값과 None은 그대로
+                assert timestamps["created"] == created
+                assert timestamps["created"].utcoffset() == timedelta(hours=9)
+                assert timestamps["created"].isoformat() == "2025-05-26T18:30:00+09:00"
+                assert timestamps["retrieved"].tzinfo is None
+                assert timestamps["deadline"] is None
+            print("DEBUG: 스냅샷 시간대 오프셋 보존 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_non_json_values(self, tmp_path):
+        try:
+            specifications = {
+                "unit_price": Decimal("1234.50"), "tags": {"로켓배송"}, "delivered": date(2025, 5, 27),
+                "updated": datetime(2025, 5, 26, 9, tzinfo=timezone.utc), "nested": {"value": 1, "other": 2}
+            }
+            product = UnifiedProduct(
+                id="coupang_extra", source="coupang",
+                name={"original": "모니터", "normalized": "모니터", "searchable": "모니터"},
+                price={"amount": 1000, "currency": "KRW"},
+                specifications=specifications,
+                metadata={"batches": frozenset([1, 2])}
+            )
+
+            path = ProductSnapshot.save([product], tmp_path / "extra.snap", metadata={"saved_at": date(2025, 5, 27)})
+            with ProductSnapshot.load(path) as snapshot:
+                # datetime/date/Decimal/set/frozenset은 같은 타입으로 복원
+                assert snapshot[0].specifications == specifications
+                assert isinstance(snapshot[0].specifications["unit_price"], Decimal)
+                assert snapshot[0].metadata == {"batches": frozenset([1, 2])}
+                assert snapshot.metadata == {"saved_at": date(2025, 5, 27)}
+
+            # 그 밖의 타입은 상품 id와 필드를 밝혀 거부
+            product.specifications["raw"] = object()
+            with pytest.raises(TypeError, match="coupang_extra"):
+                ProductSnapshot.save([product], tmp_path / "invalid.snap")
+            assert not (tmp_path / "invalid.snap").exists()
+            print("DEBUG: 스냅샷 비 JSON 값 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_shared_index_generation_uses_snapshot(self, sample_products, tmp_path):
+        try:
+            store = SharedIndexStore(str(tmp_path / "shared"))
+            generation = store.publish(sample_products, np.ones((3, 4), dtype=np.float32))
+            attached = store.attach(generation)
+
+            assert (attached.path / "products.snap").exists()
+            assert [p.id for p in attached.products] == [p.id for p in sample_products]
+            assert attached.products[0].specifications == {"region": "서울", "industry_code": "1234"}
+            attached.close()
+            print("DEBUG: 공유 색인 스냅샷 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_attach_after_generation_cleanup(self, sample_products, tmp_path):
+        try:
+            store = SharedIndexStore(str(tmp_path / "shared"), keep_generations=2)
+            stale = store.publish(sample_products, np.ones((3, 4), dtype=np.float32))
+            store.publish(sample_products[:2], np.ones((2, 4), dtype=np.float32))
+            latest = store.publish(sample_products[:1], np.ones((1, 4), dtype=np.float32))
+            assert not (tmp_path / "shared" / f"gen_{stale:06d}").exists()
+
+            # 워커가 읽은 세대가 그 사이 정리되면 CURRENT를 다시 읽어 최신 세대에 연결
+            attached = store.attach(stale)
+            assert attached.generation == latest
+            assert len(attached.products) == 1
+            attached.close()
+
+            # CURRENT가 가리키는 세대까지 사라지면 예외 대신 None
+            (tmp_path / "shared" / "CURRENT").write_text(str(stale))
+            assert store.attach() is None
+            print("DEBUG: 정리된 세대 연결 재시도 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
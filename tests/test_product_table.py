@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from modules.data_processor import UnifiedProduct
+from modules.product_table import ProductTable
+
+class TestProductTable:
+
+    @pytest.fixture
+    def sample_products(self):
+        rows = [
+            ("g2b", 5000000, ["가구", "G2B"]),
+            ("coupang", 450000, ["가구", "쿠팡"]),
+            ("coupang", 0, ["사무용품", "쿠팡"]),
+            ("coupang", 120000, []),
+            ("g2b", 3000000, ["사무용품", "G2B"])
+        ]
+        return [
+            UnifiedProduct(
+                id=f"p{idx}",
+                source=source,
+                name={"original": f"상품{idx}", "normalized": f"상품{idx}", "searchable": f"상품{idx}"},
+                price={"amount": Decimal(str(price)), "currency": "KRW"},
+                category=category,
+                timestamps={"created": datetime(2025, 5, 26, 12, idx)}
+            )
+            for idx, (source, price, category) in enumerate(rows)
+        ]
+
+    def test_price_statistics(self, sample_products):
+        try:
+            table = ProductTable.from_products(sample_products)
+            prices = sorted(p.amount for p in sample_products if p.amount > 0)
+
+            summary = table.price_summary()
+            assert summary["price_count"] == 4
+            assert summary["min_price"] == prices[0]
+            assert summary["max_price"] == prices[-1]
+            assert summary["median_price"] == prices[len(prices) // 2]
+            assert summary["avg_price"] == pytest.approx(sum(prices) / len(prices))
+            assert summary["price_std_dev"] == pytest.approx(float(np.std(prices)))
+
+            distribution = table.price_distribution()
+            assert len(distribution) == 5
+            assert sum(distribution.values()) == 4
+
+            comparison = table.source_comparison()
+            assert list(comparison) == ["g2b", "coupang"]
+            assert comparison["coupang"] == {"count": 2, "avg_price": 285000.0, "min_price": 120000.0, "max_price": 450000.0}
+            print("DEBUG: 열 저장소 가격 통계 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_save_load_mmap(self, sample_products, tmp_path):
+        try:
+            table = ProductTable.from_products(sample_products)
+            table.save(tmp_path)
+
+            loaded = ProductTable.load(tmp_path)
+            assert isinstance(loaded.prices, np.memmap)
+            assert list(loaded.ids) == [p.id for p in sample_products]
+            assert loaded.price_summary() == table.price_summary()
+            assert loaded.created[0] == np.datetime64("2025-05-26T12:00")
+
+            postings = loaded.category_postings()
+            assert {category: list(indices) for category, indices in postings.items()} == {"가구": [0, 1], "사무용품": [2, 4]}
+            print("DEBUG: 열 저장소 저장/로드 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_with_rows_matches_rebuild(self, sample_products, tmp_path):
+        try:
+            table = ProductTable.from_products(sample_products[:4])
+            table.save(tmp_path)
+            loaded = ProductTable.load(tmp_path)
+
+            # p1은 카테고리/가격 변경, p3은 카테고리 추가, p4와 새 출처/카테고리 상품은 뒤에 추가
+            moved = UnifiedProduct(
+                id="p1", source="coupang", name={"original": "상품1"},
+                price={"amount": 470000, "currency": "KRW"}, category=["사무용품"]
+            )
+            categorized = UnifiedProduct(
+                id="p3", source="coupang", name={"original": "상품3"},
+                price={"amount": 120000, "currency": "KRW"}, category=["가구"]
+            )
+            new_product = UnifiedProduct(
+                id="p10", source="manual", name={"original": "상품10"},
+                price={"amount": 9000, "currency": "KRW"}, category=["전자제품"]
+            )
+            replaced = [(1, moved), (3, categorized)]
+            appended = [sample_products[4], new_product]
+
+            updated = loaded.with_rows(replaced, appended)
+            products = [sample_products[0], moved, sample_products[2], categorized] + appended
+            rebuilt = ProductTable.from_products(products)
+            for column in ProductTable.COLUMNS:
+                assert getattr(updated, column).tolist() == getattr(rebuilt, column).tolist()
+            assert updated.sources == ["g2b", "coupang", "manual"]
+            assert isinstance(loaded.prices, np.memmap) and loaded.prices[1] == 450000
+
+            # 카테고리 색인도 바뀐 행/추가 행만 반영해 전체 재구성과 같음
+            postings = updated.update_postings(loaded.category_postings(), loaded, [1, 3])
+            assert {category: list(indices) for category, indices in postings.items()} == {
+                category: list(indices) for category, indices in updated.category_postings().items()
+            }
+            assert {category: list(indices) for category, indices in postings.items()} == {
+                "가구": [0, 3], "사무용품": [1, 2, 4], "전자제품": [5]
+            }
+            print("DEBUG: 열 저장소 증분 갱신 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+
+import pytest
+import asyncio
+import json
+import sys
+import unicodedata
+import numpy as np
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils import BoundedLRUCache
+from normalization.similarity_mapping import SimilarityMappingSystem, NormalizationRule, flush_pending_rules
+
+class TestSimilarityMapping:
+
+    @pytest.fixture
+    def mapping_system(self, tmp_path):
+        system = SimilarityMappingSystem(
+            rules_file=str(tmp_path / "normalization_rules.json"), save_debounce_seconds=0.01
+        )
+        system.engine.is_initialized = True  # Mock 임베딩 사용
+        return system
+
+    @pytest.mark.asyncio
+    async def test_variant_matrix_cached(self, mapping_system):
+        try:
+            await mapping_system.load_rules()
+            calls = []
+            original_get_embeddings = mapping_system.engine.get_embeddings
+
+            async def counting_get_embeddings(texts):
+                calls.append(len(texts))
+                return await original_get_embeddings(texts)
+
+            mapping_system.engine.get_embeddings = counting_get_embeddings
+
+            # 최초 조회 시 행렬 생성 + 쿼리 임베딩
+            assert await mapping_system._find_best_embedding_match("white", "colors") == "흰색"
+            matrix_rows = mapping_system.variant_matrices["colors"].shape[0]
+            assert calls == [matrix_rows, 1]
+
+            # 이후 조회는 쿼리 임베딩만 계산
+            assert await mapping_system._find_best_embedding_match("블루", "colors") == "파란색"
+            assert calls[-1] == 1 and len(calls) == 3
+
+            print("DEBUG: 변형어 행렬 캐시 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_variant_matrix_incremental_update(self, mapping_system):
+        try:
+            await mapping_system.load_rules()
+            await mapping_system._get_variant_matrix("colors")
+            rows_before = mapping_system.variant_matrices["colors"].shape[0]
+
+            await mapping_system.add_new_variant("흰색", "아이보리화이트", "colors")
+            await mapping_system.add_new_variant("빨간색", "레드", "colors")
+
+            assert await mapping_system._find_best_embedding_match("아이보리화이트", "colors") == "흰색"
+            assert await mapping_system._find_best_embedding_match("레드", "colors") == "빨간색"
+            assert mapping_system.variant_matrices["colors"].shape[0] == rows_before + 3
+
+            suggestions = await mapping_system.suggest_normalization("레드", "colors")
+            assert suggestions[0]["suggested"] == "빨간색"
+            assert suggestions[0]["matched_variant"] == "레드"
+
+            print("DEBUG: 변형어 행렬 증분 갱신 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_exact_match_index(self, mapping_system):
+        try:
+            await mapping_system.load_rules()
+
+            async def fail_embedding(*args, **kwargs):
+                raise AssertionError("정확 매칭에서 임베딩 호출")
+
+            mapping_system._embed_query = fail_embedding
+
+            assert await mapping_system.normalize_term("white") == "흰색"
+            assert await mapping_system.normalize_term("LG전자", "brands") == "엘지"
+            assert await mapping_system.normalize_term("삼성", "brands") == "삼성"
+            # NFD로 입력된 한글도 같은 키로 조회
+            assert await mapping_system.normalize_term(unicodedata.normalize('NFD', "화이트")) == "흰색"
+
+            await mapping_system.add_new_variant("흰색", "Ivory White", "colors")
+            assert mapping_system.find_exact_match("Ivory White", "colors") == "흰색"
+            assert mapping_system.find_exact_match("Ivory White", "brands") is None
+            assert mapping_system.find_exact_match("ivory white") is None
+
+            print("DEBUG: 정확 매칭 색인 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_exact_match_fold_case(self, tmp_path):
+        try:
+            mapping_system = SimilarityMappingSystem(
+                rules_file=str(tmp_path / "normalization_rules.json"), fold_case=True
+            )
+            mapping_system.rules = {"brands": [
+                NormalizationRule(standard_term="삼성", variants=["Samsung"], category="brands", confidence=0.95)
+            ]}
+            mapping_system._rebuild_exact_index()
+
+            assert mapping_system.find_exact_match("SAMSUNG") == "삼성"
+            assert mapping_system.find_exact_match("samsung", "brands") == "삼성"
+
+            print("DEBUG: 대소문자 통일 색인 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_bulk_registration_single_write(self, mapping_system, tmp_path):
+        try:
+            await mapping_system.load_rules()
+            saves = []
+            original_save_rules = mapping_system.save_rules
+
+            async def counting_save_rules():
+                saves.append(1)
+                await original_save_rules()
+
+            mapping_system.save_rules = counting_save_rules
+
+            added = await mapping_system.add_variants_bulk({
+                "흰색": ["화이트", "화이트색", "White"],
+                "빨간색": ["레드", "red", "RED"]
+            }, "colors")
+
+            assert added == 5  # 화이트는 기본 규칙에 이미 존재
+            assert len(saves) == 1
+            assert mapping_system.find_exact_match("레드", "colors") == "빨간색"
+
+            # 변경 없는 재등록은 저장하지 않음
+            assert await mapping_system.add_variants_bulk({"빨간색": ["레드"]}, "colors") == 0
+            assert len(saves) == 1
+
+            # 저장 파일은 원자적으로 교체되어 임시 파일이 남지 않음
+            with open(mapping_system.rules_file, 'r', encoding='utf-8') as f:
+                assert "빨간색" in json.load(f)["colors"][-1]["standard_term"]
+            assert [p.name for p in tmp_path.iterdir()] == ["normalization_rules.json"]
+
+            print("DEBUG: 일괄 규칙 등록 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_debounced_save(self, mapping_system):
+        try:
+            await mapping_system.load_rules()
+            saves = []
+            original_save_rules = mapping_system.save_rules
+
+            async def counting_save_rules():
+                saves.append(1)
+                await original_save_rules()
+
+            mapping_system.save_rules = counting_save_rules
+
+            for variant in ["네이비", "navy", "NAVY"]:
+                await mapping_system.add_new_variant("남색", variant, "colors")
+            assert saves == []
+
+            await asyncio.sleep(0.05)
+            assert len(saves) == 1
+
+            # 지연 저장 전 종료 시 flush로 즉시 저장
+            await mapping_system.add_new_variant("남색", "곤색", "colors")
+            await mapping_system.flush()
+            assert len(saves) == 2
+            await asyncio.sleep(0.05)
+            assert len(saves) == 2
+
+            print("DEBUG: 지연 저장 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_save_without_running_loop(self, mapping_system, tmp_path):
+        try:
+            asyncio.run(mapping_system.load_rules())
+            rules_file = tmp_path / "normalization_rules.json"
+
+            # 실행 중인 이벤트 루프가 없으면 지연 저장 대신 즉시 동기 저장
+            assert mapping_system._merge_variant("남색", "네이비", "colors", 0.8)
+            mapping_system._mark_dirty()
+            assert not mapping_system._dirty
+            saved = json.loads(rules_file.read_text(encoding="utf-8"))
+            assert any("네이비" in rule["variants"] for rule in saved["colors"])
+
+            print("DEBUG: 이벤트 루프 없는 저장 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_flush_pending_rules_on_shutdown(self, mapping_system, tmp_path):
+        try:
+            await mapping_system.load_rules()
+            mapping_system.save_debounce_seconds = 60.0
+
+            # 지연 저장 대기 중 종료되면 종료 훅(flush_pending_rules)에서 저장
+            await mapping_system.add_new_variant("남색", "곤색", "colors")
+            assert mapping_system._dirty
+            flush_pending_rules()
+            assert not mapping_system._dirty
+            saved = json.loads((tmp_path / "normalization_rules.json").read_text(encoding="utf-8"))
+            assert any("곤색" in rule["variants"] for rule in saved["colors"])
+
+            mapping_system._save_task.cancel()
+            print("DEBUG: 종료 시 규칙 저장 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_term_memo_cache(self, mapping_system):
+        try:
+            await mapping_system.load_rules()
+            embed_calls = []
+            original_embed_query = mapping_system._embed_query
+
+            async def counting_embed_query(term):
+                embed_calls.append(term)
+                return await original_embed_query(term)
+
+            mapping_system._embed_query = counting_embed_query
+
+            # 미매칭 결과도 캐시되어 두 번째 조회는 임베딩 없이 반환
+            assert await mapping_system.normalize_term("블랙펄", "colors") == "블랙펄"
+            assert await mapping_system.normalize_term("블랙펄", "colors") == "블랙펄"
+            assert embed_calls == ["블랙펄"]
+
+            stats = mapping_system.get_cache_stats()
+            assert stats["hits"] == 1 and stats["misses"] == 1
+            assert stats["hit_rate"] == 0.5
+
+            # 규칙 변경 시 무효화
+            await mapping_system.add_new_variant("검은색", "블랙펄", "colors")
+            assert await mapping_system.normalize_term("블랙펄", "colors") == "검은색"
+            assert len(embed_calls) == 1
+
+            # 일괄 등록은 변형어마다가 아니라 등록 종료 후 한 번만 무효화
+            invalidated = []
+            original_invalidate = mapping_system.prefilter.invalidate
+            mapping_system.prefilter.invalidate = lambda category=None: (invalidated.append(category), original_invalidate(category))
+            await mapping_system.add_variants_bulk({"남색": ["네이비", "곤색"], "회색": ["그레이"]}, "colors", persist=False)
+            assert invalidated == ["colors"]
+            assert await mapping_system.normalize_term("곤색", "colors") == "남색"
+
+            print("DEBUG: 정규화 메모 캐시 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_prefilter_skips_embedding(self, mapping_system):
+        try:
+            await mapping_system.load_rules()
+            embedded = []
+            original_get_embeddings = mapping_system.engine.get_embeddings
+
+            async def recording_get_embeddings(texts):
+                embedded.extend(texts)
+                return await original_get_embeddings(texts)
+
+            mapping_system.engine.get_embeddings = recording_get_embeddings
+            await mapping_system._get_variant_matrix("colors")
+            embedded.clear()
+
+            terms = ["12345", "SM-G991N", "정품", "모니터암", "블랙펄", "화이트"]
+            result = await mapping_system.normalize_terms(terms, "colors")
+
+            # 숫자/모델코드/불용어/n-gram 불일치 토큰은 임베딩 단계에 도달하지 않음
+            assert embedded == ["블랙펄"]
+            assert result["화이트"] == "흰색"
+            assert result["SM-G991N"] == "SM-G991N"
+
+            stats = mapping_system.get_prefilter_stats()
+            assert stats["passed"] == 1
+            assert stats["rejected_script"] == 1
+            assert stats["rejected_model_code"] == 1
+            assert stats["rejected_stopword"] == 1
+            assert stats["rejected_ngram"] == 1
+
+            # 카테고리 미지정 시에도 통계는 카테고리 수가 아니라 토큰 단위로 집계
+            mapping_system.prefilter.reset_stats()
+            await mapping_system.normalize_terms(["12345", "블랙펄"])
+            stats = mapping_system.get_prefilter_stats()
+            assert stats["checked"] == 2
+            assert stats["passed"] + stats["rejected_script"] == 2
+
+            # 설정으로 비활성화하면 모든 미등록 토큰을 임베딩 매칭
+            unfiltered = SimilarityMappingSystem(rules_file=mapping_system.rules_file, prefilter_enabled=False)
+            unfiltered.engine.is_initialized = True
+            await unfiltered.load_rules()
+            assert await unfiltered._find_best_embedding_match("white", "colors") == "흰색"
+            embedded.clear()
+            unfiltered.engine.get_embeddings = recording_get_embeddings
+            await unfiltered.normalize_terms(["12345", "SM-G991N"], "colors")
+            assert embedded == ["12345", "SM-G991N"]
+            assert unfiltered.get_prefilter_stats()["checked"] == 0
+
+            print(f"DEBUG: 사전 필터 통계 {stats}")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    @pytest.mark.asyncio
+    async def test_rule_snapshot_roundtrip(self, mapping_system, tmp_path):
+        try:
+            await mapping_system.load_rules()
+            await mapping_system.add_variants_bulk({"빨간색": ["레드", "red"]}, "colors")
+            assert await mapping_system.save_snapshot()
+            assert not await mapping_system.save_snapshot()  # 변경 없으면 생략
+
+            restored = SimilarityMappingSystem(rules_file=mapping_system.rules_file)
+            restored.engine.is_initialized = True
+
+            async def fail_embedding(texts):
+                raise AssertionError("스냅샷 로드 후 변형어 재임베딩")
+
+            restored.engine.get_embeddings = fail_embedding
+            await restored.load_rules()
+
+            # 행렬은 메모리 매핑으로 로드, 색인/오토마톤도 복원
+            assert isinstance(restored.variant_matrices["colors"], np.memmap)
+            assert np.allclose(restored.variant_matrices["colors"], mapping_system.variant_matrices["colors"])
+            assert restored.find_exact_match("레드", "colors") == "빨간색"
+            assert restored.get_matcher("brands").replace("LG전자 모니터") == "엘지 모니터"
+            assert await restored._find_best_embedding_match("red", "colors", restored.variant_matrices["colors"][
+                restored.variant_terms["colors"].index("red")
+            ]) == "빨간색"
+
+            # 스냅샷은 JSON/npy만 사용하고 CURRENT 포인터로 교체, 이전 디렉토리는 정리
+            snapshot_dir = mapping_system.snapshot.current_dir()
+            assert not list(snapshot_dir.glob("*.pkl"))
+            await mapping_system.add_new_variant("빨간색", "레드색", "colors")
+            assert await mapping_system.save_snapshot()
+            assert mapping_system.snapshot.current_dir() != snapshot_dir
+            assert not snapshot_dir.exists()
+
+            # 같은 규칙 파일을 쓰는 다른 정규화기는 자기 키의 스냅샷만 사용
+            other = SimilarityMappingSystem(rules_file=mapping_system.rules_file, snapshot_key="brands")
+            other.engine.is_initialized = True
+            await other.load_rules()
+            assert other.variant_matrices == {}
+            assert await other.save_snapshot()
+            assert mapping_system.snapshot.current_dir().exists()
+
+            # 규칙 파일이 바뀌면 스냅샷 무시
+            with open(mapping_system.rules_file, 'a', encoding='utf-8') as f:
+                f.write("\n")
+            stale = SimilarityMappingSystem(rules_file=mapping_system.rules_file)
+            stale.engine.is_initialized = True
+            await stale.load_rules()
+            assert stale.variant_matrices == {}
+
+            print("DEBUG: 규칙 스냅샷 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+    def test_bounded_lru_cache(self):
+        try:
+            cache = BoundedLRUCache(max_size=2)
+            cache.put("a", 1)
+            cache.put("b", 2)
+            assert cache.get("a") == 1
+            cache.put("c", 3)  # 가장 오래 사용되지 않은 b 제거
+
+            assert "b" not in cache and "a" in cache and "c" in cache
+            assert cache.get_stats()["evictions"] == 1
+
+            print("DEBUG: LRU 캐시 테스트 통과")
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            raise
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,5 +2,9 @@ from .logger import get_logger, ProcureMateLogger
 from .json_utils import serialize_for_websocket, safe_json_dumps
 from .validator import ModuleValidator
 from .prompt_loader import prompt_loader
+from .multi_pattern_matcher import MultiPatternMatcher
+from .lru_cache import BoundedLRUCache
+from .minhash_lsh import MinHashLSH
+from .ivf_index import IVFIndex
 
-__all__ = ['get_logger', 'ProcureMateLogger', 'ModuleValidator', 'serialize_for_websocket', 'safe_json_dumps', 'prompt_loader']
+__all__ = ['get_logger', 'ProcureMateLogger', 'ModuleValidator', 'serialize_for_websocket', 'safe_json_dumps', 'prompt_loader', 'MultiPatternMatcher', 'BoundedLRUCache', 'MinHashLSH', 'IVFIndex']
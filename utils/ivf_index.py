@@ -0,0 +1,125 @@
+"""
+IVF 근사 최근접 이웃 색인 - k-means 목록(coarse quantizer) + 목록 내 내적 전수 검색
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class IVFIndex:
+    """정규화된 벡터의 내적(코사인) 근사 최근접 이웃 색인
+
+    - 학습: 벡터 표본에서 nlist개 중심을 구면 k-means로 구하고 각 벡터를 가장 가까운 목록에 배정
+    - 검색: 질의마다 가까운 중심 nprobe개의 목록만 내적 계산 (목록 수가 0이면 전체 전수 검색)
+    - 목록 단위로 해당 목록을 조회하는 질의를 모아 행렬곱 한 번으로 계산하고 상위 k개를 병합
+    - seed가 같으면 같은 목록 구성
+    """
+
+    def __init__(self, nlist: int = 0, nprobe: int = 8, iterations: int = 10, sample_size: int = 50000, seed: int = 1):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.sample_size = sample_size
+        self.seed = seed
+
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.lists = []
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def build(self, vectors: np.ndarray) -> 'IVFIndex':
+        """벡터 색인 (행 단위 L2 정규화된 벡터 기준)"""
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        count = len(self.vectors)
+        nlist = min(self.nlist, count)
+        if nlist <= 1:
+            self.centroids = np.zeros((0, self.vectors.shape[1] if self.vectors.ndim == 2 else 0), dtype=np.float32)
+            self.lists = []
+            return self
+
+        rng = np.random.RandomState(self.seed)
+        sample = self.vectors[rng.choice(count, min(count, max(self.sample_size, nlist)), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(self.iterations):
+            assignment = self._nearest_lists(sample, 1, centroids)[:, 0]
+            order = np.argsort(assignment, kind='stable')
+            present, starts = np.unique(assignment[order], return_index=True)
+            # 목록별 합 (빈 목록은 이전 중심 유지)
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids[present] = sums / norms
+
+        self.centroids = centroids
+        assignment = self._nearest_lists(self.vectors, 1)[:, 0]
+        order = np.argsort(assignment, kind='stable')
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(nlist)]
+        return self
+
+    def search(self, queries: np.ndarray, k: int, chunk_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+        """질의별 상위 k개 (유사도, 인덱스), 유사도 내림차순. 후보가 k개보다 적으면 인덱스 -1, 유사도 -inf"""
+        queries = np.asarray(queries, dtype=np.float32)
+        k = min(k, len(self.vectors))
+        scores = np.full((len(queries), max(k, 0)), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), max(k, 0)), -1, dtype=np.int64)
+        if not k or not len(queries):
+            return scores, ids
+
+        if not self.lists:
+            for start in range(0, len(queries), chunk_size):
+                block = queries[start:start + chunk_size] @ self.vectors.T
+                self._merge(scores, ids, np.arange(start, start + len(block)), block, np.arange(len(self.vectors)), k)
+        else:
+            probes = self._nearest_lists(queries, min(self.nprobe, len(self.lists)))
+            for list_id, members in enumerate(self.lists):
+                rows = np.flatnonzero((probes == list_id).any(axis=1))
+                if not len(rows) or not len(members):
+                    continue
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    self._merge(scores, ids, chunk, queries[chunk] @ self.vectors[members].T, members, k)
+
+        order = np.argsort(-scores, axis=1, kind='stable')
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+    def _nearest_lists(
+        self,
+        vectors: np.ndarray,
+        count: int,
+        centroids: Optional[np.ndarray] = None,
+        chunk_size: int = 8192
+    ) -> np.ndarray:
+        """벡터별로 가장 가까운 목록 count개 (centroids 기본값은 학습된 중심)"""
+        centroids = self.centroids if centroids is None else centroids
+        result = np.empty((len(vectors), count), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            similarities = vectors[start:start + chunk_size] @ centroids.T
+            if count == 1:
+                result[start:start + chunk_size, 0] = similarities.argmax(axis=1)
+            elif count < similarities.shape[1]:
+                result[start:start + chunk_size] = np.argpartition(-similarities, count - 1, axis=1)[:, :count]
+            else:
+                result[start:start + chunk_size] = np.argsort(-similarities, axis=1)[:, :count]
+        return result
+
+    @staticmethod
+    def _merge(scores: np.ndarray, ids: np.ndarray, rows: np.ndarray, block: np.ndarray, members: np.ndarray, k: int):
+        """rows 질의의 현재 상위 k개와 새 후보(block: rows x members)를 병합"""
+        if block.shape[1] > k:
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            block_scores = np.take_along_axis(block, top, axis=1)
+            block_ids = members[top]
+        else:
+            block_scores = block
+            block_ids = np.broadcast_to(members, block.shape)
+
+        merged_scores = np.concatenate([scores[rows], block_scores], axis=1)
+        merged_ids = np.concatenate([ids[rows], block_ids], axis=1)
+        keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        scores[rows] = np.take_along_axis(merged_scores, keep, axis=1)
+        ids[rows] = np.take_along_axis(merged_ids, keep, axis=1)
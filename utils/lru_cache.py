@@ -0,0 +1,62 @@
+"""
+크기 제한 LRU 캐시 - 적중률 통계 포함
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class BoundedLRUCache:
+    """최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거하는 캐시"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """조회 (적중 시 최근 사용으로 갱신)"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """저장 (크기 초과 시 가장 오래된 항목 제거)"""
+        if self.max_size <= 0:
+            return
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """전체 무효화 (통계는 유지)"""
+        self._data.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,61 @@
+"""
+MinHash LSH - 문자 n-gram 집합 유사도 기반 후보 쌍 생성
+"""
+
+import zlib
+from typing import List, Set, Tuple
+
+import numpy as np
+
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+
+class MinHashLSH:
+    """문자 n-gram MinHash 서명과 밴드 버킷
+
+    - 서명: num_perm개의 (a*x + b) mod p 해시별 최솟값 (x = n-gram의 crc32)
+    - 밴드: 서명을 bands개 구간으로 나눠 구간이 모두 같으면 같은 버킷
+    - rows = num_perm / bands가 작을수록 재현율이 높고 후보 수가 많아짐
+    - seed가 같으면 프로세스/실행과 무관하게 같은 서명 (영속 색인에 저장 가능)
+    """
+
+    def __init__(self, num_perm: int = 144, bands: int = 48, ngram_size: int = 2, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})의 배수여야 합니다")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram_size = ngram_size
+        self.seed = seed
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(MERSENNE_PRIME), num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(MERSENNE_PRIME), num_perm).astype(np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        """소문자 문자 n-gram (n보다 짧은 텍스트는 텍스트 자체)"""
+        text = (text or '').lower()
+        if len(text) <= self.ngram_size:
+            return {text} if text else set()
+        return {text[i:i + self.ngram_size] for i in range(len(text) - self.ngram_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash 서명 (num_perm, uint64). 빈 텍스트는 최댓값으로 채움"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        return ((hashes[:, None] * self._a + self._b) % MERSENNE_PRIME).min(axis=0)
+
+    def band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """밴드별 버킷 키 (밴드 번호, 밴드 구간 바이트)"""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
@@ -0,0 +1,169 @@
+"""
+다중 패턴 매칭 (Aho-Corasick) - 사전 크기와 무관하게 한 번의 선형 스캔으로 치환
+"""
+
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+def _fold(text: str) -> str:
+    """길이를 유지하는 소문자 변환 (위치 대응 보장)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def _char_class(ch: str) -> str:
+    """단어 경계 판정용 문자 종류"""
+    if '가' <= ch <= '힣' or 'ㄱ' <= ch <= 'ㆎ':
+        return 'hangul'
+    if ch.isdigit():
+        return 'digit'
+    if ch.isalpha():
+        return 'alpha'
+    return ''
+
+
+class MultiPatternMatcher:
+    """Aho-Corasick 오토마톤 기반 다중 패턴 치환기
+
+    - 겹치는 매칭은 가장 왼쪽, 가장 긴 패턴 우선 (길이가 같으면 먼저 등록된 패턴)
+    - 단어 경계: 매칭 양 끝의 이웃 문자가 같은 종류(영문/숫자/한글)이면 제외
+      (2글자 이상 한글 패턴은 복합어 내부 매칭 허용, 예: '삼성노트북')
+    - 대소문자 무시 패턴과 구분 패턴을 한 오토마톤에서 함께 처리
+    """
+
+    def __init__(self, word_boundary: bool = True):
+        self.word_boundary = word_boundary
+        self._patterns: List[Tuple[str, str, bool]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, replacement: str, case_sensitive: bool = True):
+        """패턴 등록"""
+        if not pattern:
+            return
+
+        node = 0
+        for ch in _fold(pattern):
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+
+        self._outputs[node].append(len(self._patterns))
+        self._patterns.append((pattern, replacement, case_sensitive))
+        self._built = False
+
+    def add_mappings(self, mappings: Dict[str, List[str]], case_sensitive: bool = True):
+        """표준 용어 -> 변형어 목록 매핑 일괄 등록"""
+        for standard, variants in mappings.items():
+            for variant in variants:
+                self.add(variant, standard, case_sensitive)
+
+    def build(self):
+        """실패 링크 계산"""
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                # 실패 링크가 가리키는 접미사 패턴도 이 노드에서 매칭됨
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+        self._built = True
+
+    def find(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """겹치지 않는 매칭 목록 (시작, 끝, 패턴, 치환어)"""
+        candidates = [(start, start - end, pid) for start, end, pid in self._scan(text)]
+
+        matches = []
+        last_end = 0
+        for start, neg_length, pid in sorted(candidates):
+            if start < last_end:
+                continue
+            pattern, replacement, _ = self._patterns[pid]
+            matches.append((start, start - neg_length, pattern, replacement))
+            last_end = start - neg_length
+
+        return matches
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """겹치는 매칭까지 모두 포함한 목록 (시작, 끝, 패턴, 치환어), 끝 위치 순"""
+        return [(start, end, *self._patterns[pid][:2]) for start, end, pid in self._scan(text)]
+
+    def _scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """오토마톤 한 번 순회로 조건(대소문자/단어 경계)을 만족하는 모든 매칭 (시작, 끝, 패턴 번호)"""
+        if not self._patterns or not text:
+            return []
+        if not self._built:
+            self.build()
+
+        folded = _fold(text)
+        found = []
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+
+            for pid in self._outputs[node]:
+                pattern, _, case_sensitive = self._patterns[pid]
+                end = i + 1
+                start = end - len(pattern)
+                if case_sensitive and text[start:end] != pattern:
+                    continue
+                if self.word_boundary and not self._is_bounded(text, start, end):
+                    continue
+                found.append((start, end, pid))
+
+        return found
+
+    def replace(self, text: str) -> str:
+        """매칭된 모든 패턴을 한 번에 치환"""
+        matches = self.find(text)
+        if not matches:
+            return text
+
+        pieces = []
+        position = 0
+        for start, end, _, replacement in matches:
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(text[position:])
+        return ''.join(pieces)
+
+    def _is_bounded(self, text: str, start: int, end: int) -> bool:
+        """매칭 양 끝이 단어 경계인지 확인"""
+        allow_compound = end - start >= 2
+
+        if start > 0:
+            outer, inner = _char_class(text[start - 1]), _char_class(text[start])
+            if inner and outer == inner and not (allow_compound and inner == 'hangul'):
+                return False
+
+        if end < len(text):
+            outer, inner = _char_class(text[end]), _char_class(text[end - 1])
+            if inner and outer == inner and not (allow_compound and inner == 'hangul'):
+                return False
+
+        return True